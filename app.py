@@ -6,12 +6,48 @@
 """
 
 import streamlit as st
-import requests
 import pandas as pd
+import math
+import os
 import time
-import random
+from functools import partial
 from datetime import datetime
-from typing import Optional, Dict, List, Tuple
+from typing import List
+
+from naver_land import (
+    PRESET_COMPLEXES,
+    PRESET_REGIONS,
+    AdaptiveRateController,
+    CircuitBreaker,
+    ComplexDirectory,
+    ListingDelta,
+    ListingFilterIndex,
+    ListingStore,
+    ListingTracker,
+    MarketStats,
+    NaverLandAPI,
+    ResponseArchive,
+    ResponseCache,
+    TokenBucketLimiter,
+    WatchList,
+    WatchRule,
+    EXPORT_FORMATS,
+    concat_listings,
+    dedupe_listings,
+    export_formats,
+    export_listings,
+    fetch_listings_concurrently,
+    format_confirm_dates,
+    format_listing_price_series,
+    format_price,
+    format_price_series,
+    format_unit_price_series,
+    build_cards_html,
+    generate_demo_data,
+    jeonse_ratio_table,
+    memory_report,
+    unit_price_summary,
+)
 
 # ============================================================
 # 페이지 설정
@@ -23,572 +59,74 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# ============================================================
-# 프리셋 단지 데이터 (확장)
-# ============================================================
-PRESET_COMPLEXES = {
-    # 송파구
-    "잠실엘스": "19772",
-    "헬리오시티": "114743",
-    "트리지움": "19764",
-    "리센츠": "19765",
-    "파크리오": "19763",
-    "잠실래미안아이파크": "137980",
-    "잠실주공5단지": "8540",
-    "올림픽선수촌": "8628",
-    # 강남구
-    "은마아파트": "8928",
-    "대치래미안": "8918",
-    "도곡렉슬": "8977",
-    "타워팰리스": "8981",
-    "개포주공1단지": "8867",
-    "래미안대치팰리스": "8918",
-    # 서초구
-    "래미안퍼스티지": "8894",
-    "반포자이": "100078",
-    "아크로리버파크": "100096",
-    "래미안원베일리": "136068",
-    "반포래미안아이파크": "137979",
-    "서초그랑자이": "124797",
-    # 용산구
-    "래미안용산더센트럴": "140927",
-    "이촌동LG한강자이": "7853",
-    # 마포/영등포
-    "마포래미안푸르지오": "102378",
-    "여의도자이": "18584",
-    # 성동구
-    "트리마제": "106811",
-    "서울숲리버뷰자이": "114591",
-    # 광진구
-    "현대프라임": "8684",
-    "자양래미안": "8688",
-}
-
 # ============================================================
 # CSS 스타일 (완전히 새로운 디자인)
 # ============================================================
-st.markdown("""
-<style>
-    /* 폰트 */
-    @import url('https://cdn.jsdelivr.net/gh/orioncactus/pretendard/dist/web/static/pretendard.css');
-    
-    html, body, [class*="css"] {
-        font-family: 'Pretendard', -apple-system, BlinkMacSystemFont, system-ui, sans-serif;
-    }
-    
-    /* 메인 컨테이너 */
-    .main > div {
-        padding: 2rem 3rem;
-    }
-    
-    /* 헤더 스타일 */
-    .main-header {
-        text-align: center;
-        padding: 2rem 0 3rem 0;
-    }
-    .main-header h1 {
-        font-size: 2.5rem;
-        font-weight: 800;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        margin-bottom: 0.5rem;
-    }
-    .main-header p {
-        color: #64748b;
-        font-size: 1.1rem;
-    }
-    
-    /* 단지 선택 그리드 */
-    .complex-grid {
-        display: grid;
-        grid-template-columns: repeat(auto-fill, minmax(140px, 1fr));
-        gap: 10px;
-        margin: 1.5rem 0;
-    }
-    .complex-chip {
-        background: white;
-        border: 2px solid #e2e8f0;
-        border-radius: 12px;
-        padding: 12px 16px;
-        text-align: center;
-        cursor: pointer;
-        transition: all 0.2s ease;
-        font-weight: 500;
-        color: #475569;
-    }
-    .complex-chip:hover {
-        border-color: #818cf8;
-        background: #f5f3ff;
-    }
-    .complex-chip.selected {
-        border-color: #6366f1;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-    }
-    
-    /* 섹션 카드 */
-    .section-card {
-        background: white;
-        border-radius: 16px;
-        padding: 1.5rem;
-        margin-bottom: 1.5rem;
-        box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-    }
-    .section-title {
-        font-size: 1.1rem;
-        font-weight: 700;
-        color: #1e293b;
-        margin-bottom: 1rem;
-        display: flex;
-        align-items: center;
-        gap: 8px;
-    }
-    
-    /* 매물 카드 (새 디자인) */
-    .listing-card {
-        background: white;
-        border-radius: 16px;
-        padding: 1.25rem;
-        margin-bottom: 1rem;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.04);
-        border: 1px solid #f1f5f9;
-        transition: all 0.25s ease;
-    }
-    .listing-card:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 8px 25px rgba(0,0,0,0.08);
-        border-color: #e0e7ff;
-    }
-    
-    /* 거래 유형 태그 */
-    .trade-tag {
-        display: inline-flex;
-        align-items: center;
-        padding: 5px 12px;
-        border-radius: 20px;
-        font-size: 12px;
-        font-weight: 600;
-        letter-spacing: 0.3px;
-    }
-    .trade-sale { background: #fef2f2; color: #dc2626; }
-    .trade-jeonse { background: #eff6ff; color: #2563eb; }
-    .trade-rent { background: #faf5ff; color: #9333ea; }
-    
-    /* 가격 */
-    .price-text {
-        font-size: 1.5rem;
-        font-weight: 800;
-        color: #0f172a;
-        margin: 8px 0;
-    }
-    .converted-price {
-        display: inline-block;
-        background: linear-gradient(135deg, #f0f9ff 0%, #e0f2fe 100%);
-        color: #0369a1;
-        padding: 6px 14px;
-        border-radius: 8px;
-        font-size: 13px;
-        font-weight: 600;
-    }
-    
-    /* 상세 정보 */
-    .detail-row {
-        display: flex;
-        flex-wrap: wrap;
-        gap: 16px;
-        margin-top: 12px;
-        font-size: 13px;
-        color: #64748b;
-    }
-    .detail-item {
-        display: flex;
-        align-items: center;
-        gap: 4px;
-    }
-    
-    /* 설명 */
-    .desc-box {
-        background: #f8fafc;
-        border-radius: 10px;
-        padding: 12px 14px;
-        margin-top: 12px;
-        font-size: 13px;
-        color: #475569;
-        line-height: 1.5;
-    }
-    
-    /* 통계 카드 */
-    .stat-row {
-        display: grid;
-        grid-template-columns: repeat(4, 1fr);
-        gap: 16px;
-        margin: 1.5rem 0;
-    }
-    .stat-box {
-        background: white;
-        border-radius: 14px;
-        padding: 20px;
-        text-align: center;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.04);
-    }
-    .stat-value {
-        font-size: 1.75rem;
-        font-weight: 800;
-        color: #1e293b;
-    }
-    .stat-label {
-        font-size: 13px;
-        color: #94a3b8;
-        margin-top: 4px;
-    }
-    
-    /* 알림 박스 */
-    .alert-box {
-        padding: 16px 20px;
-        border-radius: 12px;
-        margin: 1rem 0;
-        display: flex;
-        align-items: flex-start;
-        gap: 12px;
-    }
-    .alert-info {
-        background: #f0f9ff;
-        border: 1px solid #bae6fd;
-        color: #0369a1;
-    }
-    .alert-warning {
-        background: #fffbeb;
-        border: 1px solid #fcd34d;
-        color: #92400e;
-    }
-    .alert-error {
-        background: #fef2f2;
-        border: 1px solid #fecaca;
-        color: #dc2626;
-    }
-    .alert-success {
-        background: #f0fdf4;
-        border: 1px solid #bbf7d0;
-        color: #16a34a;
-    }
-    
-    /* 선택된 단지 표시 */
-    .selected-complex-tag {
-        display: inline-flex;
-        align-items: center;
-        gap: 6px;
-        background: #6366f1;
-        color: white;
-        padding: 8px 14px;
-        border-radius: 20px;
-        font-size: 13px;
-        font-weight: 500;
-        margin: 4px;
-    }
-    .selected-complex-tag .remove {
-        cursor: pointer;
-        opacity: 0.8;
-    }
-    .selected-complex-tag .remove:hover {
-        opacity: 1;
-    }
-    
-    /* 로딩 상태 */
-    .loading-box {
-        text-align: center;
-        padding: 3rem;
-        color: #64748b;
-    }
-    .loading-spinner {
-        width: 40px;
-        height: 40px;
-        border: 3px solid #e2e8f0;
-        border-top: 3px solid #6366f1;
-        border-radius: 50%;
-        animation: spin 1s linear infinite;
-        margin: 0 auto 1rem;
-    }
-    @keyframes spin {
-        0% { transform: rotate(0deg); }
-        100% { transform: rotate(360deg); }
-    }
-    
-    /* 빈 상태 */
-    .empty-state {
-        text-align: center;
-        padding: 4rem 2rem;
-        color: #94a3b8;
-    }
-    .empty-state .icon {
-        font-size: 4rem;
-        margin-bottom: 1rem;
-    }
-    
-    /* 필터 컨테이너 */
-    .filter-container {
-        background: white;
-        border-radius: 14px;
-        padding: 1.25rem;
-        margin-bottom: 1.5rem;
-        box-shadow: 0 1px 3px rgba(0,0,0,0.06);
-    }
-    
-    /* Streamlit 기본 요소 커스텀 */
-    div[data-testid="stHorizontalBlock"] {
-        gap: 1rem;
-    }
-    .stButton > button {
-        border-radius: 10px;
-        font-weight: 600;
-        transition: all 0.2s;
-    }
-    .stButton > button:hover {
-        transform: translateY(-1px);
-    }
-    div[data-testid="stMetric"] {
-        background: white;
-        padding: 1rem;
-        border-radius: 12px;
-        box-shadow: 0 1px 3px rgba(0,0,0,0.06);
-    }
-</style>
-""", unsafe_allow_html=True)
+@st.cache_resource
+def load_css() -> str:
+    """style.css 를 한 번만 읽어 <style> 블록으로 보관 (리런마다 파일을 다시 읽지 않음)"""
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "style.css"), encoding="utf-8") as f:
+        return f"<style>\n{f.read()}</style>"
 
 
-# ============================================================
-# API 클래스 (세션 유지, 재시도 로직)
-# ============================================================
-class NaverLandAPI:
-    """네이버 부동산 API 클라이언트"""
-    
-    BASE_URL = "https://new.land.naver.com/api"
-    
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update(self._get_headers())
-        self.last_request_time = 0
-        self.min_interval = 3.0  # 최소 요청 간격 (초)
-    
-    def _get_headers(self) -> dict:
-        """브라우저와 유사한 헤더 생성"""
-        return {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
-            "Accept": "application/json, text/plain, */*",
-            "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-            "Accept-Encoding": "gzip, deflate, br",
-            "Referer": "https://new.land.naver.com/complexes",
-            "Origin": "https://new.land.naver.com",
-            "Sec-Ch-Ua": '"Chromium";v="122", "Not(A:Brand";v="24", "Google Chrome";v="122"',
-            "Sec-Ch-Ua-Mobile": "?0",
-            "Sec-Ch-Ua-Platform": '"Windows"',
-            "Sec-Fetch-Dest": "empty",
-            "Sec-Fetch-Mode": "cors",
-            "Sec-Fetch-Site": "same-origin",
-        }
-    
-    def _wait_for_rate_limit(self):
-        """요청 간격 조절"""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.min_interval:
-            wait_time = self.min_interval - elapsed + random.uniform(0.5, 1.5)
-            time.sleep(wait_time)
-        self.last_request_time = time.time()
-    
-    def _request_with_retry(self, url: str, params: dict = None, max_retries: int = 3) -> Optional[dict]:
-        """지수 백오프를 사용한 재시도 로직"""
-        for attempt in range(max_retries):
-            self._wait_for_rate_limit()
-            
-            try:
-                response = self.session.get(url, params=params, timeout=15)
-                
-                if response.status_code == 200:
-                    return response.json()
-                elif response.status_code == 429:
-                    # 429 에러 시 대기 시간 증가
-                    wait = (2 ** attempt) * 5 + random.uniform(1, 3)
-                    time.sleep(wait)
-                    continue
-                else:
-                    return None
-                    
-            except requests.exceptions.RequestException:
-                if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)
-                continue
-        
-        return None
-    
-    def search_complex(self, keyword: str) -> Tuple[bool, Optional[dict], str]:
-        """단지 검색"""
-        # 프리셋에서 먼저 검색
-        for name, complex_id in PRESET_COMPLEXES.items():
-            if keyword in name or name in keyword:
-                return True, {"name": name, "id": complex_id}, ""
-        
-        # API 검색
-        url = f"{self.BASE_URL}/search"
-        params = {"keyword": keyword}
-        
-        data = self._request_with_retry(url, params)
-        
-        if data is None:
-            return False, None, "검색 실패 (네트워크 오류 또는 차단)"
-        
-        suggests = data.get("suggests", [])
-        
-        for item in suggests:
-            if item.get("cortarType") == "AptComplex":
-                return True, {
-                    "name": item.get("cortarName", keyword),
-                    "id": item.get("complexNo") or item.get("cortarNo")
-                }, ""
-        
-        # 다른 형식 시도
-        for item in suggests:
-            complex_no = item.get("complexNo") or item.get("cortarNo")
-            if complex_no:
-                return True, {
-                    "name": item.get("cortarName", keyword),
-                    "id": complex_no
-                }, ""
-        
-        return False, None, "검색 결과가 없습니다"
-    
-    def get_listings(self, complex_id: str, complex_name: str) -> Tuple[bool, List[dict], str]:
-        """매물 목록 조회"""
-        url = f"{self.BASE_URL}/articles/complex/{complex_id}"
-        params = {
-            "realEstateType": "APT",
-            "tradeType": "A1:B1:B2",
-            "tag": ":::::::::",
-            "rentPriceMin": "0",
-            "rentPriceMax": "900000000",
-            "priceMin": "0",
-            "priceMax": "900000000",
-            "areaMin": "0",
-            "areaMax": "900000000",
-            "showArticle": "false",
-            "sameAddressGroup": "true",
-            "page": "1",
-            "complexNo": complex_id
-        }
-        
-        # Referer 업데이트
-        self.session.headers["Referer"] = f"https://new.land.naver.com/complexes/{complex_id}"
-        
-        data = self._request_with_retry(url, params)
-        
-        if data is None:
-            return False, [], "조회 실패"
-        
-        articles = data.get("articleList", [])
-        parsed = [self._parse_article(art, complex_name) for art in articles]
-        
-        return True, parsed, ""
-    
-    def _parse_article(self, art: dict, complex_name: str) -> dict:
-        """매물 데이터 파싱"""
-        # 가격 파싱
-        price_str = str(art.get("dealOrWarrantPrc", "0")).replace(",", "").replace(" ", "")
-        price = 0
-        
-        if "억" in price_str:
-            parts = price_str.split("억")
-            try:
-                uk = int(parts[0]) * 10000
-                man = int(parts[1]) if len(parts) > 1 and parts[1] else 0
-                price = uk + man
-            except:
-                price = 0
-        else:
-            try:
-                price = int(price_str) if price_str else 0
-            except:
-                price = 0
-        
-        # 월세 파싱
-        rent_str = str(art.get("rentPrc", "0")).replace(",", "")
-        try:
-            rent = int(rent_str) if rent_str else 0
-        except:
-            rent = 0
-        
-        return {
-            "단지명": complex_name,
-            "거래유형": art.get("tradeTypeName", ""),
-            "가격": price,
-            "월세": rent,
-            "동": art.get("buildingName", "-"),
-            "층": art.get("floorInfo", "-"),
-            "면적": art.get("areaName", "-"),
-            "방향": art.get("direction", "-"),
-            "설명": art.get("articleFeatureDesc", ""),
-            "확인일": art.get("articleConfirmYmd", ""),
-        }
+st.markdown(load_css(), unsafe_allow_html=True)
 
 
 # ============================================================
-# 유틸리티 함수
+# 공유 API 클라이언트 (프로세스당 1개)
 # ============================================================
 
-def format_price(val: int) -> str:
-    """가격 포맷팅"""
-    if val == 0:
-        return "-"
-    uk = val // 10000
-    man = val % 10000
-    if uk > 0 and man > 0:
-        return f"{uk}억 {man:,}"
-    elif uk > 0:
-        return f"{uk}억"
-    return f"{man:,}만원"
-
-
-def calc_converted(price: int, rent: int, rate: int) -> int:
-    """환산가 계산"""
-    if rent > 0:
-        return int(price + (rent / rate) * 10000)
-    return price
-
-
-def generate_demo_data(names: List[str]) -> pd.DataFrame:
-    """데모 데이터 생성"""
-    if not names:
-        names = ["샘플단지"]
-    
-    data = []
-    for _ in range(30):
-        name = random.choice(names)
-        trade = random.choices(["매매", "전세", "월세"], weights=[0.4, 0.4, 0.2])[0]
-        area = random.choice(["59㎡", "74㎡", "84㎡", "102㎡"])
-        area_num = int(area.replace("㎡", ""))
-        
-        if trade == "매매":
-            price = random.randint(140000 + area_num * 1500, 180000 + area_num * 2000)
-            rent = 0
-        elif trade == "전세":
-            price = random.randint(70000 + area_num * 800, 100000 + area_num * 1000)
-            rent = 0
-        else:
-            price = random.randint(10000, 50000)
-            rent = random.randint(80, 300)
-        
-        data.append({
-            "단지명": name,
-            "거래유형": trade,
-            "가격": price,
-            "월세": rent,
-            "동": f"{random.randint(101, 115)}동",
-            "층": f"{random.choice(['저','중','고'])}/{random.randint(20,35)}",
-            "면적": area,
-            "방향": random.choice(["남향", "남동향", "동향"]),
-            "설명": random.choice(["올수리", "로얄층", "급매", "깨끗함", "역세권"]),
-            "확인일": datetime.now().strftime("%Y-%m-%d"),
-        })
-    
-    return pd.DataFrame(data)
+@st.cache_resource
+def get_shared_client() -> NaverLandAPI:
+    """모든 브라우저 세션이 공유하는 API 클라이언트
+
+    요청 속도 제한, 응답 캐시, 진행 중 요청 병합이 사용자 수와 무관하게 프로세스 단위로 적용된다.
+    """
+    return NaverLandAPI(
+        limiter=TokenBucketLimiter(rate=2.0), cache=ResponseCache(),
+        rate_control=AdaptiveRateController(), breaker=CircuitBreaker(),
+        directory=ComplexDirectory(), archive=ResponseArchive()
+    )
+
+
+@st.cache_resource
+def get_listing_store() -> ListingStore:
+    """수집기(collector.py)와 공유하는 매물 저장소"""
+    return ListingStore()
+
+
+@st.cache_resource
+def get_watchlist() -> WatchList:
+    """수집기와 공유하는 관심 조건·알림함"""
+    return WatchList()
+
+
+api_client = get_shared_client()
+listing_store = get_listing_store()
+watchlist = get_watchlist()
+
+# 이 시간 안에 수집된 스냅샷은 네이버에 다시 요청하지 않고 그대로 사용 (초)
+STORE_MAX_AGE = 30 * 60
+
+
+def apply_limiter_settings():
+    """설정 슬라이더 변경 시 공유 limiter에 반영"""
+    api_client.limiter.configure(
+        rate=st.session_state.request_rate,
+        burst=st.session_state.request_burst,
+        max_per_host=st.session_state.max_concurrency,
+    )
+
+
+def format_ages(fetched: dict) -> str:
+    """{단지명: 조회 시각} → 잠실엘스(12분 전), 헬리오시티(3시간 전)"""
+    now = time.time()
+    parts = []
+    for name, fetched_at in fetched.items():
+        minutes = int((now - fetched_at) // 60)
+        age = f"{minutes}분 전" if minutes < 60 else (f"{minutes // 60}시간 전" if minutes < 1440 else f"{minutes // 1440}일 전")
+        parts.append(f"{name}({age})")
+    return ", ".join(parts)
 
 
 # ============================================================
@@ -604,12 +142,39 @@ if "listings_data" not in st.session_state:
 if "demo_mode" not in st.session_state:
     st.session_state.demo_mode = False
 
-if "api_client" not in st.session_state:
-    st.session_state.api_client = NaverLandAPI()
-
 if "fetch_errors" not in st.session_state:
     st.session_state.fetch_errors = []
 
+if "listing_tracker" not in st.session_state:
+    st.session_state.listing_tracker = ListingTracker()
+
+if "stale_hits" not in st.session_state:
+    st.session_state.stale_hits = {}  # {단지명: 마지막 성공 조회 시각}
+
+if "store_hits" not in st.session_state:
+    st.session_state.store_hits = {}  # {단지명: 수집 시각}
+
+if "listing_deltas" not in st.session_state:
+    st.session_state.listing_deltas = {}  # {단지명: ListingDelta}
+
+if "filter_index" not in st.session_state:
+    st.session_state.filter_index = None  # 불러온 매물의 ListingFilterIndex
+
+if "watch_checked" not in st.session_state:
+    st.session_state.watch_checked = None  # 마지막으로 관심 조건을 검사한 매물
+
+if "deduped" not in st.session_state:
+    st.session_state.deduped = None  # (불러온 매물, 중복을 묶은 매물)
+
+if "market_stats" not in st.session_state:
+    st.session_state.market_stats = MarketStats()  # 바뀐 단지만 다시 집계하는 시세 통계
+
+if "card_page" not in st.session_state:
+    st.session_state.card_page = 0
+
+if "cards_per_page" not in st.session_state:
+    st.session_state.cards_per_page = 20
+
 
 # ============================================================
 # 메인 UI
@@ -629,12 +194,61 @@ st.markdown("### 📍 단지 선택")
 # 지역별 탭
 tab1, tab2, tab3, tab4, tab5 = st.tabs(["🏠 송파구", "💎 강남구", "🌟 서초구", "🔍 기타 지역", "✏️ 직접 검색"])
 
-preset_by_region = {
-    "송파구": ["잠실엘스", "헬리오시티", "트리지움", "리센츠", "파크리오", "올림픽선수촌"],
-    "강남구": ["은마아파트", "대치래미안", "도곡렉슬", "타워팰리스", "개포주공1단지"],
-    "서초구": ["래미안퍼스티지", "반포자이", "아크로리버파크", "래미안원베일리", "서초그랑자이"],
-    "기타": ["마포래미안푸르지오", "여의도자이", "트리마제", "현대프라임"]
-}
+# 카드 보기 페이지당 매물 수 선택지
+CARDS_PER_PAGE_OPTIONS = [10, 20, 50, 100]
+
+
+def _move_card_page(delta: int):
+    st.session_state.card_page = max(0, st.session_state.card_page + delta)
+
+
+def render_listing_cards(rows: pd.DataFrame):
+    """카드 보기 (현재 페이지의 카드만 한 번에 렌더링, 페이지 위치는 세션에 유지)"""
+    per_page = st.session_state.cards_per_page
+    page_count = max(1, -(-len(rows) // per_page))
+    # 필터로 결과가 줄어든 경우 마지막 페이지로 맞춤
+    st.session_state.card_page = min(st.session_state.card_page, page_count - 1)
+    page = st.session_state.card_page
+    
+    start = page * per_page
+    # 저장소에서 불러온 매물의 설명은 현재 페이지 것만 읽어 옴
+    page_rows = listing_store.attach_descriptions(rows.iloc[start:start + per_page])
+    st.markdown(build_cards_html(page_rows), unsafe_allow_html=True)
+    
+    nav_prev, nav_info, nav_next, nav_size = st.columns([1, 2, 1, 1])
+    with nav_prev:
+        st.button("◀ 이전", key="card_prev", disabled=page == 0,
+                  on_click=_move_card_page, args=(-1,), use_container_width=True)
+    with nav_info:
+        end = min(start + per_page, len(rows))
+        st.markdown(
+            f"<div style='text-align: center; padding-top: 0.5rem; color: #64748b;'>"
+            f"{page + 1} / {page_count} 페이지 · {start + 1}-{end}번째 매물</div>",
+            unsafe_allow_html=True
+        )
+    with nav_next:
+        st.button("다음 ▶", key="card_next", disabled=page >= page_count - 1,
+                  on_click=_move_card_page, args=(1,), use_container_width=True)
+    with nav_size:
+        st.selectbox("페이지당", CARDS_PER_PAGE_OPTIONS, key="cards_per_page",
+                     on_change=lambda: st.session_state.update(card_page=0),
+                     label_visibility="collapsed")
+
+
+def range_slider(label: str, index: ListingFilterIndex, col: str, rate: int, step: float, fmt: str):
+    """범위 필터 슬라이더, 전체 범위를 선택하면 None (필터 없음)
+
+    데이터·환산 비율이 바뀌어 범위가 달라지면 새 위젯으로 취급되어 전체 범위로 돌아간다.
+    """
+    bounds = index.bounds(col, rate)
+    if bounds is None:
+        return None
+    low, high = math.floor(bounds[0] / step) * step, math.ceil(bounds[1] / step) * step
+    if low >= high:
+        return None
+    selected = st.slider(label, min_value=low, max_value=high, value=(low, high), step=step, format=fmt)
+    return None if selected == (low, high) else selected
+
 
 def render_preset_buttons(region_name: str, presets: List[str]):
     cols = st.columns(min(len(presets), 4))
@@ -656,16 +270,16 @@ def render_preset_buttons(region_name: str, presets: List[str]):
                 st.rerun()
 
 with tab1:
-    render_preset_buttons("송파", preset_by_region["송파구"])
+    render_preset_buttons("송파", PRESET_REGIONS["송파구"])
 
 with tab2:
-    render_preset_buttons("강남", preset_by_region["강남구"])
+    render_preset_buttons("강남", PRESET_REGIONS["강남구"])
 
 with tab3:
-    render_preset_buttons("서초", preset_by_region["서초구"])
+    render_preset_buttons("서초", PRESET_REGIONS["서초구"])
 
 with tab4:
-    render_preset_buttons("기타", preset_by_region["기타"])
+    render_preset_buttons("기타", PRESET_REGIONS["기타"])
 
 with tab5:
     search_col1, search_col2 = st.columns([4, 1])
@@ -678,10 +292,24 @@ with tab5:
     with search_col2:
         search_btn = st.button("검색", use_container_width=True)
     
+    # 로컬 단지 색인 추천 (초성·오타 허용, 네트워크 요청 없음)
+    suggestions = api_client.directory.search(search_input, limit=6) if search_input else []
+    if suggestions and not search_btn:
+        st.caption("추천 단지 (초성 검색 가능, 예: ㅎㄹㅇㅅㅌ) — 찾는 단지가 없으면 '검색'을 누르세요")
+        suggest_cols = st.columns(3)
+        for i, match in enumerate(suggestions):
+            with suggest_cols[i % 3]:
+                if st.button(f"➕ {match.name}", key=f"suggest_{match.id}_{i}", use_container_width=True):
+                    if match.name not in st.session_state.selected_complexes:
+                        st.session_state.selected_complexes[match.name] = match.id
+                        st.session_state.listings_data = None
+                    st.rerun()
+    
     if search_btn and search_input:
         with st.spinner("검색 중..."):
-            api = st.session_state.api_client
-            success, data, error = api.search_complex(search_input)
+            success, data, error = api_client.search_complex(
+                search_input, bypass_cache=st.session_state.get("bypass_cache", False)
+            )
             
             if success and data:
                 if data["name"] not in st.session_state.selected_complexes:
@@ -733,6 +361,49 @@ with st.expander("⚙️ 설정", expanded=False):
             value=st.session_state.demo_mode,
             help="네이버 차단 시 샘플 데이터로 기능 확인"
         )
+    
+    # 요청 속도 설정은 공유 클라이언트에 걸리므로 모든 사용자에게 적용됨
+    limiter = api_client.limiter
+    col3, col4, col5 = st.columns(3)
+    with col3:
+        request_rate = st.slider(
+            "요청 속도 (초당)",
+            min_value=0.1, max_value=2.0, value=float(limiter.rate), step=0.1,
+            key="request_rate", on_change=apply_limiter_settings,
+            help="전체 요청에 적용되는 최대 요청 속도 (토큰 버킷, 모든 사용자 공통). 실제 속도는 응답에 따라 자동 조절됨"
+        )
+    with col4:
+        request_burst = st.slider(
+            "순간 최대 요청 수",
+            min_value=1, max_value=10, value=int(limiter.burst),
+            key="request_burst", on_change=apply_limiter_settings,
+            help="대기 없이 연속으로 보낼 수 있는 요청 수"
+        )
+    with col5:
+        max_concurrency = st.slider(
+            "동시 요청 수",
+            min_value=1, max_value=8, value=int(limiter.max_per_host),
+            key="max_concurrency", on_change=apply_limiter_settings,
+            help="네이버 서버에 동시에 보내는 최대 요청 수"
+        )
+    
+    adaptive_rates = api_client.rate_control.rates()
+    if adaptive_rates:
+        st.caption("📈 자동 조절 중인 요청 속도 (429 응답 시 감소, 정상 응답 시 증가): " + ", ".join(
+            f"{family} {rate:.2f}회/초" for family, rate in adaptive_rates.items()
+        ))
+    
+    bypass_cache = st.toggle(
+        "캐시 무시",
+        key="bypass_cache",
+        help="저장된 응답을 사용하지 않고 네이버에서 새로 조회 (매물 10분, 검색 7일 보관)"
+    )
+    dedupe = st.toggle(
+        "중복 매물 묶기",
+        value=True,
+        key="dedupe",
+        help="여러 중개사가 올린 같은 호실(동·층·면적·방향·거래유형이 같고 가격 차이 2% 이내)을 가장 싼 매물 1건으로 표시"
+    )
 
 # 데모 모드 알림
 if st.session_state.demo_mode:
@@ -764,34 +435,75 @@ else:
     if st.session_state.listings_data is not None:
         df = st.session_state.listings_data
     else:
-        all_data = []
+        frames = []
         errors = []
-        api = st.session_state.api_client
         
         progress_container = st.empty()
         status_container = st.empty()
         
         complexes = list(st.session_state.selected_complexes.items())
-        total = len(complexes)
         
-        for i, (name, cid) in enumerate(complexes):
-            progress_container.progress((i + 1) / total, text=f"📡 {name} 조회 중... ({i+1}/{total})")
-            status_container.caption(f"⏳ 요청 간격 준수 중 (3초+)")
-            
-            success, listings, error = api.get_listings(cid, name)
-            
+        # 수집기가 미리 받아 둔 최신 스냅샷은 바로 사용 (캐시 무시 시 제외)
+        stored_at = {}
+        if not bypass_cache:
+            stored_df, stored_at = listing_store.load([cid for _, cid in complexes], max_age=STORE_MAX_AGE)
+            if not stored_df.empty:
+                frames.append(stored_df)
+        st.session_state.store_hits = {name: stored_at[cid] for name, cid in complexes if cid in stored_at}
+        
+        to_fetch = [(name, cid) for name, cid in complexes if cid not in stored_at]
+        failed = []
+        
+        # 차단 감지 중이면 요청하지 않고 마지막으로 받은 매물을 바로 표시
+        if api_client.is_blocked:
+            failed, to_fetch = to_fetch, []
+        total = len(to_fetch)
+        
+        if to_fetch:
+            progress_container.progress(0.0, text=f"📡 {total}개 단지 조회 중...")
+            status_container.caption(f"⏳ 요청 속도 제한 준수 중 (초당 {request_rate:.1f}회)")
+        
+        # 완료되는 단지부터 누적 (이전 조회 대비 신규/변경 매물만 다시 파싱)
+        tracker = st.session_state.listing_tracker
+        results = fetch_listings_concurrently(
+            api_client, to_fetch, max_workers=max_concurrency, bypass_cache=bypass_cache,
+            fetch=partial(tracker.refresh, api_client)
+        )
+        previous = {}
+        for i, (name, success, listings, error) in enumerate(results):
+            progress_container.progress((i + 1) / total, text=f"📡 {name} 완료 ({i+1}/{total})")
+            cid = st.session_state.selected_complexes[name]
             if success:
-                all_data.extend(listings)
+                frames.append(listings)
+                listing_store.save(cid, name, listings)
             else:
+                failed.append((name, cid))
+                previous[cid] = listings
+            if error:
                 errors.append(f"{name}: {error}")
         
         progress_container.empty()
         status_container.empty()
         
+        # 실패한 단지는 마지막으로 성공한 스냅샷(오래된 데이터)으로 대체
+        stale_at = {}
+        if failed:
+            stale_df, stale_at = listing_store.load([cid for _, cid in failed])
+            if not stale_df.empty:
+                frames.append(stale_df)
+            frames.extend(
+                frame for cid, frame in previous.items()
+                if cid not in stale_at and frame is not None and not frame.empty
+            )
+        st.session_state.stale_hits = {name: stale_at[cid] for name, cid in failed if cid in stale_at}
+        
         st.session_state.fetch_errors = errors
+        st.session_state.listing_deltas = {
+            name: tracker.deltas[cid] for name, cid in complexes if cid in tracker.deltas
+        }
         
-        if all_data:
-            df = pd.DataFrame(all_data)
+        if frames:
+            df = concat_listings(frames)
             st.session_state.listings_data = df
 
 # 에러 표시
@@ -807,6 +519,130 @@ if st.session_state.fetch_errors:
     </div>
     """, unsafe_allow_html=True)
 
+# 저장소 데이터 사용 표시
+if st.session_state.store_hits and not st.session_state.demo_mode:
+    st.caption(f"💾 미리 수집된 데이터 사용: {format_ages(st.session_state.store_hits)} · 최신 데이터는 '캐시 무시' 후 매물 조회")
+
+# 차단 중 오래된 데이터 표시
+if st.session_state.stale_hits and not st.session_state.demo_mode:
+    recovery = (
+        f"{api_client.breaker.retry_in():.0f}초 후 자동으로 복구를 확인합니다"
+        if api_client.is_blocked else "복구되었습니다. '매물 조회'를 누르면 최신 데이터를 받습니다"
+    )
+    st.markdown(f"""
+    <div class="alert-box alert-warning">
+        <span>⏸️</span>
+        <div>
+            <strong>오래된 데이터 표시 중</strong><br>
+            {format_ages(st.session_state.stale_hits)}<br>
+            <small>{recovery}</small>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+# 변경 내역 표시 (증분 새로고침)
+if st.session_state.listing_deltas and not st.session_state.demo_mode:
+    deltas = st.session_state.listing_deltas
+    total_delta = ListingDelta(
+        [k for d in deltas.values() for k in d.new],
+        [k for d in deltas.values() for k in d.changed],
+        [k for d in deltas.values() for k in d.removed],
+    )
+    with st.expander(f"🔁 이전 조회 대비 변경: {total_delta.summary}", expanded=False):
+        for name, delta in deltas.items():
+            st.caption(f"{name}: {delta.summary}")
+        changed_df = st.session_state.listing_tracker.changed_rows(
+            [st.session_state.selected_complexes[name] for name in deltas
+             if name in st.session_state.selected_complexes]
+        )
+        if not changed_df.empty:
+            changed_df["가격"] = format_listing_price_series(changed_df["가격"], changed_df["월세"])
+            changed_df["확인일"] = format_confirm_dates(changed_df["확인일"])
+            st.dataframe(
+                changed_df[["변경", "단지명", "거래유형", "가격", "동", "층", "면적", "확인일"]],
+                use_container_width=True,
+                hide_index=True
+            )
+
+# 네트워크 진단 (엔드포인트별 지연·재시도·429·캐시 적중)
+metric_rows = api_client.metrics.summary_rows()
+if metric_rows and not st.session_state.demo_mode:
+    with st.expander("📊 네트워크 진단", expanded=False):
+        st.dataframe(pd.DataFrame(metric_rows), use_container_width=True, hide_index=True)
+        st.caption("지연 분위수는 히스토그램 구간 상한 기준 근사값입니다. 제한 대기는 요청 속도 조절로 기다린 시간입니다.")
+        st.download_button(
+            "📥 지표 다운로드 (Prometheus)",
+            api_client.metrics_text(),
+            "naver_land_metrics.prom",
+            "text/plain"
+        )
+
+# 관심 조건 알림 (새로 불러온 매물만 검사, 이미 알린 매물은 다시 알리지 않음)
+if df is not None and not st.session_state.demo_mode and st.session_state.watch_checked is not df:
+    watchlist.check(df, fill=listing_store.attach_descriptions)
+    st.session_state.watch_checked = df
+
+unread_n = watchlist.unread_count()
+with st.expander(f"🔔 관심 조건 알림{f' ({unread_n}건 새 알림)' if unread_n else ''}", expanded=False):
+    inbox = watchlist.inbox(unread_only=True)
+    if len(inbox) > 0:
+        inbox["가격"] = format_listing_price_series(inbox["price"], inbox["rent"])
+        inbox["시각"] = pd.to_datetime(inbox["created_at"], unit="s", utc=True).dt.tz_convert("Asia/Seoul").dt.strftime("%m-%d %H:%M")
+        st.dataframe(
+            inbox[["시각", "rule_name", "complex_name", "trade", "가격", "area", "reason"]].rename(columns={
+                "rule_name": "조건", "complex_name": "단지명", "trade": "거래유형", "area": "면적", "reason": "사유"
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
+        if st.button("✅ 모두 읽음", key="alerts_read"):
+            watchlist.mark_read()
+            st.rerun()
+    else:
+        st.caption("새 알림이 없습니다. 매물을 조회하거나 수집기가 수집할 때마다 조건을 검사합니다.")
+    
+    for rule_id, rule in watchlist.rules().items():
+        rcol1, rcol2 = st.columns([5, 1])
+        with rcol1:
+            st.markdown(f"**{rule.name}** · {rule.summary}")
+        with rcol2:
+            if st.button("삭제", key=f"rule_del_{rule_id}"):
+                watchlist.remove_rule(rule_id)
+                st.rerun()
+    
+    with st.form("watch_rule_form", clear_on_submit=True):
+        st.markdown("**조건 추가**")
+        wcol1, wcol2, wcol3 = st.columns(3)
+        with wcol1:
+            rule_name = st.text_input("이름", placeholder="엘스 84 전세 10억 이하")
+            rule_complex = st.selectbox("단지", ["전체"] + list(st.session_state.selected_complexes))
+            rule_trade = st.selectbox("거래유형", ["전체", "매매", "전세", "월세"])
+        with wcol2:
+            rule_area = st.slider("전용면적 (㎡)", 0, 200, (0, 200))
+            rule_price = st.number_input("가격 상한 (만원, 0이면 없음)", min_value=0, step=5000)
+            rule_rent = st.number_input("월세 상한 (만원, 0이면 없음)", min_value=0, step=10)
+        with wcol3:
+            rule_tag = st.text_input("매물 태그", placeholder="급매")
+            rule_keyword = st.text_input("설명 키워드", placeholder="역세권")
+            rule_cut = st.checkbox("가격 인하도 알림", value=True)
+        if st.form_submit_button("➕ 추가"):
+            rule = WatchRule(
+                name=rule_name.strip() or "관심 조건",
+                complex_name=None if rule_complex == "전체" else rule_complex,
+                trade=None if rule_trade == "전체" else rule_trade,
+                area_min=float(rule_area[0]) if rule_area[0] > 0 else None,
+                area_max=float(rule_area[1]) if rule_area[1] < 200 else None,
+                price_max=int(rule_price) or None,
+                rent_max=int(rule_rent) or None,
+                keyword=rule_keyword.strip() or None,
+                tag=rule_tag.strip() or None,
+                price_cut=rule_cut,
+            )
+            watchlist.add_rule(rule)
+            # 지금 불러온 매물도 바로 검사
+            st.session_state.watch_checked = None
+            st.rerun()
+
 # 데이터 없음
 if df is None or df.empty:
     st.markdown("""
@@ -817,8 +653,19 @@ if df is None or df.empty:
     """, unsafe_allow_html=True)
     st.stop()
 
-# 환산가 계산
-df["환산가"] = df.apply(lambda x: calc_converted(x["가격"], x["월세"], conversion_rate), axis=1)
+# 중복 매물 묶기 (불러온 매물이 바뀔 때만 다시 묶음)
+duplicate_n = 0
+if dedupe:
+    if st.session_state.deduped is None or st.session_state.deduped[0] is not df:
+        st.session_state.deduped = (df, dedupe_listings(df))
+    duplicate_n = len(df) - len(st.session_state.deduped[1])
+    df = st.session_state.deduped[1]
+
+# 필터 색인 (불러온 매물이 바뀔 때만 새로 만듦, 환산가는 색인이 비율별로 계산)
+filter_index = st.session_state.filter_index
+if filter_index is None or filter_index.df is not df:
+    filter_index = ListingFilterIndex(df)
+    st.session_state.filter_index = filter_index
 
 # 필터
 st.markdown("### 🔍 필터 및 정렬")
@@ -826,38 +673,48 @@ st.markdown("### 🔍 필터 및 정렬")
 fcol1, fcol2, fcol3, fcol4 = st.columns(4)
 
 with fcol1:
-    trade_opts = df["거래유형"].unique().tolist()
+    trade_opts = filter_index.options("거래유형")
     selected_trades = st.multiselect("거래유형", trade_opts, default=trade_opts)
 
 with fcol2:
-    complex_opts = df["단지명"].unique().tolist()
+    complex_opts = filter_index.options("단지명")
     selected_names = st.multiselect("단지", complex_opts, default=complex_opts)
 
 with fcol3:
-    area_opts = df["면적"].unique().tolist()
+    area_opts = filter_index.options("면적")
     selected_areas = st.multiselect("면적", area_opts, default=area_opts)
 
 with fcol4:
-    sort_by = st.selectbox("정렬", ["환산가 낮은순", "환산가 높은순", "가격 낮은순", "가격 높은순"])
-
-# 필터 적용
-filtered = df[
-    (df["거래유형"].isin(selected_trades)) &
-    (df["단지명"].isin(selected_names)) &
-    (df["면적"].isin(selected_areas))
-].copy()
-
-# 정렬
-sort_col = "환산가" if "환산가" in sort_by else "가격"
+    sort_by = st.selectbox("정렬", [
+        "환산가 낮은순", "환산가 높은순", "가격 낮은순", "가격 높은순", "평당가 낮은순", "평당가 높은순"
+    ])
+
+
+rcol1, rcol2 = st.columns(2)
+ranges = {}
+with rcol1:
+    area_range = range_slider("전용면적 (㎡)", filter_index, "전용면적", conversion_rate, 1.0, "%.0f㎡")
+    if area_range:
+        ranges["전용면적"] = area_range
+with rcol2:
+    unit_range = range_slider("평당가 (환산가 기준, 만원)", filter_index, "평당가", conversion_rate, 100.0, "%.0f")
+    if unit_range:
+        ranges["평당가"] = unit_range
+
+# 필터 적용 + 정렬 (같은 조건의 리런은 캐시된 결과 사용)
+sort_col = next(col for col in ("환산가", "평당가", "가격") if col in sort_by)
 sort_asc = "낮은순" in sort_by
-filtered = filtered.sort_values(sort_col, ascending=sort_asc)
+filtered = filter_index.select(
+    {"거래유형": selected_trades, "단지명": selected_names, "면적": selected_areas},
+    sort_col, sort_asc, conversion_rate, ranges=ranges
+)
 
 # 통계
 st.markdown("### 📊 통계")
 
-stat_cols = st.columns(4)
+stat_cols = st.columns(5)
 with stat_cols[0]:
-    st.metric("총 매물", f"{len(filtered)}건")
+    st.metric("총 매물", f"{len(filtered)}건", help=f"중복 매물 {duplicate_n}건을 묶었습니다" if duplicate_n else None)
 with stat_cols[1]:
     if len(filtered) > 0:
         st.metric("최저 환산가", format_price(int(filtered["환산가"].min())))
@@ -869,10 +726,47 @@ with stat_cols[2]:
     else:
         st.metric("평균 환산가", "-")
 with stat_cols[3]:
-    sale_n = len(filtered[filtered["거래유형"] == "매매"])
-    jeonse_n = len(filtered[filtered["거래유형"] == "전세"])
-    rent_n = len(filtered[filtered["거래유형"] == "월세"])
+    trade_counts = filtered["거래유형"].value_counts()
+    sale_n = trade_counts.get("매매", 0)
+    jeonse_n = trade_counts.get("전세", 0)
+    rent_n = trade_counts.get("월세", 0)
     st.metric("유형별", f"매매 {sale_n} | 전세 {jeonse_n} | 월세 {rent_n}")
+with stat_cols[4]:
+    unit_median = filtered["평당가"].median() if len(filtered) > 0 else float("nan")
+    st.metric("평당가 중앙값", "-" if pd.isna(unit_median) else format_price(int(round(unit_median))))
+
+# 단지별 단가 비교 (평당가·㎡당가, 환산가 기준)
+if len(filtered) > 0 and filtered["평당가"].notna().any():
+    with st.expander("📐 단지별 단가 비교", expanded=False):
+        summary = unit_price_summary(filtered)
+        for col in ["평당가 중앙값", "평당가 최저", "㎡당가 중앙값"]:
+            summary[col] = format_unit_price_series(summary[col])
+        summary["전용면적 중앙값"] = summary["전용면적 중앙값"].round(1)
+        st.dataframe(summary, use_container_width=True, hide_index=True)
+        st.caption("평당가는 공급면적(없으면 전용면적) 기준, ㎡당가는 전용면적 기준입니다. 월세는 환산가로 계산합니다.")
+
+# 시세 분석 (불러온 전체 매물 기준 집계, 선택한 단지·거래유형만 표시)
+with st.expander("📈 시세 분석 (단지 × 면적대 × 거래유형)", expanded=False):
+    market = st.session_state.market_stats.update(df, conversion_rate)
+    market = market[market["단지명"].isin(selected_names) & market["거래유형"].isin(selected_trades)]
+    
+    ratio = jeonse_ratio_table(market)
+    if len(ratio) > 0:
+        st.markdown("**전세가율** (전세 중앙값 ÷ 매매 중앙값)")
+        for col in ["매매 중앙값", "전세 중앙값"]:
+            ratio[col] = format_price_series(ratio[col].round())
+        st.dataframe(ratio, use_container_width=True, hide_index=True)
+    
+    if len(market) > 0:
+        st.markdown("**가격 분포** (환산가 사분위수)")
+        market = market.copy()
+        for col in ["환산가 Q1", "환산가 중앙값", "환산가 Q3"]:
+            market[col] = format_price_series(market[col].round())
+        market["평당가 중앙값"] = format_unit_price_series(market["평당가 중앙값"])
+        st.dataframe(market, use_container_width=True, hide_index=True)
+        st.caption("면적대는 전용면적 기준입니다. 매물이 바뀐 단지만 다시 집계합니다.")
+    else:
+        st.info("표시할 매물이 없습니다.")
 
 # 매물 목록
 st.markdown(f"### 🏠 매물 목록 ({len(filtered)}건)")
@@ -883,69 +777,50 @@ view_mode = st.radio("보기 모드", ["카드", "테이블"], horizontal=True,
 if len(filtered) == 0:
     st.info("조건에 맞는 매물이 없습니다.")
 elif view_mode == "테이블":
-    display_df = filtered.copy()
-    display_df["가격표시"] = display_df.apply(
-        lambda x: f"{format_price(x['가격'])}" + (f" / {int(x['월세']):,}" if x['월세'] > 0 else ""),
-        axis=1
-    )
-    display_df["환산가표시"] = display_df["환산가"].apply(lambda x: format_price(int(x)))
+    display_df = listing_store.attach_descriptions(filtered).copy()
+    display_df["가격표시"] = format_listing_price_series(display_df["가격"], display_df["월세"])
+    display_df["환산가표시"] = format_price_series(display_df["환산가"])
+    display_df["평당가표시"] = format_unit_price_series(display_df["평당가"])
+    display_df["전용면적"] = display_df["전용면적"].round(1)
+    table_cols = ["단지명", "거래유형", "가격표시", "환산가표시", "평당가표시", "동", "층", "면적", "전용면적",
+                  "방향", "설명", "태그"] + (["중개 수"] if "중개 수" in display_df.columns else [])
     
     st.dataframe(
-        display_df[["단지명", "거래유형", "가격표시", "환산가표시", "동", "층", "면적", "방향", "설명"]].rename(
-            columns={"가격표시": "가격", "환산가표시": "환산가"}
+        display_df[table_cols].rename(
+            columns={"가격표시": "가격", "환산가표시": "환산가", "평당가표시": "평당가"}
         ),
         use_container_width=True,
         hide_index=True,
         height=500
     )
 else:
-    for _, row in filtered.iterrows():
-        # 거래유형 태그
-        trade_class = "trade-sale" if row["거래유형"] == "매매" else ("trade-jeonse" if row["거래유형"] == "전세" else "trade-rent")
-        
-        # 가격 텍스트
-        price_txt = format_price(row["가격"])
-        if row["월세"] > 0:
-            price_txt += f" / {int(row['월세']):,}"
-        
-        converted_txt = format_price(int(row["환산가"]))
-        
-        st.markdown(f"""
-        <div class="listing-card">
-            <div style="display: flex; justify-content: space-between; align-items: flex-start; flex-wrap: wrap; gap: 10px;">
-                <div>
-                    <span class="trade-tag {trade_class}">{row["거래유형"]}</span>
-                    <span style="font-weight: 600; margin-left: 8px;">{row["단지명"]}</span>
-                    <div class="price-text">{price_txt}</div>
-                </div>
-                <div>
-                    <span class="converted-price">환산 {converted_txt}</span>
-                </div>
-            </div>
-            <div class="detail-row">
-                <span class="detail-item">🏢 {row["동"]}</span>
-                <span class="detail-item">📐 {row["면적"]}</span>
-                <span class="detail-item">⬆️ {row["층"]}</span>
-                <span class="detail-item">🧭 {row["방향"]}</span>
-                <span class="detail-item" style="color: #94a3b8;">📅 {row["확인일"]}</span>
-            </div>
-            <div class="desc-box">{row["설명"] if row["설명"] else "설명 없음"}</div>
-        </div>
-        """, unsafe_allow_html=True)
+    render_listing_cards(filtered)
 
 # 다운로드
 st.markdown("---")
-csv_data = filtered.to_csv(index=False, encoding="utf-8-sig")
-st.download_button(
-    "📥 CSV 다운로드",
-    csv_data,
-    f"매물_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
-    "text/csv"
-)
+# 파일은 버튼을 눌렀을 때만 청크 단위로 생성 (설명도 청크마다 저장소에서 채움)
+dcol1, dcol2 = st.columns([1, 3])
+with dcol1:
+    export_format = st.selectbox("형식", export_formats(), label_visibility="collapsed")
+with dcol2:
+    extension, mime = EXPORT_FORMATS[export_format]
+    st.download_button(
+        f"📥 {export_format} 다운로드",
+        partial(export_listings, filtered, export_format, fill=listing_store.attach_descriptions),
+        f"매물_{datetime.now().strftime('%Y%m%d_%H%M')}.{extension}",
+        mime
+    )
+
+# 메모리 사용량 (불러온 매물 DataFrame)
+with st.expander("🧮 메모리 사용량", expanded=False):
+    report = memory_report(df)
+    total_mb = report["MB"].sum()
+    st.caption(f"매물 {len(df):,}건 · {total_mb:.1f}MB · 매물당 {report['행당 바이트'].sum():.0f}바이트 (설명은 화면에 표시할 때 저장소에서 읽음)")
+    st.dataframe(report, use_container_width=True, hide_index=True)
 
 # 푸터
 st.caption("""
 💡 **Tip**: 환산가는 월세를 전세로 환산한 가격입니다 (기본 1억당 월40만원) | 
 네이버 서버가 요청을 차단할 경우 '데모 모드'를 사용하세요 | 
-요청 간격은 차단 방지를 위해 3초 이상으로 설정됩니다
+요청 속도는 차단 방지를 위해 '⚙️ 설정'에서 조절할 수 있습니다
 """)
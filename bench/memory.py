@@ -0,0 +1,89 @@
+"""
+매물 DataFrame 메모리 사용량 검사
+
+합성 매물(대역 서버와 같은 데이터)을 rows 건까지 늘려 compact dtype 과
+이전 방식(object 문자열 · int64 · 문자열 확인일)의 메모리를 비교한다.
+compact 결과가 기준(MB)을 넘으면 종료 코드 1 을 반환한다.
+
+    python bench/memory.py
+    python bench/memory.py --rows 200000 --max-mb 60
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_server import synthetic_articles  # noqa: E402
+from naver_land import concat_listings, memory_report, parse_article_batch  # noqa: E402
+
+
+def build_listings(rows: int, complexes: int, per_complex: int):
+    """complexes 개 단지를 파싱한 뒤 단지명·매물번호만 바꿔 rows 건까지 복제"""
+    import numpy as np
+    import pandas as pd
+
+    articles, names = [], []
+    for i in range(complexes):
+        cid = str(100000 + i)
+        page = 1
+        while True:
+            data = synthetic_articles(cid, page, 20, per_complex)
+            articles.extend(data["articleList"])
+            names.extend([f"단지{i}"] * len(data["articleList"]))
+            if not data["isMoreData"]:
+                break
+            page += 1
+    pool = parse_article_batch(articles, names)[0]
+
+    repeats = -(-rows // len(pool))
+    df = pd.concat([pool] * repeats, ignore_index=True).iloc[:rows]
+    copy_no = np.repeat(np.arange(repeats), len(pool))[:rows]
+    names = df["단지명"].astype(object) + pd.Series(copy_no, index=df.index).map(lambda n: f"-{n}" if n else "")
+    keys = df["매물번호"].astype(object) + "-" + pd.Series(copy_no, index=df.index).astype(str)
+    return concat_listings([df.assign(단지명=names.astype("category"), 매물번호=keys)])
+
+
+def legacy_frame(df):
+    """이전 표현: 범주·문자열 컬럼은 object, 가격은 int64, 확인일은 문자열"""
+    return df.assign(**{
+        col: df[col].astype(object) for col in ["단지명", "동", "층", "설명", "태그", "매물번호"]
+    }).assign(
+        가격=df["가격"].astype("int64"),
+        월세=df["월세"].astype("int64"),
+        확인일=df["확인일"].dt.strftime("%Y%m%d").astype(object),
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="매물 DataFrame 메모리 사용량 검사")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--complexes", type=int, default=200, help="파싱할 원본 단지 수")
+    parser.add_argument("--articles", type=int, default=60, help="단지당 매물 수")
+    parser.add_argument("--max-mb", type=float, default=300.0, help="compact 표현 허용 최대 메모리")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    df = build_listings(args.rows, args.complexes, args.articles)
+    print(f"매물 {len(df):,}건 생성: {time.perf_counter() - started:.1f}초")
+
+    report = memory_report(df)
+    print(report.to_string(index=False))
+    compact_mb = report["MB"].sum()
+    legacy_mb = memory_report(legacy_frame(df))["MB"].sum()
+    print(f"compact: {compact_mb:.1f}MB (매물당 {report['행당 바이트'].sum():.0f}바이트), "
+          f"이전 방식: {legacy_mb:.1f}MB (기준 {args.max_mb:.0f}MB)")
+
+    if compact_mb > args.max_mb:
+        print("실패: 메모리 기준 초과")
+        return 1
+    print("통과")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
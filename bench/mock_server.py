@@ -0,0 +1,259 @@
+"""
+로컬 네이버 부동산 API 대역 서버 (벤치마크용)
+
+/api/search, /api/regions/list, /api/regions/complexes, /api/articles/complex/{id} 를 합성 데이터 또는 녹화된 응답(fixture)으로 제공한다.
+응답 지연, 페이지 크기, 429 주입 비율을 조절할 수 있다.
+
+단독 실행:
+    python bench/mock_server.py --port 8765 --latency-ms 80 --error-rate 0.05
+
+코드에서 사용:
+    with MockNaverServer(latency_ms=30) as server:
+        api = NaverLandAPI(base_url=server.base_url)
+
+fixture 디렉터리 형식 (있는 파일만 사용, 없으면 합성 데이터):
+    search_{keyword}.json
+    regions_{cortarNo}.json
+    region_complexes_{cortarNo}.json
+    complex_{id}_p{page}.json
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+_COMPLEX_PATH = re.compile(r"^/api/articles/complex/(\w+)$")
+
+_TRADE_TYPES = [("매매", "A1"), ("전세", "B1"), ("월세", "B2")]
+_AREAS = ["59㎡", "74㎡", "84㎡", "84A/59", "102㎡", "114B/84"]
+_DIRECTIONS = ["남향", "남동향", "남서향", "동향", "서향"]
+_FEATURES = ["올수리", "로얄층", "급매", "깨끗함", "역세권", "즉시입주", ""]
+_TAGS = ["급매", "대단지", "역세권", "25년이상", "4년이내", "방세개"]
+
+
+def synthetic_articles(complex_id: str, page: int, page_size: int, total: int) -> Dict:
+    """단지ID·페이지로 결정되는 합성 articleList 응답"""
+    start = (page - 1) * page_size
+    end = min(start + page_size, total)
+    rng = random.Random(f"{complex_id}:{page}")
+    # 태그는 따로 뽑아 다른 필드 값이 태그 추가 전과 같게 유지
+    tag_rng = random.Random(f"{complex_id}:{page}:tags")
+    articles = []
+    for i in range(start, end):
+        trade, code = _TRADE_TYPES[rng.randrange(3)]
+        if trade == "매매":
+            uk, man = rng.randint(10, 45), rng.choice([0, 0, 5000, 2000, 7500])
+            price = f"{uk}억 {man:,}" if man else f"{uk}억"
+            rent = "0"
+        elif trade == "전세":
+            uk, man = rng.randint(5, 20), rng.choice([0, 5000, 3000])
+            price = f"{uk}억 {man:,}" if man else f"{uk}억"
+            rent = "0"
+        else:
+            price = f"{rng.randint(1, 9) * 5000:,}"
+            rent = str(rng.randint(80, 400))
+        articles.append({
+            "articleNo": f"{complex_id}{i:05d}",
+            "tradeTypeName": trade,
+            "tradeTypeCode": code,
+            "dealOrWarrantPrc": price,
+            "rentPrc": rent,
+            "buildingName": f"{rng.randint(101, 130)}동",
+            "floorInfo": f"{rng.choice(['저', '중', '고', str(rng.randint(1, 35))])}/{rng.randint(20, 35)}",
+            "areaName": rng.choice(_AREAS),
+            "direction": rng.choice(_DIRECTIONS),
+            "articleFeatureDesc": rng.choice(_FEATURES),
+            "articleConfirmYmd": f"2026{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}",
+            "realtorName": f"공인중개사{rng.randint(1, 40)}",
+            "tagList": tag_rng.sample(_TAGS, tag_rng.randint(0, 2)),
+        })
+    return {"articleList": articles, "isMoreData": end < total}
+
+
+def synthetic_regions(cortar_no: str, count: int) -> Dict:
+    """구 코드 → 합성 동 목록 (동 코드에는 하위 지역 없음)"""
+    if not cortar_no.endswith("00000"):
+        return {"regionList": []}
+    prefix = cortar_no[:5]
+    return {"regionList": [
+        {"cortarNo": f"{prefix}{101 + i:03d}00", "cortarName": f"합성{i + 1}동", "cortarType": "sec"}
+        for i in range(count)
+    ]}
+
+
+def synthetic_region_complexes(cortar_no: str, count: int) -> Dict:
+    """동 코드로 결정되는 합성 단지 목록"""
+    base = zlib.crc32(cortar_no.encode("utf-8")) % 900000 + 100000
+    return {"complexList": [
+        {"complexNo": str(base + i), "complexName": f"합성아파트{cortar_no[-5:-2]}-{i + 1}",
+         "realEstateTypeCode": "APT"}
+        for i in range(count)
+    ]}
+
+
+class MockNaverServer:
+    """백그라운드 스레드에서 동작하는 대역 서버
+
+    latency_ms ± jitter_ms 만큼 응답을 지연하고, error_rate 확률로 429(Retry-After 포함)를 반환한다.
+    """
+
+    def __init__(self, port: int = 0, latency_ms: float = 0, jitter_ms: float = 0,
+                 error_rate: float = 0.0, retry_after: Optional[float] = 1.0,
+                 page_size: int = 20, articles_per_complex: int = 60,
+                 regions_per_district: int = 3, complexes_per_region: int = 5,
+                 fixtures_dir: Optional[str] = None, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.page_size = page_size
+        self.articles_per_complex = articles_per_complex
+        self.regions_per_district = regions_per_district
+        self.complexes_per_region = complexes_per_region
+        self.fixtures_dir = fixtures_dir
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "ok": 0, "429": 0, "bytes": 0}
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                status, body, headers = server.handle(self.path)
+                payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+                with server._lock:
+                    server.stats["bytes"] += len(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def _fixture(self, name: str) -> Optional[Dict]:
+        if not self.fixtures_dir:
+            return None
+        path = os.path.join(self.fixtures_dir, name)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def handle(self, path: str):
+        """(상태 코드, 응답 본문, 추가 헤더)"""
+        with self._lock:
+            self.stats["requests"] += 1
+            delay = max(0.0, self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            throttled = self._rng.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+
+        if throttled:
+            with self._lock:
+                self.stats["429"] += 1
+            headers = {"Retry-After": f"{self.retry_after:g}"} if self.retry_after is not None else {}
+            return 429, {"error": "TOO_MANY_REQUESTS"}, headers
+
+        url = urlparse(path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        if url.path == "/api/search":
+            keyword = query.get("keyword", "")
+            body = self._fixture(f"search_{keyword}.json") or {"suggests": [{
+                "cortarType": "AptComplex",
+                "cortarName": keyword,
+                "complexNo": str(zlib.crc32(keyword.encode("utf-8")) % 900000 + 100000),
+            }]}
+        elif url.path == "/api/regions/list":
+            cortar_no = query.get("cortarNo", "")
+            body = self._fixture(f"regions_{cortar_no}.json") or synthetic_regions(
+                cortar_no, self.regions_per_district
+            )
+        elif url.path == "/api/regions/complexes":
+            cortar_no = query.get("cortarNo", "")
+            body = self._fixture(f"region_complexes_{cortar_no}.json") or synthetic_region_complexes(
+                cortar_no, self.complexes_per_region
+            )
+        else:
+            match = _COMPLEX_PATH.match(url.path)
+            if not match:
+                return 404, {"error": "NOT_FOUND"}, {}
+            complex_id = match.group(1)
+            page = int(query.get("page", "1") or 1)
+            body = self._fixture(f"complex_{complex_id}_p{page}.json") or synthetic_articles(
+                complex_id, page, self.page_size, self.articles_per_complex
+            )
+
+        with self._lock:
+            self.stats["ok"] += 1
+        return 200, body, {}
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = {key: 0 for key in self.stats}
+
+    def start(self) -> "MockNaverServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "MockNaverServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="로컬 네이버 부동산 API 대역 서버")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--jitter-ms", type=float, default=20)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="429 응답 비율 (0~1)")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="429 응답의 Retry-After (초)")
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--articles", type=int, default=60, help="단지당 매물 수")
+    parser.add_argument("--fixtures", default=None, help="녹화된 응답 디렉터리")
+    args = parser.parse_args(argv)
+
+    server = MockNaverServer(
+        port=args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate, retry_after=args.retry_after, page_size=args.page_size,
+        articles_per_complex=args.articles, fixtures_dir=args.fixtures,
+    )
+    print(f"대역 서버 실행 중: {server.base_url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+"""
+오프라인 벤치마크 (로컬 대역 서버 사용)
+
+단지 1 / 20 / 200개를 대역 서버에서 조회하며 다음을 측정한다.
+- 조회: 전체 소요 시간, 초당 요청 수, 초당 매물 수, 요청 지연 p50/p99, 429 재시도 수
+- 파싱: articleList → DataFrame 변환 시간
+- 재구성: 조회 중 보관한 응답 원본을 다시 파싱해 저장소에 저장하는 시간 (요청 없음)
+- 중복 묶기: 같은 호실로 보이는 매물을 대표 1건으로 줄이는 시간
+- 필터: 화면과 같은 필터 색인 생성 + 환산가 계산 + 필터 + 정렬 시간, 같은 조건 재실행 시간
+- 시세 분석: 단지 × 면적대 × 거래유형 통계 전체 집계 시간, 한 단지만 바뀐 뒤 증분 갱신 시간
+- 알림: 관심 조건 300개를 매물 전체와 대조하는 시간 (처음 검사, 바뀐 매물 없이 다시 검사)
+- 렌더링: 테이블 표시 컬럼 포맷팅 + 카드 1페이지 HTML 생성 시간
+
+    python bench/run.py
+    python bench/run.py --sizes 1 20 --latency-ms 80 --json bench_output.json
+    python bench/run.py --baseline bench_output.json     # 이전 결과와 비교
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_server import MockNaverServer, synthetic_articles  # noqa: E402
+from naver_land import (  # noqa: E402
+    AdaptiveRateController,
+    ListingFilterIndex,
+    ListingStore,
+    MarketStats,
+    NaverLandAPI,
+    ResponseArchive,
+    TokenBucketLimiter,
+    WatchList,
+    WatchRule,
+    build_cards_html,
+    calc_converted_series,
+    concat_listings,
+    dedupe_listings,
+    fetch_listings_concurrently,
+    format_listing_price_series,
+    format_price_series,
+    parse_article_batch,
+    replay_archive,
+)
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def timed_session(api: NaverLandAPI, latencies: List[float]):
+    """api.session.get 을 감싸 요청마다 소요 시간(ms)을 기록"""
+    original_get = api.session.get
+    lock = threading.Lock()
+
+    def get(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return original_get(*args, **kwargs)
+        finally:
+            with lock:
+                latencies.append((time.perf_counter() - started) * 1000)
+
+    api.session.get = get
+
+
+def bench_fetch(server: MockNaverServer, n_complexes: int, args, archive: ResponseArchive = None) -> Dict:
+    api = NaverLandAPI(
+        limiter=TokenBucketLimiter(rate=args.rate, burst=args.burst, max_per_host=args.workers),
+        base_url=server.base_url,
+        rate_control=AdaptiveRateController(initial_rate=args.rate / 4, max_rate=args.rate) if args.adaptive else None,
+        archive=archive,
+    )
+    latencies: List[float] = []
+    timed_session(api, latencies)
+    server.reset_stats()
+
+    complexes = [(f"단지{i}", str(100000 + i)) for i in range(n_complexes)]
+    frames = []
+    failures = 0
+    started = time.perf_counter()
+    for name, success, listings, error in fetch_listings_concurrently(api, complexes, max_workers=args.workers):
+        if success:
+            frames.append(listings)
+        else:
+            failures += 1
+    elapsed = time.perf_counter() - started
+    df = concat_listings(frames)
+
+    stats = dict(server.stats)
+    return {
+        "df": df,
+        "wall_s": elapsed,
+        "requests": stats["requests"],
+        "req_per_s": stats["requests"] / elapsed if elapsed else 0.0,
+        "listings_per_s": len(df) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+        "retries_429": stats["429"],
+        "failures": failures,
+        "bytes": stats["bytes"],
+    }
+
+
+def bench_parse(n_complexes: int, args) -> float:
+    """대역 서버와 같은 합성 페이지를 네트워크 없이 파싱하는 시간(ms), 모든 페이지를 모아 한 번에 파싱"""
+    articles, names = [], []
+    for i in range(n_complexes):
+        cid = str(100000 + i)
+        page = 1
+        while True:
+            data = synthetic_articles(cid, page, args.page_size, args.articles)
+            articles.extend(data["articleList"])
+            names.extend([f"단지{cid}"] * len(data["articleList"]))
+            if not data["isMoreData"]:
+                break
+            page += 1
+
+    started = time.perf_counter()
+    parse_article_batch(articles, names)
+    return (time.perf_counter() - started) * 1000
+
+
+def bench_replay(archive: ResponseArchive) -> float:
+    """보관된 원본 → 파싱 → 저장소 저장 시간(ms)"""
+    store = ListingStore(":memory:")
+    started = time.perf_counter()
+    for _ in replay_archive(archive, store):
+        pass
+    return (time.perf_counter() - started) * 1000
+
+
+def bench_dedupe(df) -> float:
+    """중복 매물 묶기 시간(ms)"""
+    started = time.perf_counter()
+    dedupe_listings(df)
+    return (time.perf_counter() - started) * 1000
+
+
+def bench_filter(df, rate: int = 40) -> Tuple[float, float]:
+    """화면과 같은 필터 색인 생성 + 필터 + 정렬 시간, 같은 조건 재실행 시간(ms)"""
+    started = time.perf_counter()
+    index = ListingFilterIndex(df)
+    areas = index.options("면적")
+    filters = {
+        "거래유형": index.options("거래유형"),
+        "단지명": index.options("단지명"),
+        "면적": areas[: max(1, len(areas) // 2)],
+    }
+    index.select(filters, "환산가", True, rate)
+    cold = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    index.select(filters, "환산가", True, rate)
+    return cold, (time.perf_counter() - started) * 1000
+
+
+def bench_market(df, rate: int = 40) -> Tuple[float, float]:
+    """시세 통계 전체 집계 시간, 첫 단지 가격만 바꾼 뒤 증분 갱신 시간(ms)"""
+    stats = MarketStats()
+    started = time.perf_counter()
+    stats.update(df, rate)
+    cold = (time.perf_counter() - started) * 1000
+
+    changed = df.copy()
+    first = changed["단지명"] == changed["단지명"].iloc[0]
+    changed.loc[first, "가격"] += 100
+    started = time.perf_counter()
+    stats.update(changed, rate)
+    return cold, (time.perf_counter() - started) * 1000
+
+
+def bench_alerts(df, n_rules: int = 300) -> Tuple[float, float]:
+    """관심 조건 n_rules 개 검사 시간, 같은 매물 재검사 시간(ms)"""
+    watchlist = WatchList(":memory:")
+    names = list(df["단지명"].cat.categories)
+    trades = ["매매", "전세", "월세"]
+    for i in range(n_rules):
+        watchlist.add_rule(WatchRule(
+            f"조건{i}", complex_name=names[i % len(names)] if i % 10 else None, trade=trades[i % 3],
+            area_min=59.0, area_max=115.0, price_max=50000 + (i % 30) * 10000,
+            keyword="역세권" if i % 7 == 0 else None, tag="급매" if i % 5 == 0 else None, price_cut=i % 2 == 0,
+        ))
+    started = time.perf_counter()
+    watchlist.check(df)
+    first = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    watchlist.check(df)
+    return first, (time.perf_counter() - started) * 1000
+
+
+def bench_render(df, rate: int = 40, per_page: int = 20) -> float:
+    """테이블 표시 컬럼 포맷팅 + 카드 1페이지 HTML 생성 시간(ms)"""
+    df = df.copy()
+    df["환산가"] = calc_converted_series(df["가격"], df["월세"], rate)
+    started = time.perf_counter()
+    format_listing_price_series(df["가격"], df["월세"])
+    format_price_series(df["환산가"])
+    build_cards_html(df.iloc[:per_page])
+    return (time.perf_counter() - started) * 1000
+
+
+def run(args) -> Dict[str, Dict]:
+    results = {}
+    with MockNaverServer(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        retry_after=args.retry_after, page_size=args.page_size, articles_per_complex=args.articles,
+    ) as server:
+        for n in args.sizes:
+            archive_dir = tempfile.mkdtemp(prefix="bench_archive_")
+            archive = ResponseArchive(archive_dir)
+            try:
+                fetch = bench_fetch(server, n, args, archive)
+                fetch["replay_ms"] = bench_replay(archive)
+            finally:
+                shutil.rmtree(archive_dir, ignore_errors=True)
+            df = fetch.pop("df")
+            fetch["listings"] = len(df)
+            fetch["parse_ms"] = bench_parse(n, args)
+            fetch["dedupe_ms"] = statistics.median(bench_dedupe(df) for _ in range(args.repeat))
+            filter_runs = [bench_filter(df) for _ in range(args.repeat)]
+            fetch["filter_ms"] = statistics.median(cold for cold, _ in filter_runs)
+            fetch["filter_repeat_ms"] = statistics.median(repeat for _, repeat in filter_runs)
+            market_runs = [bench_market(df) for _ in range(args.repeat)]
+            fetch["market_ms"] = statistics.median(cold for cold, _ in market_runs)
+            fetch["market_incr_ms"] = statistics.median(incr for _, incr in market_runs)
+            alert_runs = [bench_alerts(df) for _ in range(args.repeat)]
+            fetch["alerts_ms"] = statistics.median(first for first, _ in alert_runs)
+            fetch["alerts_repeat_ms"] = statistics.median(repeat for _, repeat in alert_runs)
+            fetch["render_ms"] = statistics.median(bench_render(df) for _ in range(args.repeat))
+            results[str(n)] = fetch
+    return results
+
+
+COLUMNS = [
+    ("wall_s", "소요(s)", "{:.2f}"),
+    ("req_per_s", "요청/s", "{:.1f}"),
+    ("listings_per_s", "매물/s", "{:.0f}"),
+    ("p50_ms", "p50(ms)", "{:.1f}"),
+    ("p99_ms", "p99(ms)", "{:.1f}"),
+    ("retries_429", "429", "{:d}"),
+    ("failures", "실패", "{:d}"),
+    ("parse_ms", "파싱(ms)", "{:.1f}"),
+    ("replay_ms", "재구성(ms)", "{:.1f}"),
+    ("dedupe_ms", "중복(ms)", "{:.1f}"),
+    ("filter_ms", "필터(ms)", "{:.1f}"),
+    ("filter_repeat_ms", "재필터(ms)", "{:.2f}"),
+    ("market_ms", "시세(ms)", "{:.1f}"),
+    ("market_incr_ms", "시세증분(ms)", "{:.1f}"),
+    ("alerts_ms", "알림(ms)", "{:.1f}"),
+    ("alerts_repeat_ms", "재알림(ms)", "{:.1f}"),
+    ("render_ms", "렌더(ms)", "{:.1f}"),
+]
+
+
+def print_table(results: Dict[str, Dict], baseline: Dict[str, Dict] = None):
+    header = ["단지"] + [label for _, label, _ in COLUMNS]
+    print(" | ".join(f"{h:>10}" for h in header))
+    for size, row in results.items():
+        cells = [f"{size:>10}"]
+        for key, _, fmt in COLUMNS:
+            cell = fmt.format(row[key])
+            base = (baseline or {}).get(size, {}).get(key)
+            if base:
+                cell += f" ({(row[key] - base) / base * 100:+.0f}%)"
+            cells.append(f"{cell:>10}")
+        print(" | ".join(cells))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="오프라인 벤치마크 (로컬 대역 서버)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 20, 200], help="조회할 단지 수")
+    parser.add_argument("--latency-ms", type=float, default=30)
+    parser.add_argument("--jitter-ms", type=float, default=10)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="429 응답 비율 (0~1)")
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--articles", type=int, default=60, help="단지당 매물 수")
+    parser.add_argument("--rate", type=float, default=200.0, help="클라이언트 초당 요청 수")
+    parser.add_argument("--burst", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--adaptive", action="store_true", help="AIMD 적응형 속도 조절 사용 (초기 속도 rate/4)")
+    parser.add_argument("--repeat", type=int, default=5, help="필터/렌더 반복 측정 횟수")
+    parser.add_argument("--json", default=None, help="결과를 저장할 JSON 경로")
+    parser.add_argument("--baseline", default=None, help="비교할 이전 결과 JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args)
+
+    baseline = None
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_table(results, baseline)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
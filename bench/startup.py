@@ -0,0 +1,108 @@
+"""
+시작 시간 회귀 검사
+
+- naver_land import 가 streamlit/pandas/numpy/requests 를 끌어오지 않는지
+- naver_land import 시간 (새 프로세스, 중앙값)
+- app.py 리런 1회 시간 (데모 모드, streamlit.testing 사용 가능할 때)
+
+기준을 넘으면 종료 코드 1 을 반환한다.
+
+    python bench/startup.py
+    python bench/startup.py --max-import-ms 150 --max-rerun-ms 500
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# naver_land import 시 로드되면 안 되는 모듈
+HEAVY_MODULES = ("streamlit", "pandas", "numpy", "requests")
+
+_IMPORT_PROBE = f"""
+import sys, time
+sys.path.insert(0, {ROOT!r})
+t = time.perf_counter()
+import naver_land
+elapsed = (time.perf_counter() - t) * 1000
+heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]
+print(f"{{elapsed:.3f}}|{{','.join(heavy)}}")
+"""
+
+
+def measure_import(runs: int):
+    """새 프로세스에서 naver_land import 시간(ms) 중앙값과 로드된 무거운 모듈 목록"""
+    times = []
+    heavy = set()
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _IMPORT_PROBE], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        elapsed, loaded = out.split("|")
+        times.append(float(elapsed))
+        heavy.update(m for m in loaded.split(",") if m)
+    return statistics.median(times), sorted(heavy)
+
+
+def measure_rerun(runs: int):
+    """데모 모드 app.py 리런 시간(ms) 중앙값, streamlit 이 없으면 None"""
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        return None
+
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60)
+    at.run()
+    at.session_state.selected_complexes = {"잠실엘스": "19772", "헬리오시티": "114743"}
+    at.session_state.demo_mode = True
+    at.run()  # 첫 실행은 cache_resource 초기화 포함이므로 제외
+
+    times = []
+    for _ in range(runs):
+        t = time.perf_counter()
+        at.run()
+        times.append((time.perf_counter() - t) * 1000)
+    if at.exception:
+        raise RuntimeError(f"app.py 실행 오류: {at.exception[0].value}")
+    return statistics.median(times)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="시작 시간 회귀 검사")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float, default=100.0)
+    parser.add_argument("--max-rerun-ms", type=float, default=300.0)
+    parser.add_argument("--skip-rerun", action="store_true", help="app.py 리런 측정 생략")
+    args = parser.parse_args(argv)
+
+    failed = False
+
+    import_ms, heavy = measure_import(args.runs)
+    print(f"naver_land import: {import_ms:.1f}ms (기준 {args.max_import_ms:.0f}ms)")
+    if heavy:
+        print(f"  ✗ import 시 로드된 무거운 모듈: {', '.join(heavy)}")
+        failed = True
+    if import_ms > args.max_import_ms:
+        print("  ✗ import 시간 기준 초과")
+        failed = True
+
+    if not args.skip_rerun:
+        rerun_ms = measure_rerun(args.runs)
+        if rerun_ms is None:
+            print("app.py 리런: streamlit 미설치로 생략")
+        else:
+            print(f"app.py 리런: {rerun_ms:.1f}ms (기준 {args.max_rerun_ms:.0f}ms)")
+            if rerun_ms > args.max_rerun_ms:
+                print("  ✗ 리런 시간 기준 초과")
+                failed = True
+
+    print("실패" if failed else "통과")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+HTTP 전송 방식 비교 (스레드 + requests vs asyncio keep-alive 연결 풀)
+
+대역 서버를 별도 프로세스로 띄우고 같은 동시성으로 매물 페이지를 요청해
+초당 요청 수와 클라이언트 CPU 1초당 요청 수(process_time 기준, 서버 CPU 제외)를 비교한다.
+파싱 비용을 빼기 위해 원본 JSON 까지만 받는다.
+
+    python bench/transport.py
+    python bench/transport.py --requests 5000 --concurrency 8 32 64 --latency-ms 50
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from naver_land import AsyncHTTPTransport, NaverLandAPI, TokenBucketLimiter  # noqa: E402
+
+
+def start_server(latency_ms: float) -> Tuple[subprocess.Popen, str]:
+    """빈 포트에 대역 서버 프로세스를 띄우고 응답할 때까지 대기"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "bench", "mock_server.py"), "--port", str(port),
+         "--latency-ms", str(latency_ms), "--jitter-ms", "0"],
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return proc, f"http://127.0.0.1:{port}/api"
+        except OSError:
+            time.sleep(0.05)
+    proc.terminate()
+    raise RuntimeError("대역 서버가 시작되지 않음")
+
+
+def make_api(base_url: str, concurrency: int) -> NaverLandAPI:
+    # 속도 제한은 사실상 끄고 전송 자체만 측정
+    return NaverLandAPI(limiter=TokenBucketLimiter(rate=1e6, burst=100_000, max_per_host=concurrency),
+                        base_url=base_url)
+
+
+def run_threads(base_url: str, endpoints, concurrency: int) -> int:
+    api = make_api(base_url, concurrency)
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(lambda endpoint: api._get_json(endpoint, {"page": "1"}), endpoints))
+    return sum(data is not None for data in results)
+
+
+def run_async(base_url: str, endpoints, concurrency: int) -> int:
+    api = make_api(base_url, concurrency)
+
+    async def main():
+        slots = asyncio.Semaphore(concurrency)
+        async with AsyncHTTPTransport(concurrency, headers=dict(api.session.headers)) as transport:
+            async def one(endpoint):
+                async with slots:
+                    return await api._aget_json(transport, endpoint, {"page": "1"})
+            return await asyncio.gather(*[one(endpoint) for endpoint in endpoints])
+
+    return sum(data is not None for data in asyncio.run(main()))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="HTTP 전송 방식 비교")
+    parser.add_argument("--requests", type=int, default=3000, help="방식별 요청 수")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[8, 32], help="동시 요청(연결) 수")
+    parser.add_argument("--latency-ms", type=float, default=20)
+    args = parser.parse_args(argv)
+
+    proc, base_url = start_server(args.latency_ms)
+    try:
+        endpoints = [f"articles/complex/{100000 + i}" for i in range(args.requests)]
+        print(f"{'방식':<8}{'동시성':>6}{'성공':>8}{'소요(s)':>9}{'요청/s':>9}{'CPU(s)':>8}{'요청/CPU s':>11}")
+        for concurrency in args.concurrency:
+            for name, runner in [("thread", run_threads), ("async", run_async)]:
+                started, cpu_started = time.perf_counter(), time.process_time()
+                ok = runner(base_url, endpoints, concurrency)
+                elapsed, cpu = time.perf_counter() - started, time.process_time() - cpu_started
+                print(f"{name:<8}{concurrency:>6}{ok:>8}{elapsed:>9.2f}{ok / elapsed:>9.0f}"
+                      f"{cpu:>8.2f}{ok / max(cpu, 1e-9):>11.0f}")
+    finally:
+        proc.terminate()
+        proc.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,250 @@
+"""
+네이버 부동산 매물 수집기 (Streamlit 없이 실행)
+
+지정한 단지(기본: PRESET_COMPLEXES 전체)의 매물을 주기적으로 받아
+ListingStore에 저장한다. 화면(app.py)은 저장된 스냅샷을 바로 읽어 표시한다.
+--region 을 지정하면 구/동 안의 모든 단지를 수집하며, 중단되면 다음 실행에서 이어서 수집한다.
+받은 응답 원본은 .cache/archive 에 압축 보관되며, --replay 로 요청 없이 저장소를 다시 만들 수 있다.
+화면에서 등록한 관심 조건(.cache/watch.sqlite3)은 수집마다 검사해 새 알림을 알림함과 지정한 곳으로 보낸다.
+--async 를 지정하면 스레드 대신 asyncio 전송(keep-alive 연결 풀)으로 단지를 수집한다.
+
+사용 예:
+    python collector.py                      # 프리셋 단지 1회 수집
+    python collector.py --interval 600       # 10분마다 반복 수집
+    python collector.py --async --workers 16 --rate 5
+    python collector.py --complex 19772 --complex 114743
+    python collector.py --region 송파구           # 송파구 전체 단지 (이어서 수집)
+    python collector.py --region 1171000000 --restart
+    python collector.py --interval 600 --metrics-file metrics.prom   # node_exporter textfile 수집용
+    python collector.py --replay --since 20260901     # 보관된 원본을 다시 파싱해 저장소 재구성
+    python collector.py --interval 600 --alerts-file alerts.jsonl --webhook http://127.0.0.1:9000/alerts
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from typing import List, Tuple
+
+from naver_land import (
+    PRESET_COMPLEXES,
+    REGION_CODES,
+    AdaptiveRateController,
+    CircuitBreaker,
+    ListingStore,
+    ListingTracker,
+    NaverLandAPI,
+    RegionCrawler,
+    ResponseArchive,
+    ResponseCache,
+    TokenBucketLimiter,
+    JsonlAlertSink,
+    WatchList,
+    WebhookAlertSink,
+    fetch_listings_async,
+    fetch_listings_concurrently,
+    replay_archive,
+)
+
+log = logging.getLogger("collector")
+
+
+def preset_targets() -> List[Tuple[str, str]]:
+    """프리셋 단지 목록 (같은 단지ID는 한 번만)"""
+    targets = {}
+    for name, complex_id in PRESET_COMPLEXES.items():
+        targets.setdefault(complex_id, name)
+    return [(name, complex_id) for complex_id, name in targets.items()]
+
+
+def collect_once(api: NaverLandAPI, store: ListingStore, tracker: ListingTracker,
+                 targets: List[Tuple[str, str]], max_workers: int, use_async: bool = False) -> int:
+    """모든 대상 단지를 1회 수집, 실패한 단지 수 반환"""
+    ids = dict(targets)
+    failures = 0
+    started = time.time()
+
+    # 수집기는 항상 최신 데이터를 받는다 (응답 캐시는 갱신만 함)
+    if use_async:
+        results = fetch_listings_async(
+            api, targets, max_concurrency=max_workers, bypass_cache=True,
+            fetch=lambda transport, cid, name, bypass_cache: tracker.arefresh(api, transport, cid, name, bypass_cache)
+        )
+    else:
+        results = fetch_listings_concurrently(
+            api, targets, max_workers=max_workers, bypass_cache=True,
+            fetch=lambda cid, name, bypass_cache: tracker.refresh(api, cid, name, bypass_cache)
+        )
+    for name, success, listings, error in results:
+        complex_id = ids[name]
+        if success:
+            store.save(complex_id, name, listings)
+            delta = tracker.deltas.get(complex_id)
+            log.info("%s(%s): %d건%s", name, complex_id, len(listings),
+                     f" · {delta.summary}" if delta else "")
+        else:
+            failures += 1
+        if error:
+            log.warning("%s(%s): %s", name, complex_id, error)
+
+    log.info("수집 완료: %d개 단지, 실패 %d, %.1f초", len(targets), failures, time.time() - started)
+    return failures
+
+
+def crawl_regions(crawler: RegionCrawler, regions: List[str], max_workers: int) -> int:
+    """지역별 남은 단지를 수집, 완료하지 못한 단지 수 반환"""
+    remaining = 0
+    for region in regions:
+        started = time.time()
+        success, error = crawler.enumerate(region)
+        if not success:
+            log.warning("%s: 단지 목록 수집 중단 (%s), 받은 목록까지만 수집", region, error)
+        for result in crawler.run(region, max_workers=max_workers):
+            if result.success:
+                log.info("%s(%s): %d건", result.name, result.complex_id, result.count)
+            else:
+                log.warning("%s(%s): %s", result.name, result.complex_id, result.error)
+
+        progress = crawler.progress(region)
+        left = progress.get("pending", 0) + progress.get("failed", 0)
+        remaining += left
+        log.info("%s 수집: 완료 %d, 남음 %d, %.1f초", region, progress.get("done", 0), left, time.time() - started)
+        if crawler.api.is_blocked:
+            log.warning("차단 감지 - 남은 단지는 다음 실행에서 이어서 수집")
+            break
+    return remaining
+
+
+def rollover_regions(crawler: RegionCrawler, regions: List[str]) -> List[str]:
+    """끝까지 수집한 지역만 다음 주기에 처음부터 다시 수집하도록 초기화, 초기화한 지역 반환
+
+    차단 등으로 남은 단지가 있는 지역은 체크포인트를 유지해 다음 주기에 이어서 수집한다.
+    """
+    restarted = []
+    for region in regions:
+        if not crawler.remaining(region):
+            crawler.restart(region)
+            restarted.append(region)
+    return restarted
+
+
+def replay(archive: ResponseArchive, store: ListingStore, complex_ids: List[str], since: str) -> int:
+    """보관된 원본으로 저장소 재구성, 재구성한 단지 수 반환"""
+    started = time.time()
+    rebuilt = 0
+    for result in replay_archive(archive, store, since=since, complex_ids=complex_ids or None):
+        if result.success:
+            rebuilt += 1
+            log.info("%s(%s): %d건%s", result.name, result.complex_id, result.count,
+                     f" · {result.error}" if result.error else "")
+        else:
+            log.info("%s(%s): 건너뜀 (%s)", result.name, result.complex_id, result.error)
+    log.info("재구성 완료: %d개 단지, %.1f초", rebuilt, time.time() - started)
+    return rebuilt
+
+
+def check_alerts(watchlist: WatchList, store: ListingStore, complex_ids: List[str], sinks: tuple) -> int:
+    """저장된 매물을 관심 조건과 대조, 새 알림 수 반환"""
+    if not watchlist.rules():
+        return 0
+    df, _ = store.load(complex_ids, with_descriptions=True)
+    alerts = watchlist.check(df, sinks)
+    for alert in alerts.itertuples(index=False):
+        log.info("알림 [%s] %s %s %s %s (%s)", alert.rule_name, alert.complex_name, alert.trade,
+                 alert.area, alert.article_no, alert.reason)
+    return len(alerts)
+
+
+def dump_metrics(api: NaverLandAPI, path: str):
+    """Prometheus 텍스트 형식 지표를 파일로 저장 (임시 파일 교체로 부분 읽기 방지)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(api.metrics_text())
+    os.replace(tmp_path, path)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="네이버 부동산 매물 수집기")
+    parser.add_argument("--complex", action="append", default=[], metavar="ID",
+                        help="수집할 단지ID (여러 번 지정 가능, 미지정 시 프리셋 전체)")
+    parser.add_argument("--interval", type=float, default=0,
+                        help="반복 수집 간격 (초, 0이면 1회만 수집)")
+    parser.add_argument("--rate", type=float, default=0.5, help="최대 초당 요청 수 (실제 속도는 429 응답에 따라 자동 조절)")
+    parser.add_argument("--burst", type=int, default=3, help="순간 최대 요청 수")
+    parser.add_argument("--workers", type=int, default=3, help="동시 요청 수")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="단지 수집에 스레드 대신 asyncio 전송 사용 (--region 제외, 연결 --workers 개를 keep-alive 로 재사용)")
+    parser.add_argument("--store", default=None, help="매물 저장소 경로 (기본: .cache/listings.sqlite3)")
+    parser.add_argument("--region", action="append", default=[], metavar="CORTARNO",
+                        help=f"구/동 전체 단지 수집 (지역 코드 또는 {', '.join(REGION_CODES)})")
+    parser.add_argument("--restart", action="store_true",
+                        help="--region 수집을 이어서 하지 않고 처음부터 다시 수집")
+    parser.add_argument("--alerts-file", default=None, help="새 알림을 JSON lines 로 추가할 파일")
+    parser.add_argument("--webhook", default=None, metavar="URL", help="새 알림을 JSON 으로 POST 할 주소")
+    parser.add_argument("--no-archive", action="store_true", help="응답 원본을 보관하지 않음")
+    parser.add_argument("--replay", action="store_true",
+                        help="요청 없이 보관된 원본을 다시 파싱해 저장소를 재구성 (--complex 로 단지 제한)")
+    parser.add_argument("--since", default=None, metavar="YYYYMMDD", help="--replay 에 사용할 보관 시작일")
+    parser.add_argument("--metrics-file", default=None,
+                        help="수집마다 네트워크 지표를 Prometheus 텍스트 형식으로 저장할 경로")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    store = ListingStore(args.store) if args.store else ListingStore()
+    archive = None if args.no_archive else ResponseArchive()
+    if args.replay:
+        return 0 if replay(archive or ResponseArchive(), store, args.complex, args.since) else 1
+
+    if args.complex:
+        names = {complex_id: name for name, complex_id in PRESET_COMPLEXES.items()}
+        targets = [(names.get(cid, cid), cid) for cid in dict.fromkeys(args.complex)]
+    else:
+        targets = preset_targets()
+
+    api = NaverLandAPI(
+        limiter=TokenBucketLimiter(rate=args.rate, burst=args.burst, max_per_host=args.workers),
+        cache=ResponseCache(),
+        rate_control=AdaptiveRateController(initial_rate=args.rate),
+        breaker=CircuitBreaker(),
+        archive=archive,
+    )
+    tracker = ListingTracker()
+    watchlist = WatchList()
+    sinks = []
+    if args.alerts_file:
+        sinks.append(JsonlAlertSink(args.alerts_file))
+    if args.webhook:
+        sinks.append(WebhookAlertSink(args.webhook))
+
+    if args.region:
+        regions = [REGION_CODES.get(region, region) for region in dict.fromkeys(args.region)]
+        crawler = RegionCrawler(api, store)
+        if args.restart:
+            for region in regions:
+                crawler.restart(region)
+
+    while True:
+        if args.region:
+            remaining = crawl_regions(crawler, regions, args.workers)
+        else:
+            failures = collect_once(api, store, tracker, targets, args.workers, args.use_async)
+        watched = list(store.snapshots()) if args.region else [cid for _, cid in targets]
+        check_alerts(watchlist, store, watched, tuple(sinks))
+        if args.metrics_file:
+            dump_metrics(api, args.metrics_file)
+        if args.interval <= 0:
+            if args.region:
+                return 1 if remaining else 0
+            return 1 if failures == len(targets) else 0
+        if args.region:
+            rollover_regions(crawler, regions)
+        try:
+            time.sleep(args.interval)
+        except KeyboardInterrupt:
+            return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
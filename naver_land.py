@@ -0,0 +1,3387 @@
+"""
+네이버 부동산 API 클라이언트 · 매물 파싱 · 유틸리티
+
+Streamlit 없이 import 할 수 있는 모듈로, 화면(app.py)과 수집기(collector.py)가 함께 사용한다.
+"""
+
+from __future__ import annotations
+
+import os
+import html
+import json
+import heapq
+import time
+import random
+import sqlite3
+import threading
+import zlib
+from collections import Counter, OrderedDict, defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple, Optional, Dict, List, Tuple, Iterator, AsyncIterator, Union
+from urllib.parse import urlencode, urlparse, urlsplit
+
+# requests/pandas/numpy 는 실제로 쓰는 함수 안에서 import (import 시간 절약)
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+    
+    import numpy as np
+    import pandas as pd
+
+# ============================================================
+# 프리셋 단지 데이터 (확장)
+# ============================================================
+PRESET_COMPLEXES = {
+    # 송파구
+    "잠실엘스": "19772",
+    "헬리오시티": "114743",
+    "트리지움": "19764",
+    "리센츠": "19765",
+    "파크리오": "19763",
+    "잠실래미안아이파크": "137980",
+    "잠실주공5단지": "8540",
+    "올림픽선수촌": "8628",
+    # 강남구
+    "은마아파트": "8928",
+    "대치래미안": "8918",
+    "도곡렉슬": "8977",
+    "타워팰리스": "8981",
+    "개포주공1단지": "8867",
+    "래미안대치팰리스": "8918",
+    # 서초구
+    "래미안퍼스티지": "8894",
+    "반포자이": "100078",
+    "아크로리버파크": "100096",
+    "래미안원베일리": "136068",
+    "반포래미안아이파크": "137979",
+    "서초그랑자이": "124797",
+    # 용산구
+    "래미안용산더센트럴": "140927",
+    "이촌동LG한강자이": "7853",
+    # 마포/영등포
+    "마포래미안푸르지오": "102378",
+    "여의도자이": "18584",
+    # 성동구
+    "트리마제": "106811",
+    "서울숲리버뷰자이": "114591",
+    # 광진구
+    "현대프라임": "8684",
+    "자양래미안": "8688",
+}
+
+# 지역 코드 (cortarNo, 지역 전체 수집용)
+REGION_CODES = {
+    "강남구": "1168000000",
+    "서초구": "1165000000",
+    "송파구": "1171000000",
+    "용산구": "1117000000",
+    "마포구": "1144000000",
+    "영등포구": "1156000000",
+    "성동구": "1120000000",
+    "광진구": "1121500000",
+}
+
+# 화면의 지역별 탭에 표시할 프리셋
+PRESET_REGIONS = {
+    "송파구": ["잠실엘스", "헬리오시티", "트리지움", "리센츠", "파크리오", "올림픽선수촌"],
+    "강남구": ["은마아파트", "대치래미안", "도곡렉슬", "타워팰리스", "개포주공1단지"],
+    "서초구": ["래미안퍼스티지", "반포자이", "아크로리버파크", "래미안원베일리", "서초그랑자이"],
+    "기타": ["마포래미안푸르지오", "여의도자이", "트리마제", "현대프라임"]
+}
+
+# ============================================================
+# 요청 속도 제한 (토큰 버킷)
+# ============================================================
+class TokenBucketLimiter:
+    """전역 토큰 버킷 + 호스트별 동시 요청 수 제한
+
+    rate 개/초로 토큰이 채워지고 최대 burst 개까지 모인다.
+    여러 스레드가 같은 인스턴스를 공유하며, 토큰이 모자라면 순서대로 대기한다.
+    """
+    
+    def __init__(self, rate: float = 0.5, burst: int = 3, max_per_host: int = 3):
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self.rate = rate
+        self.burst = burst
+        self.max_per_host = max_per_host
+    
+    def configure(self, rate: Optional[float] = None, burst: Optional[int] = None,
+                  max_per_host: Optional[int] = None):
+        """설정 변경 (이미 대기 중인 요청에는 적용되지 않음)"""
+        with self._lock:
+            self._refill()
+            if rate is not None:
+                self.rate = rate
+            if burst is not None:
+                self.burst = burst
+                self._tokens = min(self._tokens, float(burst))
+            if max_per_host is not None and max_per_host != self.max_per_host:
+                self.max_per_host = max_per_host
+                self._host_slots = {}
+    
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def reserve(self) -> float:
+        """토큰 1개를 예약하고 기다려야 할 시간(초)을 반환 (직접 대기하지 않음, 비동기 호출용)"""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+    
+    def acquire(self) -> float:
+        """토큰 1개 획득 (필요하면 대기), 대기한 시간(초) 반환"""
+        # 토큰을 먼저 예약하고, 부족분이 채워질 때까지 락 밖에서 대기
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+    
+    @contextmanager
+    def host_slot(self, host: str):
+        """호스트별 동시 요청 수 제한"""
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.max_per_host)
+                self._host_slots[host] = slot
+        with slot:
+            yield
+
+
+# ============================================================
+# 적응형 요청 속도 조절 (AIMD)
+# ============================================================
+def endpoint_family(endpoint: str) -> str:
+    """엔드포인트 경로에서 단지ID 같은 숫자 구간을 뺀 묶음 이름 (예: articles/complex/19772 → articles/complex)"""
+    parts = [part for part in endpoint.strip("/").split("/") if part and not part.isdigit()]
+    return "/".join(parts)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 대기 시간(초)으로 변환"""
+    from email.utils import parsedate_to_datetime
+    
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class AdaptiveRateController:
+    """엔드포인트별 AIMD 요청 속도 조절
+
+    200 응답마다 속도를 increase 만큼 올리고(가산 증가), 429 를 받으면 decrease 배로 줄인다(승산 감소).
+    Retry-After 가 있으면 그 시각까지 해당 엔드포인트 요청을 멈춘다.
+    상태는 엔드포인트 묶음(endpoint_family)별로 호출 사이에 유지된다.
+    """
+    
+    def __init__(self, initial_rate: float = 0.5, min_rate: float = 0.05, max_rate: float = 5.0,
+                 increase: float = 0.02, decrease: float = 0.5):
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, TokenBucketLimiter] = {}
+        self._blocked_until: Dict[str, float] = {}
+        self._last_decrease: Dict[str, float] = {}
+    
+    def _bucket(self, family: str) -> TokenBucketLimiter:
+        with self._lock:
+            bucket = self._buckets.get(family)
+            if bucket is None:
+                bucket = TokenBucketLimiter(rate=self.initial_rate, burst=1)
+                self._buckets[family] = bucket
+            return bucket
+    
+    def rates(self) -> Dict[str, float]:
+        """{엔드포인트 묶음: 현재 초당 요청 수}"""
+        with self._lock:
+            return {family: bucket.rate for family, bucket in self._buckets.items()}
+    
+    def reserve(self, family: str) -> float:
+        """엔드포인트 묶음의 차례를 예약하고 기다려야 할 시간(초)을 반환 (Retry-After 정지 포함)"""
+        with self._lock:
+            blocked = self._blocked_until.get(family, 0.0) - time.monotonic()
+        return max(blocked, self._bucket(family).reserve())
+    
+    def acquire(self, family: str) -> float:
+        """엔드포인트 묶음의 차례가 될 때까지 대기, 대기한 시간(초) 반환"""
+        wait = self.reserve(family)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+    
+    def on_success(self, family: str):
+        bucket = self._bucket(family)
+        bucket.configure(rate=min(self.max_rate, bucket.rate + self.increase))
+    
+    def on_throttle(self, family: str, retry_after: Optional[float] = None):
+        bucket = self._bucket(family)
+        now = time.monotonic()
+        with self._lock:
+            if retry_after is not None:
+                self._blocked_until[family] = max(self._blocked_until.get(family, 0.0), now + retry_after)
+            # 이미 보낸 요청들이 연달아 429 를 받아도 한 번만 줄이도록 최소 간격 유지
+            if now - self._last_decrease.get(family, 0.0) < max(1.0, 1.0 / bucket.rate):
+                return
+            self._last_decrease[family] = now
+        bucket.configure(rate=max(self.min_rate, bucket.rate * self.decrease))
+
+
+# ============================================================
+# 차단 감지 (서킷 브레이커)
+# ============================================================
+class CircuitBreaker:
+    """연속 실패(429·403·5xx·네트워크 오류) 시 요청을 즉시 실패시키는 서킷 브레이커
+
+    failure_threshold 번 연속 실패하면 열리고(open), 열려 있는 동안 allow() 는 False 를 반환한다.
+    복구 확인(probe)은 NaverLandAPI 가 백그라운드에서 수행하며,
+    확인에 실패할 때마다 다음 확인까지의 간격을 max_timeout 까지 두 배로 늘린다.
+    429·네트워크 오류는 요청 하나가 재시도를 다 쓴 경우에만 한 번 실패로 센다
+    (적응형 속도 조절이 속도를 찾는 동안의 429 로는 열리지 않음).
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0, max_timeout: float = 300.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_timeout = max_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._state = self.CLOSED
+        self._timeout = reset_timeout
+        self._opened_at = 0.0
+    
+    @property
+    def state(self) -> str:
+        return self._state
+    
+    @property
+    def is_open(self) -> bool:
+        return self._state == self.OPEN
+    
+    def allow(self) -> bool:
+        return self._state == self.CLOSED
+    
+    def retry_in(self) -> float:
+        """다음 복구 확인까지 남은 시간(초), 닫혀 있으면 0"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return 0.0
+            return max(0.0, self._opened_at + self._timeout - time.monotonic())
+    
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._state = self.CLOSED
+            self._timeout = self.reset_timeout
+    
+    def record_failure(self, probe: bool = False) -> bool:
+        """실패 기록, 이번 실패로 새로 열렸으면 True
+
+        열려 있는 동안에는 복구 확인(probe=True) 실패만 다음 확인까지의 간격을 늘리고,
+        열리기 전에 보내 둔 요청의 실패는 무시한다.
+        """
+        with self._lock:
+            if self._state == self.OPEN:
+                if probe:
+                    # 복구 확인 실패 → 간격을 늘려 다시 대기
+                    self._timeout = min(self.max_timeout, self._timeout * 2)
+                    self._opened_at = time.monotonic()
+                return False
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+
+# ============================================================
+# 네트워크 지표
+# ============================================================
+class ClientMetrics:
+    """엔드포인트 묶음별 요청 지표
+
+    요청 지연 히스토그램, 속도 제한 대기·백오프 시간, 재시도/429/오류 수,
+    응답 크기, 캐시 적중 수를 모으고 Prometheus 텍스트 형식으로 내보낸다.
+    """
+    
+    LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0)
+    COUNTERS = ("requests", "ok", "throttled", "errors", "retries", "bytes",
+                "wait_seconds", "backoff_seconds", "cache_hits", "cache_misses")
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._families: Dict[str, Dict[str, Any]] = {}
+    
+    def _family(self, family: str) -> Dict[str, Any]:
+        data = self._families.get(family)
+        if data is None:
+            data = {name: 0 for name in self.COUNTERS}
+            data["latency_buckets"] = [0] * (len(self.LATENCY_BUCKETS) + 1)  # 마지막은 +Inf
+            data["latency_sum"] = 0.0
+            self._families[family] = data
+        return data
+    
+    def inc(self, family: str, name: str, value: float = 1):
+        with self._lock:
+            self._family(family)[name] += value
+    
+    def observe_request(self, family: str, seconds: float, status: Optional[int], size: int = 0):
+        """요청 1회 기록 (status None 은 네트워크 오류)"""
+        with self._lock:
+            data = self._family(family)
+            data["requests"] += 1
+            data["bytes"] += size
+            if status == 200:
+                data["ok"] += 1
+            elif status == 429:
+                data["throttled"] += 1
+            else:
+                data["errors"] += 1
+            index = next((i for i, bound in enumerate(self.LATENCY_BUCKETS) if seconds <= bound),
+                         len(self.LATENCY_BUCKETS))
+            data["latency_buckets"][index] += 1
+            data["latency_sum"] += seconds
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {family: {**data, "latency_buckets": list(data["latency_buckets"])}
+                    for family, data in self._families.items()}
+    
+    def quantile(self, family: str, q: float) -> Optional[float]:
+        """히스토그램 구간 상한으로 근사한 지연 분위수(초)"""
+        data = self.snapshot().get(family)
+        if not data or not data["requests"]:
+            return None
+        target = q * data["requests"]
+        seen = 0
+        for bound, count in zip(self.LATENCY_BUCKETS + (float("inf"),), data["latency_buckets"]):
+            seen += count
+            if seen >= target:
+                return bound
+        return float("inf")
+    
+    def summary_rows(self) -> List[dict]:
+        """화면 표시용 엔드포인트별 요약"""
+        rows = []
+        for family, data in sorted(self.snapshot().items()):
+            lookups = data["cache_hits"] + data["cache_misses"]
+            rows.append({
+                "엔드포인트": family,
+                "요청": data["requests"],
+                "성공": data["ok"],
+                "429": data["throttled"],
+                "오류": data["errors"],
+                "재시도": data["retries"],
+                "평균 지연(초)": round(data["latency_sum"] / data["requests"], 3) if data["requests"] else None,
+                "p50(초)": self.quantile(family, 0.5),
+                "p95(초)": self.quantile(family, 0.95),
+                "제한 대기(초)": round(data["wait_seconds"], 1),
+                "백오프(초)": round(data["backoff_seconds"], 1),
+                "응답 크기(KB)": round(data["bytes"] / 1024, 1),
+                "캐시 적중률": f"{data['cache_hits'] / lookups:.0%}" if lookups else "-",
+            })
+        return rows
+    
+    def to_prometheus(self, extra_gauges: Optional[Dict[str, Dict[str, float]]] = None) -> str:
+        """Prometheus 텍스트 형식 (extra_gauges: {지표명: {엔드포인트: 값}})"""
+        snapshot = self.snapshot()
+        lines = []
+        
+        def counter(name: str, key: str, help_text: str):
+            lines.append(f"# HELP naver_land_{name} {help_text}")
+            lines.append(f"# TYPE naver_land_{name} counter")
+            for family, data in sorted(snapshot.items()):
+                lines.append(f'naver_land_{name}{{endpoint="{family}"}} {data[key]:g}')
+        
+        counter("requests_total", "requests", "HTTP requests sent")
+        counter("throttled_total", "throttled", "HTTP 429 responses")
+        counter("errors_total", "errors", "Network errors and non-200/429 responses")
+        counter("retries_total", "retries", "Retried requests")
+        counter("response_bytes_total", "bytes", "Response body bytes received")
+        counter("limiter_wait_seconds_total", "wait_seconds", "Time spent waiting in rate limiters")
+        counter("backoff_seconds_total", "backoff_seconds", "Time spent sleeping in retry backoff")
+        counter("cache_hits_total", "cache_hits", "Response cache hits")
+        counter("cache_misses_total", "cache_misses", "Response cache misses")
+        
+        lines.append("# HELP naver_land_request_duration_seconds HTTP request latency")
+        lines.append("# TYPE naver_land_request_duration_seconds histogram")
+        for family, data in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, count in zip(self.LATENCY_BUCKETS + (float("inf"),), data["latency_buckets"]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f'naver_land_request_duration_seconds_bucket{{endpoint="{family}",le="{le}"}} {cumulative}')
+            lines.append(f'naver_land_request_duration_seconds_sum{{endpoint="{family}"}} {data["latency_sum"]:.6f}')
+            lines.append(f'naver_land_request_duration_seconds_count{{endpoint="{family}"}} {data["requests"]}')
+        
+        for name, values in (extra_gauges or {}).items():
+            lines.append(f"# TYPE naver_land_{name} gauge")
+            for family, value in sorted(values.items()):
+                lines.append(f'naver_land_{name}{{endpoint="{family}"}} {value:g}')
+        return "\n".join(lines) + "\n"
+
+
+# ============================================================
+# 응답 캐시 (SQLite)
+# ============================================================
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "responses.sqlite3")
+
+
+class ResponseCache:
+    """SQLite 기반 API 응답 캐시
+
+    키는 엔드포인트 경로 + 정렬된 파라미터, 경로 접두어별 TTL을 적용하고
+    전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제한다.
+    캐시 오류는 조회 실패로 취급하지 않고 미스로 처리한다.
+    """
+    
+    DEFAULT_TTL = {
+        "search": 7 * 24 * 3600,        # 단지 검색 결과는 거의 바뀌지 않음
+        "regions": 24 * 3600,           # 지역별 하위 지역·단지 목록
+        "articles/complex": 10 * 60,    # 매물 목록
+    }
+    
+    def __init__(self, path: str = CACHE_PATH, ttl: Optional[Dict[str, float]] = None,
+                 max_bytes: int = 200 * 1024 * 1024):
+        self.path = path
+        self.ttl = {**self.DEFAULT_TTL, **(ttl or {})}
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    endpoint TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON responses(accessed_at)")
+    
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[dict]) -> str:
+        """엔드포인트 + 정규화된 파라미터로 캐시 키 생성"""
+        normalized = sorted((str(k), str(v)) for k, v in (params or {}).items())
+        return f"{endpoint}?{json.dumps(normalized, ensure_ascii=False, separators=(',', ':'))}"
+    
+    def ttl_for(self, endpoint: str) -> float:
+        """가장 길게 일치하는 경로 접두어의 TTL (없으면 0 = 캐시 안 함)"""
+        matches = [prefix for prefix in self.ttl if endpoint.startswith(prefix)]
+        return self.ttl[max(matches, key=len)] if matches else 0
+    
+    def get(self, endpoint: str, params: Optional[dict]) -> Optional[dict]:
+        """TTL 이내의 캐시된 응답 반환 (없으면 None)"""
+        key = self.make_key(endpoint, params)
+        now = time.time()
+        try:
+            with self._lock, self._conn:
+                row = self._conn.execute(
+                    "SELECT body, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                body, created_at = row
+                if now - created_at > self.ttl_for(endpoint):
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    return None
+                self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            return json.loads(zlib.decompress(body))
+        except (sqlite3.Error, zlib.error, ValueError):
+            return None
+    
+    def put(self, endpoint: str, params: Optional[dict], data: dict):
+        """응답 저장 후 크기 제한 초과분을 LRU 순서로 삭제"""
+        if self.ttl_for(endpoint) <= 0:
+            return
+        key = self.make_key(endpoint, params)
+        body = zlib.compress(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+        now = time.time()
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, endpoint, body, len(body), now, now)
+                )
+                self._evict()
+        except sqlite3.Error:
+            pass
+    
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        freed = 0
+        stale = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            stale.append((key,))
+            freed += size
+            if total - freed <= self.max_bytes:
+                break
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+    
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+
+# ============================================================
+# 원본 응답 보관소 (압축 JSON lines, 추가 전용)
+# ============================================================
+ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "archive")
+_ARTICLES_PREFIX = "articles/complex/"
+
+
+class ArchivedSnapshot(NamedTuple):
+    """보관된 단지 1회 조회분 (첫 페이지부터 마지막 페이지까지)"""
+    complex_id: str
+    fetched_at: float   # 첫 페이지 응답 시각
+    finished_at: float  # 마지막 페이지 응답 시각
+    articles: List[dict]
+
+
+class ResponseArchive:
+    """성공한 API 응답 원본 보관소
+
+    응답마다 JSON 한 줄을 gzip 멤버 하나로 압축해 {root}/{YYYYMMDD}/{파티션}.jsonl.gz 끝에 덧붙인다.
+    파티션은 매물 응답이면 단지ID, 그 밖에는 '_' + 엔드포인트 묶음 이름(_search, _regions_list 등)이다.
+    이어 붙인 gzip 멤버는 한 스트림으로 읽히므로 수집기와 화면이 같은 파일에 동시에 추가해도 된다.
+    보관 오류는 조회 실패로 취급하지 않는다.
+    """
+    
+    def __init__(self, root: str = ARCHIVE_DIR, compresslevel: int = 6):
+        self.root = root
+        self.compresslevel = compresslevel
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def partition(endpoint: str) -> str:
+        complex_id = endpoint[len(_ARTICLES_PREFIX):] if endpoint.startswith(_ARTICLES_PREFIX) else ""
+        if complex_id and all(ch.isalnum() or ch == "_" for ch in complex_id):
+            return complex_id
+        return "_" + endpoint_family(endpoint).replace("/", "_")
+    
+    def append(self, endpoint: str, params: Optional[dict], data: dict,
+               fetched_at: Optional[float] = None) -> bool:
+        """응답 1건 추가 (한 번의 write 로 gzip 멤버 하나를 덧붙임), 성공 여부 반환"""
+        fetched_at = fetched_at or time.time()
+        line = json.dumps(
+            {"t": fetched_at, "endpoint": endpoint, "params": params or {}, "data": data},
+            ensure_ascii=False, separators=(",", ":")
+        )
+        import gzip
+        
+        payload = gzip.compress(f"{line}\n".encode("utf-8"), compresslevel=self.compresslevel)
+        directory = os.path.join(self.root, datetime.fromtimestamp(fetched_at).strftime("%Y%m%d"))
+        path = os.path.join(directory, f"{self.partition(endpoint)}.jsonl.gz")
+        try:
+            with self._lock:
+                os.makedirs(directory, exist_ok=True)
+                fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+                try:
+                    os.write(fd, payload)
+                finally:
+                    os.close(fd)
+        except OSError:
+            return False
+        return True
+    
+    def files(self, since: Optional[str] = None, until: Optional[str] = None,
+              partitions: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        """{파티션: 날짜순 파일 경로 목록}, since/until 은 YYYYMMDD (양끝 포함)"""
+        if not os.path.isdir(self.root):
+            return {}
+        wanted = set(partitions) if partitions is not None else None
+        found = defaultdict(list)
+        for day in sorted(os.listdir(self.root)):
+            if not (len(day) == 8 and day.isdigit()):
+                continue
+            if (since and day < since) or (until and day > until):
+                continue
+            for name in sorted(os.listdir(os.path.join(self.root, day))):
+                if not name.endswith(".jsonl.gz"):
+                    continue
+                part = name[:-len(".jsonl.gz")]
+                if wanted is None or part in wanted:
+                    found[part].append(os.path.join(self.root, day, name))
+        return dict(found)
+    
+    @staticmethod
+    def read(path: str) -> Iterator[dict]:
+        """파일의 응답 레코드 (쓰는 중 잘린 마지막 멤버·깨진 줄은 건너뜀)"""
+        import gzip
+        
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+        except (OSError, EOFError, zlib.error):
+            return
+    
+    def records(self, since: Optional[str] = None, until: Optional[str] = None,
+                partitions: Optional[List[str]] = None) -> Iterator[dict]:
+        """{"t", "endpoint", "params", "data"} 레코드 (파티션별 시간순)"""
+        for paths in self.files(since, until, partitions).values():
+            for path in paths:
+                yield from self.read(path)
+    
+    def snapshots(self, since: Optional[str] = None, until: Optional[str] = None,
+                  complex_ids: Optional[List[str]] = None) -> Iterator[ArchivedSnapshot]:
+        """단지마다 마지막 페이지까지 받은 가장 최근 조회분
+
+        1페이지 응답에서 새 조회가 시작되고, isMoreData 가 거짓인 페이지에서 끝난다.
+        중간에 끊긴 조회는 건너뛴다.
+        """
+        for complex_id, paths in self.files(since, until, complex_ids).items():
+            if complex_id.startswith("_"):
+                continue
+            latest = None
+            pages: Optional[List[dict]] = None
+            started = 0.0
+            for path in paths:
+                for record in self.read(path):
+                    data = record.get("data") or {}
+                    if str(record.get("params", {}).get("page", "1")) == "1":
+                        pages, started = [], record.get("t", 0.0)
+                    elif pages is None:
+                        continue
+                    articles = data.get("articleList") or []
+                    pages.extend(articles)
+                    if not data.get("isMoreData") or not articles:
+                        latest = ArchivedSnapshot(complex_id, started, record.get("t", started), pages)
+                        pages = None
+            if latest is not None:
+                yield latest
+
+
+# ============================================================
+# 단지 검색 색인 (초성 · 오타 허용)
+# ============================================================
+DIRECTORY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "complexes.sqlite3")
+
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+
+
+def normalize_complex_name(text: str) -> str:
+    """검색용 정규화 (공백 제거, 영문 소문자)"""
+    return "".join(text.split()).lower()
+
+
+def choseong(text: str) -> str:
+    """한글 음절을 초성으로 바꾼 문자열 (그 외 문자는 그대로)"""
+    out = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        out.append(_CHOSEONG[code // 588] if 0 <= code < 11172 else ch)
+    return "".join(out)
+
+
+def _ngrams(text: str) -> set:
+    """1·2-gram 집합 (짧은 질의는 1-gram, 나머지는 2-gram 으로 후보를 찾음)"""
+    return set(text) | {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def _query_grams(text: str) -> List[str]:
+    if len(text) == 1:
+        return [text]
+    return list(dict.fromkeys(text[i:i + 2] for i in range(len(text) - 1)))
+
+
+class ComplexMatch(NamedTuple):
+    name: str
+    id: str
+    kind: str      # exact / prefix / substring / choseong / fuzzy
+    score: float   # 높을수록 우선
+
+
+class ComplexDirectory:
+    """단지명 → 단지ID 로컬 색인
+
+    프리셋과 지금까지 검색으로 알게 된 단지를 보관하고, 단지명과 초성 문자열의
+    1·2-gram 역색인으로 후보를 좁힌 뒤 순위를 매긴다. 검색 결과는 SQLite에 저장되어
+    다음 실행에서도 네트워크 없이 찾을 수 있다.
+    """
+    
+    KIND_SCORES = {"exact": 4.0, "prefix": 3.0, "substring": 2.0, "choseong": 1.5, "fuzzy": 0.0}
+    FUZZY_THRESHOLD = 0.6
+    
+    def __init__(self, path: str = DIRECTORY_PATH, presets: Optional[Dict[str, str]] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._names: List[str] = []
+        self._ids: List[str] = []
+        self._keys: List[str] = []
+        self._initials: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._grams: Dict[str, set] = defaultdict(set)
+        
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS complexes (
+                    name TEXT PRIMARY KEY,
+                    complex_id TEXT NOT NULL,
+                    seen_at REAL NOT NULL
+                )
+            """)
+            stored = self._conn.execute("SELECT name, complex_id FROM complexes").fetchall()
+        
+        for name, complex_id in (PRESET_COMPLEXES if presets is None else presets).items():
+            self._index(name, complex_id)
+        for name, complex_id in stored:
+            self._index(name, complex_id)
+    
+    def __len__(self) -> int:
+        return len(self._names)
+    
+    def _index(self, name: str, complex_id: str):
+        position = self._positions.get(name)
+        if position is not None:
+            self._ids[position] = complex_id
+            return
+        key = normalize_complex_name(name)
+        initials = choseong(key)
+        position = len(self._names)
+        self._positions[name] = position
+        self._names.append(name)
+        self._ids.append(complex_id)
+        self._keys.append(key)
+        self._initials.append(initials)
+        for gram in _ngrams(key) | _ngrams(initials):
+            self._grams[gram].add(position)
+    
+    def add(self, name: str, complex_id: str):
+        """단지 추가 (같은 이름이면 단지ID 갱신)"""
+        self.add_many([(name, complex_id)])
+    
+    def add_many(self, items: List[Tuple[str, str]]):
+        items = [(name, str(cid)) for name, cid in items if name and cid]
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            for name, complex_id in items:
+                self._index(name, complex_id)
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO complexes VALUES (?, ?, ?)",
+                    [(name, complex_id, now) for name, complex_id in items]
+                )
+    
+    def _classify(self, position: int, query: str, query_initials: str) -> Optional[Tuple[str, float]]:
+        """(일치 종류, 점수), 일치하지 않으면 None"""
+        key = self._keys[position]
+        if key == query:
+            return "exact", self.KIND_SCORES["exact"]
+        if key.startswith(query):
+            return "prefix", self.KIND_SCORES["prefix"]
+        if query in key:
+            return "substring", self.KIND_SCORES["substring"]
+        # 초성 질의 (ㅎㄹㅇㅅㅌ) 또는 음절·초성 혼합 질의 (헬ㄹ), 이름 앞부분 일치 우선
+        initials = self._initials[position]
+        start = initials.find(query_initials)
+        while start != -1:
+            if all(q == k or q == i for q, k, i in zip(query, key[start:], initials[start:])):
+                return "choseong", self.KIND_SCORES["choseong"] + (0.25 if start == 0 else 0.0)
+            start = initials.find(query_initials, start + 1)
+        return None
+    
+    def search(self, query: str, limit: int = 10) -> List[ComplexMatch]:
+        """순위가 매겨진 단지 후보 (정확 > 접두 > 부분 > 초성 > 오타 허용)"""
+        query = normalize_complex_name(query)
+        if not query:
+            return []
+        query_initials = choseong(query)
+        grams = _query_grams(query)
+        
+        with self._lock:
+            # 정확·접두·부분·초성 일치는 모든 2-gram 을 포함해야 하므로 교집합이 후보
+            postings = [self._grams.get(g, set()) for g in _query_grams(query_initials)]
+            candidates = set.intersection(*postings) if postings else set()
+            matches = []
+            for position in candidates:
+                matched = self._classify(position, query, query_initials)
+                if matched is not None:
+                    matches.append((position, *matched))
+            
+            if not matches:
+                # 오타 허용: 2-gram 을 절반 이상 공유하는 단지만 유사도 계산
+                hits = Counter(p for g in grams for p in self._grams.get(g, ()))
+                need = max(1, len(grams) // 2)
+                for position, count in hits.items():
+                    if count < need:
+                        continue
+                    ratio = SequenceMatcher(None, query, self._keys[position]).ratio()
+                    if ratio >= self.FUZZY_THRESHOLD:
+                        matches.append((position, "fuzzy", ratio))
+            
+            # 같은 등급에서는 짧은 이름(질의와 더 가까움), 먼저 등록된 단지 순
+            top = heapq.nsmallest(limit, matches, key=lambda m: (-m[2], len(self._keys[m[0]]), m[0]))
+            return [ComplexMatch(self._names[p], self._ids[p], kind, score) for p, kind, score in top]
+
+
+# ============================================================
+# 매물 파싱 (페이지 단위 컬럼 변환)
+# ============================================================
+LISTING_COLUMNS = ["단지명", "거래유형", "가격", "월세", "동", "층", "면적", "방향", "설명", "태그", "확인일", "매물번호",
+                   "공급면적", "전용면적"]
+# 값 종류가 적은 컬럼은 category (행마다 코드 1~2바이트), 가격은 만원 단위 int32 (최대 약 21만억)
+CATEGORY_COLUMNS = ["단지명", "거래유형", "동", "층", "면적", "방향", "태그"]
+# 태그 컬럼은 매물의 tagList 를 이어 붙인 문자열 (예: "급매,대단지"), 조합 종류가 적어 category 로 저장
+TAG_SEPARATOR = ","
+PRICE_COLUMNS = ["가격", "월세"]
+PRICE_DTYPE = "int32"
+TEXT_COLUMNS = ["설명", "매물번호"]
+AREA_COLUMNS = ["공급면적", "전용면적"]  # ㎡, 알 수 없으면 NaN
+AREA_DTYPE = "float32"
+PYEONG_M2 = 3.305785  # 1평 (㎡)
+
+# 면적 표시: "112A/84" (공급/전용), "84㎡" · "84A" (숫자 하나)
+_AREA_PATTERN = r"^\s*(?P<first>\d+(?:\.\d+)?)[^\d/]*(?:/\s*(?P<second>\d+(?:\.\d+)?))?"
+
+
+def _price_value(text: Any, allow_uk: bool = True) -> int:
+    """가격 문자열 1개 → 만원 단위 정수, 형식에 맞지 않으면 -1
+
+    쉼표·공백 제거 후 가격은 "12억5000" / "12억" / "85000", 월세(allow_uk=False)는 "150" 형식
+    """
+    cleaned = str(text).replace(",", "").replace(" ", "")
+    uk, sep, man = cleaned.partition("억") if allow_uk else ("", "", cleaned)
+    if not sep:
+        uk, man = "", cleaned
+    if (sep and not uk.isdecimal()) or (man and not man.isdecimal()):
+        return -1
+    return int(uk or 0) * 10000 + int(man or 0)
+
+
+def _parse_price_column(raw: List[Any], allow_uk: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """가격 문자열 목록 → (만원 단위 int64 배열, 형식 오류 여부), 서로 다른 문자열마다 한 번만 해석
+
+    형식에 맞지 않는 값은 0이 된다.
+    """
+    import numpy as np
+    import pandas as pd
+    
+    codes, uniques = pd.factorize(np.array(raw, dtype=object), use_na_sentinel=False)
+    values = np.fromiter((_price_value(text, allow_uk) for text in uniques), dtype=np.int64, count=len(uniques))[codes]
+    malformed = values < 0
+    values[malformed] = 0
+    return values, malformed
+
+
+@lru_cache(maxsize=None)
+def _text_dtype():
+    """자유 텍스트 컬럼 dtype (pyarrow 가 있으면 행마다 파이썬 객체 대신 연속 버퍼에 저장)"""
+    import importlib.util
+    import pandas as pd
+    
+    return pd.StringDtype("pyarrow" if importlib.util.find_spec("pyarrow") else "python")
+
+
+def parse_confirm_dates(values) -> pd.Series:
+    """확인일 (20260315 / 2026-03-15 / 2026.03.15) → datetime64, 해석할 수 없으면 NaT"""
+    import numpy as np
+    import pandas as pd
+    
+    # 같은 날짜가 많으므로 서로 다른 값만 해석해 행으로 펼침
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object).astype(str))
+    parsed = []
+    for text in uniques:
+        try:
+            parsed.append(datetime.strptime("".join(ch for ch in text if ch.isdigit()), "%Y%m%d"))
+        except ValueError:
+            parsed.append(None)
+    return pd.Series(np.array(parsed, dtype="datetime64[us]")[codes])
+
+
+def parse_area_labels(labels) -> Tuple[np.ndarray, np.ndarray]:
+    """면적 표시 문자열 → (공급면적, 전용면적) ㎡ 배열, 해석할 수 없으면 NaN
+
+    "112A/84" 는 공급 112 · 전용 84, 숫자가 하나뿐인 "84㎡" · "84A" 는 전용면적으로 본다.
+    표시 문자열 종류마다 한 번만 해석해 행으로 펼친다.
+    """
+    import re
+    
+    import numpy as np
+    import pandas as pd
+    
+    labels = pd.Series(labels)
+    if isinstance(labels.dtype, pd.CategoricalDtype):
+        codes, kinds = labels.cat.codes.to_numpy(), labels.cat.categories
+    else:
+        codes, kinds = pd.factorize(labels)
+    # 종류는 많아야 수십 개라 정규식을 그대로 돌림, 마지막 원소는 결측값(코드 -1)용
+    supply = np.full(len(kinds) + 1, np.nan)
+    exclusive = np.full(len(kinds) + 1, np.nan)
+    pattern = re.compile(_AREA_PATTERN)
+    for i, kind in enumerate(kinds):
+        match = pattern.match(str(kind))
+        if match is None:
+            continue
+        if match["second"] is None:
+            exclusive[i] = float(match["first"])
+        else:
+            supply[i], exclusive[i] = float(match["first"]), float(match["second"])
+    return supply[codes], exclusive[codes]
+
+
+def format_confirm_dates(values: pd.Series) -> pd.Series:
+    """확인일 표시용 문자열 (YYYY-MM-DD, 없으면 빈 문자열)"""
+    return values.dt.strftime("%Y-%m-%d").fillna("")
+
+
+def compact_listings(df: pd.DataFrame) -> pd.DataFrame:
+    """매물 DataFrame 을 메모리 절약 dtype 으로 변환 (이미 변환된 컬럼은 그대로 둠)
+
+    category: 단지명·거래유형·동·층·면적·방향, int32: 가격·월세,
+    datetime64: 확인일, 문자열(pyarrow): 설명·매물번호, float32: 공급면적·전용면적
+    (면적 컬럼이 없거나 비어 있으면 면적 표시 문자열에서 채움)
+    """
+    import pandas as pd
+    
+    converted = {}
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            # 카테고리 dtype 을 object 로 맞춰야 다른 프레임과 합칠 때 카테고리를 유지할 수 있음
+            converted[col] = df[col].astype(object).astype("category")
+    for col in PRICE_COLUMNS:
+        if col in df.columns and df[col].dtype != PRICE_DTYPE:
+            converted[col] = df[col].fillna(0).astype(PRICE_DTYPE)
+    if "확인일" in df.columns and not pd.api.types.is_datetime64_any_dtype(df["확인일"]):
+        converted["확인일"] = parse_confirm_dates(df["확인일"]).set_axis(df.index)
+    for col in TEXT_COLUMNS:
+        if col in df.columns and df[col].dtype != _text_dtype():
+            converted[col] = df[col].astype(_text_dtype())
+    if "면적" in df.columns:
+        missing = [col for col in AREA_COLUMNS if col not in df.columns or df[col].isna().any()]
+        if missing:
+            parsed = dict(zip(AREA_COLUMNS, parse_area_labels(converted.get("면적", df["면적"]))))
+            for col in missing:
+                values = parsed[col] if col not in df.columns else df[col].fillna(pd.Series(parsed[col], index=df.index))
+                converted[col] = pd.Series(values, index=df.index).astype(AREA_DTYPE)
+    for col in AREA_COLUMNS:
+        if col in df.columns and col not in converted and df[col].dtype != AREA_DTYPE:
+            converted[col] = pd.to_numeric(df[col], errors="coerce").astype(AREA_DTYPE)
+    return df.assign(**converted) if converted else df
+
+
+def memory_report(df: pd.DataFrame) -> pd.DataFrame:
+    """컬럼별 메모리 사용량 (문자열 내용까지 포함)"""
+    import pandas as pd
+    
+    usage = df.memory_usage(deep=True, index=False)
+    rows = max(len(df), 1)
+    return pd.DataFrame({
+        "컬럼": usage.index,
+        "dtype": [str(df[col].dtype) for col in usage.index],
+        "MB": (usage / 1e6).round(2).to_numpy(),
+        "행당 바이트": (usage / rows).round(1).to_numpy(),
+    })
+
+
+def parse_article_batch(articles: List[dict], complex_name: Union[str, List[str]]) -> Tuple[pd.DataFrame, List[str]]:
+    """articleList 원본(여러 페이지·여러 단지를 합친 목록 가능)을 컬럼 단위로 파싱
+
+    complex_name 은 단지명 하나 또는 매물마다의 단지명 목록.
+    compact_listings 와 같은 dtype 의 컬럼을 한 번에 만들고,
+    해석할 수 없는 가격 문자열은 0으로 두되 원본 문자열 목록을 함께 반환한다.
+    호출마다 고정 비용이 있어 페이지마다 부르기보다 받은 원본을 모아 한 번 부르는 편이 빠르다.
+    """
+    import numpy as np
+    import pandas as pd
+    
+    if not articles:
+        empty = pd.DataFrame({col: pd.Series(dtype=object) for col in LISTING_COLUMNS})
+        return compact_listings(empty), []
+    
+    def column(key: str, default: Any) -> np.ndarray:
+        return np.array([art.get(key, default) for art in articles], dtype=object)
+    
+    def category(key: str, default: Any) -> pd.Categorical:
+        return pd.Categorical(pd.Series(column(key, default), dtype=object))
+    
+    price_raw = column("dealOrWarrantPrc", "0")
+    rent_raw = column("rentPrc", "0")
+    price, price_bad = _parse_price_column(price_raw)
+    rent, rent_bad = _parse_price_column(rent_raw, allow_uk=False)
+    
+    malformed = (
+        [f"가격 '{v}'" for v in price_raw[price_bad]]
+        + [f"월세 '{v}'" for v in rent_raw[rent_bad]]
+    )
+    
+    if isinstance(complex_name, str):
+        names = pd.Categorical.from_codes(np.zeros(len(articles), dtype=np.int8), [complex_name])
+    else:
+        names = pd.Categorical(np.array(complex_name, dtype=object))
+    area = category("areaName", "-")
+    # area1/area2 (공급/전용) 가 없는 매물은 면적 표시 문자열에서 채움
+    area_sizes = [pd.to_numeric(column(key, None), errors="coerce").astype(np.float64) for key in ("area1", "area2")]
+    if any(np.isnan(values).any() for values in area_sizes):
+        for values, parsed in zip(area_sizes, parse_area_labels(area)):
+            np.copyto(values, parsed, where=np.isnan(values))
+    
+    df = pd.DataFrame({
+        "단지명": names,
+        "거래유형": category("tradeTypeName", ""),
+        "가격": price.astype(PRICE_DTYPE),
+        "월세": rent.astype(PRICE_DTYPE),
+        "동": category("buildingName", "-"),
+        "층": category("floorInfo", "-"),
+        "면적": area,
+        "방향": category("direction", "-"),
+        "설명": pd.array(column("articleFeatureDesc", ""), dtype=_text_dtype()),
+        "태그": pd.Categorical(pd.Series([TAG_SEPARATOR.join(art.get("tagList") or ()) for art in articles], dtype=object)),
+        "확인일": parse_confirm_dates(column("articleConfirmYmd", "")).to_numpy(),
+        "매물번호": pd.array([article_key(art) for art in articles], dtype=_text_dtype()),
+        "공급면적": area_sizes[0].astype(AREA_DTYPE),
+        "전용면적": area_sizes[1].astype(AREA_DTYPE),
+    })
+    return df, malformed
+
+
+def article_key(art: dict) -> str:
+    """매물 식별자 (articleNo, 없으면 원본 내용 해시)"""
+    article_no = art.get("articleNo")
+    if article_no:
+        return str(article_no)
+    import hashlib
+    
+    raw = json.dumps(art, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return "raw:" + hashlib.sha1(raw).hexdigest()[:16]
+
+
+def concat_listings(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """페이지/단지별 DataFrame 합치기 (category 컬럼은 카테고리를 합쳐서 유지)"""
+    import pandas as pd
+    
+    frames = [f for f in frames if f is not None]
+    if not frames:
+        return parse_article_batch([], "")[0]
+    if len(frames) == 1:
+        return compact_listings(frames[0].reset_index(drop=True))
+    
+    # 카테고리가 다른 category 컬럼은 concat 시 object 가 되므로 합친 뒤 한 번에 다시 변환
+    return compact_listings(pd.concat(frames, ignore_index=True))
+
+
+def format_parse_warning(malformed: List[str]) -> str:
+    """형식 오류 목록을 한 줄 메시지로 요약"""
+    if not malformed:
+        return ""
+    examples = ", ".join(malformed[:3])
+    more = f" 외 {len(malformed) - 3}건" if len(malformed) > 3 else ""
+    return f"형식 오류 {len(malformed)}건 ({examples}{more})"
+
+
+# ============================================================
+# 동일 요청 병합 (single-flight)
+# ============================================================
+class SingleFlight:
+    """같은 키의 동시 요청을 하나로 병합
+
+    먼저 들어온 호출만 fn을 실행하고, 실행 중에 들어온 같은 키의 호출은
+    그 결과(또는 예외)를 기다렸다가 그대로 공유한다.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+    
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        from concurrent.futures import Future
+        
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = Future()
+                self._calls[key] = call
+        
+        if not leader:
+            return call.result()
+        
+        try:
+            result = fn()
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+# ============================================================
+# 비동기 HTTP 전송 (asyncio, keep-alive 연결 풀)
+# ============================================================
+class AsyncHTTPTransport:
+    """표준 라이브러리 asyncio 스트림 위의 HTTP/1.1 GET 클라이언트
+
+    호스트마다 최대 pool_size 개의 keep-alive 연결을 열어 두고 재사용하며,
+    응답은 gzip/deflate 압축으로 받는다. timeout 은 연결부터 본문 수신까지의 요청별 마감 시간이다.
+    연결은 처음 사용한 이벤트 루프에 묶이므로 루프 하나 안에서 async with 로 사용한다.
+    """
+    
+    def __init__(self, pool_size: int = 8, timeout: float = 15.0, headers: Optional[Dict[str, str]] = None):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.headers = {
+            key: value for key, value in (headers or {}).items()
+            if key.lower() not in ("host", "connection", "accept-encoding", "content-length")
+        }
+        self._idle: Dict[Tuple[str, str, int], List[Tuple[Any, Any]]] = defaultdict(list)
+        self._slots: Dict[Tuple[str, str, int], Any] = {}
+        self.inflight: Dict[str, Any] = {}  # 진행 중인 같은 요청 병합 (NaverLandAPI._aget_json)
+        self.connections_opened = 0
+        self.requests_sent = 0
+    
+    async def __aenter__(self) -> "AsyncHTTPTransport":
+        return self
+    
+    async def __aexit__(self, *exc):
+        await self.aclose()
+    
+    async def aclose(self):
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+    
+    async def get(self, url: str, params: Optional[dict] = None, headers: Optional[Dict[str, str]] = None,
+                  timeout: Optional[float] = None) -> Tuple[int, Dict[str, str], bytes]:
+        """(상태 코드, 소문자 헤더, 압축을 푼 본문), 마감 시간을 넘기면 TimeoutError"""
+        import asyncio
+        
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname, port)
+        query = "&".join(filter(None, [parts.query, urlencode(params or {})]))
+        target = (parts.path or "/") + (f"?{query}" if query else "")
+        host = parts.hostname if parts.port is None else f"{parts.hostname}:{parts.port}"
+        lines = [f"GET {target} HTTP/1.1", f"Host: {host}", "Accept-Encoding: gzip, deflate", "Connection: keep-alive"]
+        lines += [f"{k}: {v}" for k, v in {**self.headers, **(headers or {})}.items()]
+        request = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._slots[key] = asyncio.Semaphore(self.pool_size)
+        async with slot:
+            return await asyncio.wait_for(self._exchange(key, request), timeout or self.timeout)
+    
+    async def _connect(self, key: Tuple[str, str, int]):
+        import asyncio
+        import ssl
+        
+        scheme, host, port = key
+        context = ssl.create_default_context() if scheme == "https" else None
+        self.connections_opened += 1
+        return await asyncio.open_connection(host, port, ssl=context)
+    
+    async def _exchange(self, key: Tuple[str, str, int], request: bytes,
+                        fresh: bool = False) -> Tuple[int, Dict[str, str], bytes]:
+        idle = self._idle[key]
+        reused = bool(idle) and not fresh
+        reader, writer = idle.pop() if reused else await self._connect(key)
+        try:
+            writer.write(request)
+            await writer.drain()
+            self.requests_sent += 1
+            status, headers, body, keep_alive = await self._read_response(reader)
+        except (ConnectionError, EOFError):
+            writer.close()
+            if not reused:
+                raise
+            # 서버가 먼저 닫은 유휴 연결이었으면 새 연결로 한 번만 다시 보냄 (GET 이므로 안전)
+            return await self._exchange(key, request, fresh=True)
+        except BaseException:
+            writer.close()
+            raise
+        if keep_alive:
+            idle.append((reader, writer))
+        else:
+            writer.close()
+        return status, headers, body
+    
+    @staticmethod
+    async def _read_response(reader) -> Tuple[int, Dict[str, str], bytes, bool]:
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("응답 없이 연결이 닫힘")
+        try:
+            version, status = status_line.decode("latin-1").split(None, 2)[:2]
+            status = int(status)
+        except ValueError:
+            raise ConnectionError(f"잘못된 상태 줄: {status_line[:80]!r}")
+        
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        
+        keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        elif status in (204, 304) or 100 <= status < 200:
+            body = b""
+        else:
+            body = await reader.read()
+            keep_alive = False
+        
+        encoding = headers.get("content-encoding", "").lower()
+        if encoding == "gzip":
+            import gzip
+            
+            body = gzip.decompress(body)
+        elif encoding == "deflate":
+            try:
+                body = zlib.decompress(body)
+            except zlib.error:
+                body = zlib.decompress(body, -zlib.MAX_WBITS)
+        return status, headers, body, keep_alive
+
+
+# ============================================================
+# API 클래스 (세션 유지, 재시도 로직)
+# ============================================================
+class NaverLandAPI:
+    """네이버 부동산 API 클라이언트"""
+    
+    BASE_URL = "https://new.land.naver.com/api"
+    
+    def __init__(self, limiter: Optional[TokenBucketLimiter] = None,
+                 cache: Optional[ResponseCache] = None, base_url: Optional[str] = None,
+                 rate_control: Optional[AdaptiveRateController] = None,
+                 breaker: Optional[CircuitBreaker] = None,
+                 directory: Optional[ComplexDirectory] = None,
+                 archive: Optional[ResponseArchive] = None):
+        import requests
+        
+        self.session = requests.Session()
+        self.session.headers.update(self._get_headers())
+        self.limiter = limiter
+        self.cache = cache
+        self.rate_control = rate_control
+        self.breaker = breaker
+        self.directory = directory if directory is not None else ComplexDirectory(":memory:")
+        self.archive = archive
+        self.metrics = ClientMetrics()
+        self._probe_thread: Optional[threading.Thread] = None
+        self._inflight = SingleFlight()
+        self.base_url = (base_url or self.BASE_URL).rstrip("/")  # 벤치마크용 로컬 서버 지정 가능
+        self.host = urlparse(self.base_url).netloc
+        self.last_request_time = 0
+        self.min_interval = 3.0  # 최소 요청 간격 (초), limiter가 없을 때만 사용
+        self._rate_lock = threading.Lock()
+    
+    def _get_headers(self) -> dict:
+        """브라우저와 유사한 헤더 생성"""
+        return {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
+            "Accept": "application/json, text/plain, */*",
+            "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+            "Accept-Encoding": "gzip, deflate, br",
+            "Referer": "https://new.land.naver.com/complexes",
+            "Origin": "https://new.land.naver.com",
+            "Sec-Ch-Ua": '"Chromium";v="122", "Not(A:Brand";v="24", "Google Chrome";v="122"',
+            "Sec-Ch-Ua-Mobile": "?0",
+            "Sec-Ch-Ua-Platform": '"Windows"',
+            "Sec-Fetch-Dest": "empty",
+            "Sec-Fetch-Mode": "cors",
+            "Sec-Fetch-Site": "same-origin",
+        }
+    
+    def _rate_limit_delay(self, family: str) -> float:
+        """이번 요청 차례를 예약하고 기다려야 할 시간(초) 반환 (엔드포인트별 적응형 속도 + 전역 토큰 버킷)"""
+        wait = 0.0
+        if self.rate_control is not None:
+            wait = self.rate_control.reserve(family)
+        if self.limiter is not None:
+            wait = max(wait, self.limiter.reserve())
+        elif self.rate_control is None:
+            with self._rate_lock:
+                now = time.time()
+                elapsed = now - self.last_request_time
+                if elapsed < self.min_interval:
+                    wait = self.min_interval - elapsed + random.uniform(0.5, 1.5)
+                self.last_request_time = now + wait
+        return wait
+    
+    def _wait_for_rate_limit(self, family: str = ""):
+        """요청 간격 조절"""
+        started = time.monotonic()
+        wait = self._rate_limit_delay(family)
+        if wait > 0:
+            time.sleep(wait)
+        self.metrics.inc(family, "wait_seconds", time.monotonic() - started)
+    
+    async def _await_rate_limit(self, family: str = ""):
+        import asyncio
+        
+        started = time.monotonic()
+        wait = self._rate_limit_delay(family)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        self.metrics.inc(family, "wait_seconds", time.monotonic() - started)
+    
+    def _backoff(self, family: str, seconds: float):
+        self.metrics.inc(family, "backoff_seconds", seconds)
+        time.sleep(seconds)
+    
+    async def _abackoff(self, family: str, seconds: float):
+        import asyncio
+        
+        self.metrics.inc(family, "backoff_seconds", seconds)
+        await asyncio.sleep(seconds)
+    
+    def _throttle_backoff(self, family: str, attempt: int, retry_after: Optional[float]) -> float:
+        """429 응답 뒤 다음 시도 전에 쉴 시간(초)"""
+        if self.rate_control is not None:
+            # 대기는 다음 acquire 에서 엔드포인트 단위로 처리됨
+            self.rate_control.on_throttle(family, retry_after)
+            return (2 ** attempt) + random.uniform(0, 1) if retry_after is None else 0.0
+        # 429 에러 시 대기 시간 증가 (Retry-After 가 있으면 그만큼)
+        return retry_after if retry_after is not None else (2 ** attempt) * 5 + random.uniform(1, 3)
+    
+    @contextmanager
+    def _host_slot(self):
+        if self.limiter is None:
+            yield
+        else:
+            with self.limiter.host_slot(self.host):
+                yield
+    
+    def metrics_text(self) -> str:
+        """Prometheus 텍스트 형식 지표 (적응형 속도·브레이커 상태 포함)"""
+        gauges = {}
+        if self.rate_control is not None:
+            gauges["adaptive_rate"] = self.rate_control.rates()
+        text = self.metrics.to_prometheus(gauges)
+        if self.breaker is not None:
+            text += ("# TYPE naver_land_breaker_open gauge\n"
+                     f'naver_land_breaker_open{{host="{self.host}"}} {int(self.breaker.is_open)}\n')
+        return text
+    
+    @property
+    def is_blocked(self) -> bool:
+        """서킷 브레이커가 열려 있는지 (요청이 즉시 실패하는 상태)"""
+        return self.breaker is not None and self.breaker.is_open
+    
+    def _record_failure(self, url: str, params: Optional[dict], headers: Optional[dict]):
+        if self.breaker is not None and self.breaker.record_failure():
+            self._start_probe(url, params, headers)
+    
+    def _record_success(self):
+        if self.breaker is not None:
+            self.breaker.record_success()
+    
+    def _start_probe(self, url: str, params: Optional[dict], headers: Optional[dict]):
+        """브레이커가 열리면 백그라운드에서 마지막 실패 요청으로 복구 여부를 주기적으로 확인"""
+        if self._probe_thread is not None and self._probe_thread.is_alive():
+            return
+        
+        def probe():
+            import requests
+            
+            while self.breaker.is_open:
+                time.sleep(self.breaker.retry_in())
+                try:
+                    with self._host_slot():
+                        response = self.session.get(url, params=params, headers=headers, timeout=15)
+                    ok = response.status_code == 200
+                except requests.exceptions.RequestException:
+                    ok = False
+                if ok:
+                    self.breaker.record_success()
+                else:
+                    self.breaker.record_failure(probe=True)
+        
+        self._probe_thread = threading.Thread(target=probe, name="naver-probe", daemon=True)
+        self._probe_thread.start()
+    
+    def _request_with_retry(self, url: str, params: dict = None, max_retries: int = 3,
+                            headers: dict = None) -> Optional[dict]:
+        """지수 백오프를 사용한 재시도 로직
+
+        429 응답은 Retry-After 를 따르고, 적응형 속도 조절이 있으면 해당 엔드포인트 속도를 줄인다.
+        서킷 브레이커가 열려 있으면 기다리지 않고 바로 None 을 반환한다.
+        """
+        import requests
+        
+        family = endpoint_family(url[len(self.base_url):]) if url.startswith(self.base_url) else url
+        
+        for attempt in range(max_retries):
+            if self.breaker is not None and not self.breaker.allow():
+                return None
+            if attempt > 0:
+                self.metrics.inc(family, "retries")
+            
+            self._wait_for_rate_limit(family)
+            
+            started = time.monotonic()
+            try:
+                with self._host_slot():
+                    response = self.session.get(url, params=params, headers=headers, timeout=15)
+                self.metrics.observe_request(family, time.monotonic() - started,
+                                             response.status_code, len(response.content))
+                
+                if response.status_code == 200:
+                    self._record_success()
+                    if self.rate_control is not None:
+                        self.rate_control.on_success(family)
+                    return response.json()
+                elif response.status_code == 429:
+                    wait = self._throttle_backoff(family, attempt,
+                                                  parse_retry_after(response.headers.get("Retry-After")))
+                    if wait > 0:
+                        self._backoff(family, wait)
+                    continue
+                elif response.status_code == 403 or response.status_code >= 500:
+                    # 차단(403)·서버 오류는 재시도하지 않고 브레이커 실패로만 집계
+                    self._record_failure(url, params, headers)
+                    return None
+                else:
+                    return None
+                    
+            except requests.exceptions.RequestException:
+                self.metrics.observe_request(family, time.monotonic() - started, None)
+                if attempt < max_retries - 1:
+                    self._backoff(family, 2 ** attempt)
+                continue
+        
+        # 429·네트워크 오류로 재시도를 다 쓴 요청만 브레이커 실패로 집계
+        self._record_failure(url, params, headers)
+        return None
+    
+    async def _arequest_with_retry(self, transport: AsyncHTTPTransport, url: str, params: dict = None,
+                                   max_retries: int = 3, headers: dict = None) -> Optional[dict]:
+        """_request_with_retry 의 비동기 버전 (같은 속도 제한·429 처리·서킷 브레이커, 전송만 transport 사용)"""
+        family = endpoint_family(url[len(self.base_url):]) if url.startswith(self.base_url) else url
+        
+        for attempt in range(max_retries):
+            if self.breaker is not None and not self.breaker.allow():
+                return None
+            if attempt > 0:
+                self.metrics.inc(family, "retries")
+            
+            await self._await_rate_limit(family)
+            
+            started = time.monotonic()
+            try:
+                status, response_headers, body = await transport.get(url, params, headers)
+                data = json.loads(body) if status == 200 else None
+            except (OSError, EOFError, ValueError):
+                # 연결 오류 · 마감 시간 초과(TimeoutError) · 잘못된 응답
+                self.metrics.observe_request(family, time.monotonic() - started, None)
+                if attempt < max_retries - 1:
+                    await self._abackoff(family, 2 ** attempt)
+                continue
+            self.metrics.observe_request(family, time.monotonic() - started, status, len(body))
+            
+            if status == 200:
+                self._record_success()
+                if self.rate_control is not None:
+                    self.rate_control.on_success(family)
+                return data
+            elif status == 429:
+                wait = self._throttle_backoff(family, attempt, parse_retry_after(response_headers.get("retry-after")))
+                if wait > 0:
+                    await self._abackoff(family, wait)
+                continue
+            elif status == 403 or status >= 500:
+                self._record_failure(url, params, headers)
+                return None
+            else:
+                return None
+        
+        self._record_failure(url, params, headers)
+        return None
+    
+    def _cached_json(self, endpoint: str, params: Optional[dict], bypass_cache: bool) -> Optional[dict]:
+        if self.cache is None or bypass_cache:
+            return None
+        cached = self.cache.get(endpoint, params)
+        family = endpoint_family(endpoint)
+        if cached is not None:
+            self.metrics.inc(family, "cache_hits")
+        else:
+            self.metrics.inc(family, "cache_misses")
+        return cached
+    
+    def _store_json(self, endpoint: str, params: Optional[dict], data: Optional[dict]):
+        if data is not None and self.cache is not None:
+            self.cache.put(endpoint, params, data)
+        if data is not None and self.archive is not None:
+            self.archive.append(endpoint, params, data)
+    
+    def _get_json(self, endpoint: str, params: dict = None, headers: dict = None,
+                  bypass_cache: bool = False) -> Optional[dict]:
+        """캐시 확인 후 없으면 재시도 로직으로 요청하고 결과를 캐시(와 원본 보관소)에 저장
+
+        같은 엔드포인트·파라미터의 요청이 이미 진행 중이면 새로 보내지 않고 그 결과를 공유한다.
+        """
+        cached = self._cached_json(endpoint, params, bypass_cache)
+        if cached is not None:
+            return cached
+        
+        def fetch() -> Optional[dict]:
+            data = self._request_with_retry(f"{self.base_url}/{endpoint}", params, headers=headers)
+            self._store_json(endpoint, params, data)
+            return data
+        
+        return self._inflight.do(ResponseCache.make_key(endpoint, params), fetch)
+    
+    async def _aget_json(self, transport: AsyncHTTPTransport, endpoint: str, params: dict = None,
+                         headers: dict = None, bypass_cache: bool = False) -> Optional[dict]:
+        """_get_json 의 비동기 버전 (진행 중인 같은 요청은 transport.inflight 로 공유)"""
+        import asyncio
+        
+        cached = self._cached_json(endpoint, params, bypass_cache)
+        if cached is not None:
+            return cached
+        
+        key = ResponseCache.make_key(endpoint, params)
+        pending = transport.inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        pending = transport.inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            data = await self._arequest_with_retry(transport, f"{self.base_url}/{endpoint}", params, headers=headers)
+            self._store_json(endpoint, params, data)
+            pending.set_result(data)
+            return data
+        except BaseException as e:
+            pending.set_exception(e)
+            pending.exception()  # 기다리는 호출이 없어도 "never retrieved" 경고를 남기지 않음
+            raise
+        finally:
+            transport.inflight.pop(key, None)
+    
+    def _directory_match(self, keyword: str) -> Optional[dict]:
+        """로컬 색인만으로 답이 정해질 때(정확 일치 또는 후보가 하나뿐)의 {name, id}
+
+        "자이"·"잠실" 처럼 후보가 여럿이면 None 을 반환해 네이버에서 검색하게 한다.
+        """
+        matches = self.directory.search(keyword, limit=2)
+        if not matches:
+            return None
+        best = matches[0]
+        if best.kind == "exact" and (len(matches) == 1 or matches[1].kind != "exact"):
+            return {"name": best.name, "id": best.id}
+        # 오타 허용 결과는 충분히 비슷할 때만 믿고, 아니면 네이버에서 검색
+        if len(matches) == 1 and (best.kind != "fuzzy" or best.score >= 0.8):
+            return {"name": best.name, "id": best.id}
+        return None
+    
+    def search_complex(self, keyword: str, bypass_cache: bool = False) -> Tuple[bool, Optional[dict], str]:
+        """단지 검색 (로컬 색인으로 답이 정해지면 바로 반환, 없거나 후보가 여럿이면 API 검색)"""
+        found = None if bypass_cache else self._directory_match(keyword)
+        if found is not None:
+            return True, found, ""
+        
+        # API 검색
+        data = self._get_json("search", {"keyword": keyword}, bypass_cache=bypass_cache)
+        return self._search_result(keyword, data)
+    
+    async def asearch_complex(self, transport: AsyncHTTPTransport, keyword: str,
+                              bypass_cache: bool = False) -> Tuple[bool, Optional[dict], str]:
+        """search_complex 의 비동기 버전"""
+        found = None if bypass_cache else self._directory_match(keyword)
+        if found is not None:
+            return True, found, ""
+        
+        data = await self._aget_json(transport, "search", {"keyword": keyword}, bypass_cache=bypass_cache)
+        return self._search_result(keyword, data)
+    
+    def _search_result(self, keyword: str, data: Optional[dict]) -> Tuple[bool, Optional[dict], str]:
+        """검색 응답 → (성공여부, {name, id}, 에러), 받은 단지는 로컬 색인에 추가"""
+        if data is None:
+            return False, None, "검색 실패 (네트워크 오류 또는 차단)"
+        
+        suggests = data.get("suggests", [])
+        self.directory.add_many([
+            (item.get("cortarName"), item.get("complexNo"))
+            for item in suggests if item.get("cortarType") == "AptComplex"
+        ])
+        
+        for item in suggests:
+            if item.get("cortarType") == "AptComplex":
+                return True, {
+                    "name": item.get("cortarName", keyword),
+                    "id": item.get("complexNo") or item.get("cortarNo")
+                }, ""
+        
+        # 다른 형식 시도
+        for item in suggests:
+            complex_no = item.get("complexNo") or item.get("cortarNo")
+            if complex_no:
+                return True, {
+                    "name": item.get("cortarName", keyword),
+                    "id": complex_no
+                }, ""
+        
+        return False, None, "검색 결과가 없습니다"
+    
+    def list_regions(self, cortar_no: str, bypass_cache: bool = False) -> Tuple[bool, List[Tuple[str, str]], str]:
+        """하위 지역 목록 (구 → 동), [(지역 코드, 지역명)]"""
+        data = self._get_json("regions/list", {"cortarNo": cortar_no}, bypass_cache=bypass_cache)
+        if data is None:
+            return False, [], "지역 목록 조회 실패"
+        return True, [
+            (item["cortarNo"], item.get("cortarName", item["cortarNo"]))
+            for item in data.get("regionList", []) if item.get("cortarNo")
+        ], ""
+    
+    def list_region_complexes(self, cortar_no: str, bypass_cache: bool = False) -> Tuple[bool, List[Tuple[str, str]], str]:
+        """지역 안의 아파트 단지 목록, [(단지명, 단지ID)]"""
+        params = {"cortarNo": cortar_no, "realEstateType": "APT", "order": ""}
+        data = self._get_json("regions/complexes", params, bypass_cache=bypass_cache)
+        if data is None:
+            return False, [], "단지 목록 조회 실패"
+        complexes = [
+            (item.get("complexName") or str(item["complexNo"]), str(item["complexNo"]))
+            for item in data.get("complexList", []) if item.get("complexNo")
+        ]
+        self.directory.add_many(complexes)
+        return True, complexes, ""
+    
+    def _article_request(self, complex_id: str) -> Tuple[str, dict, dict]:
+        """매물 목록 요청의 (엔드포인트, 1페이지 파라미터, 헤더)"""
+        endpoint = f"articles/complex/{complex_id}"
+        params = {
+            "realEstateType": "APT",
+            "tradeType": "A1:B1:B2",
+            "tag": ":::::::::",
+            "rentPriceMin": "0",
+            "rentPriceMax": "900000000",
+            "priceMin": "0",
+            "priceMax": "900000000",
+            "areaMin": "0",
+            "areaMax": "900000000",
+            "showArticle": "false",
+            "sameAddressGroup": "true",
+            "page": "1",
+            "complexNo": complex_id
+        }
+        
+        # Referer 업데이트 (세션을 여러 스레드가 공유하므로 요청 단위로 지정)
+        headers = {"Referer": f"https://new.land.naver.com/complexes/{complex_id}"}
+        return endpoint, params, headers
+    
+    def _page_error(self, page: int) -> str:
+        error = "조회 실패" if page == 1 else f"조회 실패 ({page}페이지)"
+        if self.is_blocked:
+            error += f" - 차단 감지, {self.breaker.retry_in():.0f}초 후 복구 확인"
+        return error
+    
+    def iter_article_pages(self, complex_id: str, max_pages: Optional[int] = None,
+                           bypass_cache: bool = False) -> Iterator[Tuple[bool, List[dict], str]]:
+        """매물 원본(articleList) 페이지 단위 조회 (isMoreData가 false가 될 때까지 다음 페이지를 따라감)
+
+        페이지마다 (성공여부, 원본 매물 목록, 에러) 를 yield 하며,
+        실패한 페이지에서 (False, [], 에러) 를 yield 하고 종료한다.
+        """
+        endpoint, params, headers = self._article_request(complex_id)
+        
+        page = 1
+        while True:
+            params["page"] = str(page)
+            data = self._get_json(endpoint, params, headers=headers, bypass_cache=bypass_cache)
+            
+            if data is None:
+                yield False, [], self._page_error(page)
+                return
+            
+            articles = data.get("articleList", [])
+            yield True, articles, ""
+            
+            if not data.get("isMoreData") or not articles:
+                return
+            if max_pages is not None and page >= max_pages:
+                return
+            page += 1
+    
+    def iter_listings(self, complex_id: str, complex_name: str, max_pages: Optional[int] = None,
+                      bypass_cache: bool = False) -> Iterator[Tuple[bool, pd.DataFrame, str]]:
+        """매물 목록 페이지 단위 조회 + 파싱
+
+        페이지마다 (성공여부, 파싱된 매물 DataFrame, 에러/경고) 를 yield 하며,
+        실패한 페이지에서 (False, 빈 DataFrame, 에러) 를 yield 하고 종료한다.
+        가격 형식 오류는 성공한 페이지의 경고 메시지로 전달된다.
+
+        페이지가 도착하는 대로 처리하려는 라이브러리 사용자를 위한 스트리밍 API 로,
+        앱·ListingTracker·RegionCrawler 는 파싱 고정 비용을 한 번만 내도록
+        iter_article_pages 로 전체 페이지를 모아 한 번에 파싱한다.
+        """
+        page = 0
+        for success, articles, error in self.iter_article_pages(complex_id, max_pages, bypass_cache):
+            page += 1
+            if not success:
+                yield False, parse_article_batch([], complex_name)[0], error
+                return
+            parsed, malformed = parse_article_batch(articles, complex_name)
+            warning = format_parse_warning(malformed)
+            yield True, parsed, f"{page}페이지 {warning}" if warning else ""
+    
+    def get_listings(self, complex_id: str, complex_name: str, max_pages: Optional[int] = None,
+                     bypass_cache: bool = False) -> Tuple[bool, pd.DataFrame, str]:
+        """매물 목록 조회 (전체 페이지)
+
+        중간 페이지에서 실패하면 그때까지 받은 매물과 함께 에러 메시지를 반환한다.
+        """
+        articles = []
+        for success, page_articles, error in self.iter_article_pages(complex_id, max_pages, bypass_cache):
+            if not success:
+                break
+            articles.extend(page_articles)
+        return self._listings_result(articles, complex_name, error)
+    
+    async def aget_article_pages(self, transport: AsyncHTTPTransport, complex_id: str, max_pages: Optional[int] = None,
+                                 bypass_cache: bool = False) -> Tuple[List[dict], str]:
+        """iter_article_pages 의 비동기 버전, (받은 원본 매물 전체, 실패한 페이지의 에러 또는 "")"""
+        endpoint, params, headers = self._article_request(complex_id)
+        articles = []
+        
+        page = 1
+        while True:
+            data = await self._aget_json(transport, endpoint, {**params, "page": str(page)},
+                                         headers=headers, bypass_cache=bypass_cache)
+            if data is None:
+                return articles, self._page_error(page)
+            
+            page_articles = data.get("articleList", [])
+            articles.extend(page_articles)
+            if not data.get("isMoreData") or not page_articles:
+                return articles, ""
+            if max_pages is not None and page >= max_pages:
+                return articles, ""
+            page += 1
+    
+    async def aget_listings(self, transport: AsyncHTTPTransport, complex_id: str, complex_name: str,
+                            max_pages: Optional[int] = None, bypass_cache: bool = False) -> Tuple[bool, pd.DataFrame, str]:
+        """get_listings 의 비동기 버전 (받은 페이지를 모아 한 번에 파싱)"""
+        articles, error = await self.aget_article_pages(transport, complex_id, max_pages, bypass_cache)
+        return self._listings_result(articles, complex_name, error)
+    
+    @staticmethod
+    def _listings_result(articles: List[dict], complex_name: str, error: str) -> Tuple[bool, pd.DataFrame, str]:
+        """받은 원본 전체를 한 번에 파싱, 중간 페이지에서 실패했으면 받은 매물까지와 에러를 함께 반환"""
+        parsed, malformed = parse_article_batch(articles, complex_name)
+        messages = [message for message in (format_parse_warning(malformed), error) if message]
+        return not error or not parsed.empty, parsed, ", ".join(messages)
+
+
+# ============================================================
+# 동시 조회 스케줄러
+# ============================================================
+
+def fetch_listings_concurrently(
+    api: NaverLandAPI,
+    complexes: List[Tuple[str, str]],
+    max_workers: int = 4,
+    bypass_cache: bool = False,
+    fetch: Optional[Callable[..., Tuple[bool, pd.DataFrame, str]]] = None,
+) -> Iterator[Tuple[str, bool, pd.DataFrame, str]]:
+    """여러 단지의 매물을 워커 풀에서 동시에 조회
+
+    요청 속도는 api.limiter(토큰 버킷)가 전역으로 제한하고,
+    완료되는 순서대로 (단지명, 성공여부, 매물, 에러) 를 yield 한다.
+    fetch 를 지정하면 api.get_listings 대신 fetch(cid, name, bypass_cache=...) 를 호출한다.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    
+    fetch = fetch or api.get_listings
+    if not complexes:
+        return
+    
+    workers = max(1, min(max_workers, len(complexes)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="naver-fetch") as pool:
+        futures = {
+            pool.submit(fetch, cid, name, bypass_cache=bypass_cache): name
+            for name, cid in complexes
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                success, listings, error = future.result()
+            except Exception as e:
+                success, listings, error = False, None, f"조회 실패 ({e})"
+            yield name, success, listings, error
+
+
+async def afetch_listings(
+    api: NaverLandAPI,
+    transport: AsyncHTTPTransport,
+    complexes: List[Tuple[str, str]],
+    max_concurrency: int = 4,
+    bypass_cache: bool = False,
+    fetch: Optional[Callable[..., Any]] = None,
+) -> AsyncIterator[Tuple[str, bool, pd.DataFrame, str]]:
+    """fetch_listings_concurrently 의 asyncio 버전 (스레드 대신 코루틴, 연결은 transport 의 풀을 공유)
+
+    fetch 를 지정하면 api.aget_listings 대신 await fetch(transport, cid, name, bypass_cache=...) 를 호출한다.
+    """
+    import asyncio
+    
+    fetch = fetch or api.aget_listings
+    slots = asyncio.Semaphore(max(1, max_concurrency))
+    
+    async def run(name: str, cid: str):
+        async with slots:
+            try:
+                success, listings, error = await fetch(transport, cid, name, bypass_cache=bypass_cache)
+            except Exception as e:
+                success, listings, error = False, None, f"조회 실패 ({e})"
+        return name, success, listings, error
+    
+    tasks = [asyncio.ensure_future(run(name, cid)) for name, cid in complexes]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def fetch_listings_async(
+    api: NaverLandAPI,
+    complexes: List[Tuple[str, str]],
+    max_concurrency: int = 4,
+    bypass_cache: bool = False,
+    pool_size: Optional[int] = None,
+    timeout: float = 15.0,
+    fetch: Optional[Callable[..., Any]] = None,
+) -> Iterator[Tuple[str, bool, pd.DataFrame, str]]:
+    """fetch_listings_concurrently 와 같은 형식으로, 전용 이벤트 루프의 비동기 전송을 사용해 조회
+
+    pool_size(기본: limiter.max_per_host) 개의 keep-alive 연결을 모든 단지가 공유하고,
+    timeout 은 요청 하나의 마감 시간(초)이다. 속도 제한·재시도·캐시는 api 설정을 그대로 따른다.
+    """
+    import asyncio
+    
+    if not complexes:
+        return
+    if pool_size is None:
+        pool_size = api.limiter.max_per_host if api.limiter is not None else max_concurrency
+    
+    loop = asyncio.new_event_loop()
+    transport = AsyncHTTPTransport(pool_size, timeout, headers=dict(api.session.headers))
+    results = afetch_listings(api, transport, complexes, max_concurrency, bypass_cache, fetch)
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(results.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(results.aclose())
+        loop.run_until_complete(transport.aclose())
+        loop.close()
+
+
+# ============================================================
+# 지역 전체 수집 (체크포인트 · 중단 후 재개)
+# ============================================================
+CRAWL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "crawl.sqlite3")
+
+
+class CrawlResult(NamedTuple):
+    complex_id: str
+    name: str
+    success: bool
+    count: int
+    error: str
+
+
+class RegionCrawler:
+    """구/동 단위 전체 단지 수집
+
+    지역 코드(cortarNo)의 하위 동과 단지 목록을 받아 작업 큐를 만들고,
+    단지마다 공유 클라이언트로 매물을 받아 ListingStore에 바로 저장한다.
+    동 목록 조회와 단지별 완료 여부를 SQLite에 기록하므로 중단되거나
+    차단으로 멈춘 수집은 다음 실행에서 남은 단지부터 이어서 진행한다.
+    """
+    
+    def __init__(self, api: NaverLandAPI, store: ListingStore, path: str = CRAWL_PATH):
+        self.api = api
+        self.store = store
+        self.path = path
+        self._lock = threading.Lock()
+        
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS regions (
+                    cortar_no TEXT PRIMARY KEY,
+                    parent TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    enumerated_at REAL
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    region TEXT NOT NULL,
+                    complex_id TEXT NOT NULL,
+                    complex_name TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    error TEXT NOT NULL DEFAULT '',
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (region, complex_id)
+                )
+            """)
+    
+    def enumerate(self, region: str) -> Tuple[bool, str]:
+        """지역의 단지를 작업 큐에 등록 (이미 목록을 받은 동은 건너뜀)"""
+        with self._lock:
+            known = dict(self._conn.execute(
+                "SELECT cortar_no, enumerated_at FROM regions WHERE parent = ?", (region,)
+            ).fetchall())
+        
+        if not known:
+            success, subregions, error = self.api.list_regions(region)
+            if not success:
+                return False, error
+            # 하위 지역이 없으면 동 단위 코드로 보고 그대로 단지 목록을 받는다
+            subregions = subregions or [(region, region)]
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO regions VALUES (?, ?, ?, NULL)",
+                    [(code, region, name) for code, name in subregions]
+                )
+            known = {code: None for code, _ in subregions}
+        
+        for code, enumerated_at in known.items():
+            if enumerated_at is not None:
+                continue
+            if self.api.is_blocked:
+                return False, "차단 감지 - 단지 목록 수집 중단"
+            success, complexes, error = self.api.list_region_complexes(code)
+            if not success:
+                return False, error
+            now = time.time()
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO jobs (region, complex_id, complex_name, updated_at) VALUES (?, ?, ?, ?)",
+                    [(region, cid, name, now) for name, cid in complexes]
+                )
+                self._conn.execute("UPDATE regions SET enumerated_at = ? WHERE cortar_no = ?", (now, code))
+        return True, ""
+    
+    def progress(self, region: str) -> Dict[str, int]:
+        """{상태: 단지 수} (pending / done / failed)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM jobs WHERE region = ? GROUP BY status", (region,)
+            ).fetchall()
+        return dict(rows)
+    
+    def remaining(self, region: str, max_attempts: int = 3) -> int:
+        """다음 run 에서 수집할 단지 수 (차단으로 남은 단지 + 재시도 횟수가 남은 실패 단지)"""
+        return len(self._pending(region, max_attempts))
+    
+    def restart(self, region: str):
+        """완료된 단지까지 모두 다시 수집하도록 큐 초기화 (단지 목록도 다시 받음)"""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE jobs SET status = 'pending', attempts = 0, error = '' WHERE region = ?", (region,))
+            self._conn.execute("UPDATE regions SET enumerated_at = NULL WHERE parent = ?", (region,))
+    
+    def _pending(self, region: str, max_attempts: int) -> List[Tuple[str, str]]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT complex_name, complex_id FROM jobs "
+                "WHERE region = ? AND status != 'done' AND attempts < ? ORDER BY attempts, complex_id",
+                (region, max_attempts)
+            ).fetchall()
+    
+    def _mark(self, region: str, complex_id: str, status: str, error: str = "", attempt: bool = True):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + ?, error = ?, updated_at = ? "
+                "WHERE region = ? AND complex_id = ?",
+                (status, int(attempt), error, time.time(), region, complex_id)
+            )
+    
+    def _fetch_complete(self, complex_id: str, complex_name: str,
+                        bypass_cache: bool = False) -> Tuple[bool, pd.DataFrame, str]:
+        """모든 페이지를 받았을 때만 성공 (일부 페이지만 받은 단지는 다음 실행에서 다시 수집)"""
+        articles = []
+        for success, page_articles, error in self.api.iter_article_pages(complex_id, bypass_cache=bypass_cache):
+            if not success:
+                return False, parse_article_batch([], complex_name)[0], error
+            articles.extend(page_articles)
+        return True, parse_article_batch(articles, complex_name)[0], ""
+    
+    def run(self, region: str, max_workers: int = 3, max_attempts: int = 3,
+            batch_size: int = 20) -> Iterator[CrawlResult]:
+        """남은 단지를 수집하며 단지마다 CrawlResult 를 yield
+
+        batch_size 단지마다 차단 여부를 확인해, 차단되면 남은 단지를 큐에 둔 채 멈춘다.
+        """
+        pending = self._pending(region, max_attempts)
+        names = {cid: name for name, cid in pending}
+        # 같은 이름의 단지가 있을 수 있어 단지ID를 작업 이름으로 사용
+        jobs = [(cid, cid) for _, cid in pending]
+        
+        for start in range(0, len(jobs), batch_size):
+            if self.api.is_blocked:
+                return
+            batch = jobs[start:start + batch_size]
+            results = fetch_listings_concurrently(
+                self.api, batch, max_workers=max_workers, bypass_cache=True,
+                fetch=lambda cid, _, bypass_cache: self._fetch_complete(cid, names[cid], bypass_cache)
+            )
+            for cid, success, listings, error in results:
+                if success:
+                    self.store.save(cid, names[cid], listings)
+                    self._mark(region, cid, "done")
+                elif self.api.is_blocked:
+                    # 차단으로 실패한 단지는 재시도 횟수를 쓰지 않고 큐에 남김
+                    self._mark(region, cid, "pending", error, attempt=False)
+                else:
+                    self._mark(region, cid, "failed", error)
+                yield CrawlResult(cid, names[cid], success, len(listings) if success else 0, error)
+
+
+# ============================================================
+# 보관된 원본으로 매물 재구성
+# ============================================================
+REPLAY_SLACK = 60.0
+
+
+def replay_archive(archive: ResponseArchive, store: ListingStore,
+                   since: Optional[str] = None, until: Optional[str] = None,
+                   complex_ids: Optional[List[str]] = None,
+                   names: Optional[Dict[str, str]] = None) -> Iterator[CrawlResult]:
+    """보관된 단지별 최근 조회분을 다시 파싱해 저장소에 저장 (요청 없이 디스크 속도로 재구성)
+
+    단지명은 names → 저장소 스냅샷 → 단지ID 순으로 정하고,
+    저장소에 보관본보다 나중에 받은 스냅샷이 있는 단지는 덮어쓰지 않는다
+    (같은 조회를 저장한 스냅샷은 마지막 페이지 직후에 저장되므로 REPLAY_SLACK 초까지는 같은 조회로 본다).
+    """
+    stored = store.snapshots()
+    for snapshot in archive.snapshots(since, until, complex_ids):
+        complex_id = snapshot.complex_id
+        name = (names or {}).get(complex_id) or stored.get(complex_id, (complex_id,))[0]
+        if complex_id in stored and stored[complex_id][1] > snapshot.finished_at + REPLAY_SLACK:
+            yield CrawlResult(complex_id, name, False, 0, "저장소 스냅샷이 더 최근")
+            continue
+        parsed, malformed = parse_article_batch(snapshot.articles, name)
+        store.save(complex_id, name, parsed, fetched_at=snapshot.fetched_at)
+        yield CrawlResult(complex_id, name, True, len(parsed), format_parse_warning(malformed))
+
+
+# ============================================================
+# 증분 새로고침 (articleNo 기준 변경 감지)
+# ============================================================
+
+class ListingDelta(NamedTuple):
+    """단지 하나의 이전 조회 대비 변경 내역 (매물번호 목록)"""
+    new: List[str]
+    changed: List[str]
+    removed: List[str]
+    
+    @property
+    def summary(self) -> str:
+        return f"신규 {len(self.new)} · 변경 {len(self.changed)} · 삭제 {len(self.removed)}"
+
+
+class ListingTracker:
+    """단지별 마지막 매물 상태를 보관하고 변경된 매물만 다시 파싱
+
+    매물번호(articleNo)마다 가격·월세·확인일·태그 원본 값을 기억해 두었다가,
+    새로 받은 목록과 비교해 신규/변경/삭제로 분류한다.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fingerprints: Dict[str, Dict[str, Tuple]] = {}  # {단지ID: {매물번호: (가격, 월세, 확인일, 태그)}}
+        self._frames: Dict[str, pd.DataFrame] = {}           # {단지ID: 파싱된 매물}
+        self.deltas: Dict[str, ListingDelta] = {}            # {단지ID: 마지막 변경 내역}
+    
+    @staticmethod
+    def _fingerprint(art: dict) -> Tuple:
+        return (art.get("dealOrWarrantPrc"), art.get("rentPrc"), art.get("articleConfirmYmd"),
+                tuple(art.get("tagList") or ()))
+    
+    def frame(self, complex_id: str) -> Optional[pd.DataFrame]:
+        with self._lock:
+            return self._frames.get(complex_id)
+    
+    def refresh(self, api: NaverLandAPI, complex_id: str, complex_name: str,
+                bypass_cache: bool = False) -> Tuple[bool, pd.DataFrame, str]:
+        """전체 페이지를 받아 이전 상태와 비교하고 병합된 매물 반환 (get_listings와 같은 형식)
+
+        조회가 중간에 실패하면 상태를 바꾸지 않고 이전 매물을 그대로 반환한다.
+        """
+        articles = []
+        for success, page_articles, error in api.iter_article_pages(complex_id, bypass_cache=bypass_cache):
+            if not success:
+                return self._failed(complex_id, complex_name, error)
+            articles.extend(page_articles)
+        return self._merge(complex_id, complex_name, articles)
+    
+    async def arefresh(self, api: NaverLandAPI, transport: AsyncHTTPTransport, complex_id: str, complex_name: str,
+                       bypass_cache: bool = False) -> Tuple[bool, pd.DataFrame, str]:
+        """refresh 의 비동기 버전 (afetch_listings 의 fetch 로 사용)"""
+        articles, error = await api.aget_article_pages(transport, complex_id, bypass_cache=bypass_cache)
+        if error:
+            return self._failed(complex_id, complex_name, error)
+        return self._merge(complex_id, complex_name, articles)
+    
+    def _failed(self, complex_id: str, complex_name: str, error: str) -> Tuple[bool, pd.DataFrame, str]:
+        previous = self.frame(complex_id)
+        if previous is None:
+            return False, parse_article_batch([], complex_name)[0], error
+        return False, previous, f"{error} (이전 조회 결과 표시)"
+    
+    def _merge(self, complex_id: str, complex_name: str, articles: List[dict]) -> Tuple[bool, pd.DataFrame, str]:
+        current = {article_key(art): art for art in articles}
+        fingerprints = {key: self._fingerprint(art) for key, art in current.items()}
+        
+        with self._lock:
+            first_fetch = complex_id not in self._fingerprints
+            prev_fingerprints = self._fingerprints.get(complex_id, {})
+            prev_frame = self._frames.get(complex_id)
+        
+        new = [key for key in fingerprints if key not in prev_fingerprints]
+        changed = [key for key, fp in fingerprints.items()
+                   if key in prev_fingerprints and prev_fingerprints[key] != fp]
+        removed = [key for key in prev_fingerprints if key not in fingerprints]
+        
+        # 신규/변경 매물만 파싱하고 나머지는 이전 파싱 결과 재사용
+        reparse = new + changed
+        parsed, malformed = parse_article_batch([current[key] for key in reparse], complex_name)
+        frames = [parsed]
+        if prev_frame is not None:
+            keep = ~prev_frame["매물번호"].isin(set(changed) | set(removed))
+            frames.insert(0, prev_frame[keep])
+        merged = concat_listings(frames)
+        
+        with self._lock:
+            self._fingerprints[complex_id] = fingerprints
+            self._frames[complex_id] = merged
+            # 첫 조회는 전부 신규라 변경 내역으로 기록하지 않음
+            if first_fetch:
+                self.deltas.pop(complex_id, None)
+            else:
+                self.deltas[complex_id] = ListingDelta(new, changed, removed)
+        
+        return True, merged, format_parse_warning(malformed)
+    
+    def changed_rows(self, complex_ids: List[str]) -> pd.DataFrame:
+        """마지막 새로고침에서 신규/변경된 매물"""
+        import numpy as np
+        import pandas as pd
+        
+        frames = []
+        with self._lock:
+            for cid in complex_ids:
+                delta = self.deltas.get(cid)
+                frame = self._frames.get(cid)
+                if delta is None or frame is None:
+                    continue
+                keys = set(delta.new) | set(delta.changed)
+                rows = frame[frame["매물번호"].isin(keys)].copy()
+                rows.insert(0, "변경", np.where(rows["매물번호"].isin(set(delta.new)), "신규", "변경"))
+                frames.append(rows)
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+# ============================================================
+# 중복 매물 묶기 (여러 중개사가 올린 같은 호실)
+# ============================================================
+# 이 값이 모두 같고 가격 차이가 DEDUP_TOLERANCE 이내면 같은 호실로 본다
+DEDUP_KEYS = ["단지명", "동", "층", "면적", "방향", "거래유형", "월세"]
+DEDUP_TOLERANCE = 0.02  # 묶음의 최저 가격 대비 허용 차이 (비율)
+
+
+def cluster_duplicates(df: pd.DataFrame, tolerance: float = DEDUP_TOLERANCE) -> np.ndarray:
+    """같은 호실로 보이는 매물끼리 같은 묶음 번호 (행 순서대로, 0부터)
+
+    DEDUP_KEYS 와 가격으로 한 번 정렬한 뒤, 키가 바뀌거나 가격이 묶음의 첫(최저) 가격보다
+    tolerance 넘게 비싼 곳에서 새 묶음을 시작한다 (쌍별 비교 없이 O(n log n)).
+    """
+    import numpy as np
+    
+    if len(df) == 0:
+        return np.zeros(0, dtype=np.int64)
+    keys = [
+        df[col].to_numpy(np.int64) if col in PRICE_COLUMNS
+        else df[col].astype("category").cat.codes.to_numpy()
+        for col in DEDUP_KEYS
+    ]
+    price = df["가격"].to_numpy(np.int64)
+    order = np.lexsort([price] + keys[::-1])
+    
+    boundary = np.zeros(len(df), dtype=bool)
+    boundary[0] = True
+    for key in keys:
+        ordered = key[order]
+        boundary[1:] |= ordered[1:] != ordered[:-1]
+    ordered_price = price[order]
+    boundary[1:] |= ordered_price[1:] - ordered_price[:-1] > tolerance * ordered_price[:-1]
+    
+    # 이웃끼리만 비교하면 조금씩 오르는 가격이 끝없이 이어지므로,
+    # 전체 폭이 tolerance 를 넘는 구간만 최저 가격 기준으로 다시 나눔 (대부분 구간은 그대로)
+    starts = np.flatnonzero(boundary)
+    ends = np.r_[starts[1:], len(df)]
+    low, high = ordered_price[starts], ordered_price[ends - 1]
+    wide = high - low > tolerance * low
+    for start, end in zip(starts[wide], ends[wide]):
+        anchor = start
+        while True:
+            limit = ordered_price[anchor] + tolerance * ordered_price[anchor]
+            anchor += int(np.searchsorted(ordered_price[anchor:end], limit, side="right"))
+            if anchor >= end:
+                break
+            boundary[anchor] = True
+    
+    clusters = np.empty(len(df), dtype=np.int64)
+    clusters[order] = np.cumsum(boundary) - 1
+    return clusters
+
+
+def dedupe_listings(df: pd.DataFrame, tolerance: float = DEDUP_TOLERANCE) -> pd.DataFrame:
+    """중복 매물을 묶음마다 대표 1건(가장 싼 매물, 같으면 최근 확인)으로 줄이고 '중개 수' 컬럼 추가
+
+    이미 묶은 DataFrame 을 다시 넣으면 기존 중개 수를 합산한다.
+    """
+    import numpy as np
+    
+    clusters = cluster_duplicates(df, tolerance)
+    if len(df) == 0:
+        return df.assign(**{"중개 수": np.zeros(0, dtype=np.int16)})
+    weights = df["중개 수"].to_numpy() if "중개 수" in df.columns else None
+    counts = np.bincount(clusters, weights=weights).astype(np.int16)
+    
+    confirmed = df["확인일"].to_numpy("datetime64[D]")
+    recency = np.where(np.isnat(confirmed), 0, confirmed.astype(np.int64))
+    order = np.lexsort([-recency, df["가격"].to_numpy(np.int64), clusters])
+    ordered = clusters[order]
+    first = order[np.r_[True, ordered[1:] != ordered[:-1]]]
+    first.sort()
+    return df.iloc[first].assign(**{"중개 수": counts[clusters[first]]}).reset_index(drop=True)
+
+
+# ============================================================
+# 유틸리티 함수
+# ============================================================
+
+def format_price(val: int) -> str:
+    """가격 포맷팅"""
+    if val == 0:
+        return "-"
+    uk = val // 10000
+    man = val % 10000
+    if uk > 0 and man > 0:
+        return f"{uk}억 {man:,}"
+    elif uk > 0:
+        return f"{uk}억"
+    return f"{man:,}만원"
+
+
+def calc_converted(price: int, rent: int, rate: int) -> int:
+    """환산가 계산"""
+    if rent > 0:
+        return int(price + (rent / rate) * 10000)
+    return price
+
+
+@lru_cache(maxsize=1)
+def _thousands_labels() -> np.ndarray:
+    """0~9999 천단위 구분 문자열 (만 단위 이하 포맷팅용 조회 테이블, 첫 사용 시 생성)"""
+    import numpy as np
+    
+    return np.array([f"{n:,}" for n in range(10000)], dtype=object)
+
+
+def _format_thousands(values: np.ndarray) -> np.ndarray:
+    """정수 배열을 천단위 구분 문자열 배열로 변환 (f"{n:,}" 와 동일)"""
+    import numpy as np
+    
+    values = np.asarray(values, dtype=np.int64)
+    small = (values >= 0) & (values < 10000)
+    out = np.empty(len(values), dtype=object)
+    out[small] = _thousands_labels()[values[small]]
+    if not small.all():
+        out[~small] = [f"{n:,}" for n in values[~small].tolist()]
+    return out
+
+
+def format_price_series(values) -> pd.Series:
+    """가격 포맷팅 (Series/배열 전체를 한 번에 처리, format_price와 같은 결과)"""
+    import numpy as np
+    import pandas as pd
+    
+    index = values.index if isinstance(values, pd.Series) else None
+    vals = np.asarray(values, dtype=np.int64)
+    uk = vals // 10000
+    man = vals % 10000
+    
+    uk_txt = uk.astype(str).astype(object) + "억"
+    man_txt = _format_thousands(man)
+    
+    out = np.where(man > 0, uk_txt + " " + man_txt, uk_txt)
+    out = np.where(uk > 0, out, man_txt + "만원")
+    out = np.where(vals == 0, "-", out)
+    return pd.Series(out, index=index, dtype=object)
+
+
+def format_listing_price_series(price, rent) -> pd.Series:
+    """가격 + 월세 표시 문자열 (예: "3억 / 150")"""
+    import numpy as np
+    
+    txt = format_price_series(price)
+    rent_vals = np.asarray(rent, dtype=np.int64)
+    has_rent = rent_vals > 0
+    if has_rent.any():
+        txt = txt.copy()
+        txt[has_rent] = txt[has_rent] + " / " + _format_thousands(rent_vals[has_rent])
+    return txt
+
+
+def calc_converted_series(price, rent, rate: int) -> pd.Series:
+    """환산가 계산 (Series/배열 전체를 한 번에 처리, calc_converted와 같은 결과)"""
+    import numpy as np
+    import pandas as pd
+    
+    index = price.index if isinstance(price, pd.Series) else None
+    price_vals = np.asarray(price, dtype=np.int64)
+    rent_vals = np.asarray(rent, dtype=np.int64)
+    converted = (price_vals + (rent_vals / rate) * 10000).astype(np.int64)
+    return pd.Series(np.where(rent_vals > 0, converted, price_vals), index=index)
+
+
+def calc_unit_prices(converted, supply, exclusive) -> Tuple[np.ndarray, np.ndarray]:
+    """(평당가, ㎡당가) 만원, 면적을 모르면 NaN
+
+    평당가는 공급면적 기준(없으면 전용면적), ㎡당가는 전용면적 기준이다.
+    """
+    import numpy as np
+    
+    converted = np.asarray(converted, dtype=np.float64)
+    supply = np.asarray(supply, dtype=np.float64)
+    exclusive = np.asarray(exclusive, dtype=np.float64)
+    pyeong_area = np.where(np.isnan(supply), exclusive, supply) / PYEONG_M2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        per_pyeong = np.where(pyeong_area > 0, converted / pyeong_area, np.nan)
+        per_m2 = np.where(exclusive > 0, converted / exclusive, np.nan)
+    return per_pyeong, per_m2
+
+
+def format_unit_price_series(values) -> pd.Series:
+    """평당가·㎡당가 표시 문자열 (만원 단위 반올림, 값이 없으면 "-")"""
+    import numpy as np
+    import pandas as pd
+    
+    index = values.index if isinstance(values, pd.Series) else None
+    rounded = np.nan_to_num(np.asarray(values, dtype=np.float64)).round()
+    return format_price_series(pd.Series(rounded, index=index))
+
+
+def build_cards_html(rows: pd.DataFrame) -> str:
+    """매물 카드 여러 개를 하나의 HTML 문자열로 생성"""
+    import pandas as pd
+    
+    price_txt = format_listing_price_series(rows["가격"], rows["월세"]).tolist()
+    converted_txt = format_price_series(rows["환산가"]).tolist()
+    confirmed_txt = format_confirm_dates(rows["확인일"]).tolist()
+    if "평당가" in rows.columns:
+        unit_txt = [f" · 평당 {v}" if v != "-" else "" for v in format_unit_price_series(rows["평당가"]).tolist()]
+    else:
+        unit_txt = [""] * len(rows)
+    if "중개 수" in rows.columns:
+        agents_txt = [
+            f'<span class="detail-item">👥 중개 {n}곳</span>' if n > 1 else "" for n in rows["중개 수"].tolist()
+        ]
+    else:
+        agents_txt = [""] * len(rows)
+    
+    cards = []
+    for i, row in enumerate(rows[["거래유형", "단지명", "동", "면적", "층", "방향", "설명"]].itertuples(index=False)):
+        trade, name, dong, area, floor, direction, desc = (
+            "" if pd.isna(v) else html.escape(str(v)) for v in row
+        )
+        confirmed = confirmed_txt[i]
+        trade_class = "trade-sale" if trade == "매매" else ("trade-jeonse" if trade == "전세" else "trade-rent")
+        # 들여쓰기/빈 줄이 있으면 마크다운 코드 블록으로 해석되므로 한 줄씩 이어붙임
+        cards.append(
+            '<div class="listing-card">'
+            '<div style="display: flex; justify-content: space-between; align-items: flex-start; flex-wrap: wrap; gap: 10px;">'
+            f'<div><span class="trade-tag {trade_class}">{trade}</span>'
+            f'<span style="font-weight: 600; margin-left: 8px;">{name}</span>'
+            f'<div class="price-text">{price_txt[i]}</div></div>'
+            f'<div><span class="converted-price">환산 {converted_txt[i]}{unit_txt[i]}</span></div>'
+            '</div>'
+            '<div class="detail-row">'
+            f'<span class="detail-item">🏢 {dong}</span>'
+            f'<span class="detail-item">📐 {area}</span>'
+            f'<span class="detail-item">⬆️ {floor}</span>'
+            f'<span class="detail-item">🧭 {direction}</span>'
+            f'<span class="detail-item" style="color: #94a3b8;">📅 {confirmed}</span>'
+            f'{agents_txt[i]}'
+            '</div>'
+            f'<div class="desc-box">{desc if desc else "설명 없음"}</div>'
+            '</div>'
+        )
+    return "\n".join(cards)
+
+
+def generate_demo_data(names: List[str]) -> pd.DataFrame:
+    """데모 데이터 생성"""
+    import pandas as pd
+    
+    if not names:
+        names = ["샘플단지"]
+    
+    data = []
+    for _ in range(30):
+        name = random.choice(names)
+        trade = random.choices(["매매", "전세", "월세"], weights=[0.4, 0.4, 0.2])[0]
+        area = random.choice(["59㎡", "74㎡", "84㎡", "102㎡"])
+        area_num = int(area.replace("㎡", ""))
+        
+        if trade == "매매":
+            price = random.randint(140000 + area_num * 1500, 180000 + area_num * 2000)
+            rent = 0
+        elif trade == "전세":
+            price = random.randint(70000 + area_num * 800, 100000 + area_num * 1000)
+            rent = 0
+        else:
+            price = random.randint(10000, 50000)
+            rent = random.randint(80, 300)
+        
+        data.append({
+            "단지명": name,
+            "거래유형": trade,
+            "가격": price,
+            "월세": rent,
+            "동": f"{random.randint(101, 115)}동",
+            "층": f"{random.choice(['저','중','고'])}/{random.randint(20,35)}",
+            "면적": area,
+            "방향": random.choice(["남향", "남동향", "동향"]),
+            "설명": random.choice(["올수리", "로얄층", "급매", "깨끗함", "역세권"]),
+            "태그": random.choice(["", "급매", "대단지", "역세권", "급매,역세권"]),
+            "확인일": datetime.now().strftime("%Y-%m-%d"),
+            "매물번호": f"demo{len(data)}",
+            "공급면적": round(area_num * 1.33, 2),
+            "전용면적": area_num,
+        })
+    
+    return compact_listings(pd.DataFrame(data))
+
+
+# ============================================================
+# 필터 색인 (필터·정렬 결과 캐시)
+# ============================================================
+FILTER_COLUMNS = ("거래유형", "단지명", "면적")
+
+
+class ListingFilterIndex:
+    """불러온 매물에 대한 필터·정렬 엔진
+
+    필터 컬럼마다 범주 코드 배열을, 정렬 기준마다 정렬 순서를 한 번만 만들어 두고
+    (필터, 범위, 정렬, 환산 비율) 조합별 결과 행 번호를 LRU로 보관한다. 이전 결과를 더 좁히는
+    조건은 그 결과 행만 다시 검사한다. DataFrame 은 마지막 결과 하나만 보관해 같은 조건의
+    리런은 그대로 돌려주고, 다른 조합은 행 번호로 다시 만든다 (조합마다 전체 복사본을 두지 않음).
+    환산 비율별 계산 값도 최근 max_rates 개만 보관한다.
+    """
+    
+    # 환산 비율에 따라 값이 바뀌는 컬럼
+    RATE_COLUMNS = ("환산가", "평당가", "㎡당가")
+    
+    def __init__(self, df: pd.DataFrame, max_results: int = 16, max_rates: int = 4):
+        import numpy as np
+        import pandas as pd
+        
+        self.df = df
+        self.max_results = max_results
+        self.max_rates = max_rates
+        self._lock = threading.RLock()
+        self._codes: Dict[str, np.ndarray] = {}
+        self._lookup: Dict[str, Dict[Any, int]] = {}
+        self._options: Dict[str, List[Any]] = {}
+        for col in FILTER_COLUMNS:
+            values = pd.Categorical(df[col])
+            # 0 은 결측값, 범주 코드는 1부터
+            codes = values.codes.astype(np.int32) + 1
+            self._codes[col] = codes
+            self._lookup[col] = {value: code + 1 for code, value in enumerate(values.categories)}
+            first_seen = pd.unique(codes[codes > 0])
+            self._options[col] = [values.categories[code - 1] for code in first_seen]
+        self._static = {
+            "가격": df["가격"].to_numpy(dtype=np.int64),
+            "월세": df["월세"].to_numpy(dtype=np.int64),
+            "공급면적": df["공급면적"].to_numpy(dtype=np.float64),
+            "전용면적": df["전용면적"].to_numpy(dtype=np.float64),
+        }
+        self._by_rate: OrderedDict = OrderedDict()
+        self._orders: Dict[Tuple[str, Optional[int], bool], np.ndarray] = {}
+        self._results: OrderedDict = OrderedDict()
+        self._last: Optional[Tuple[Tuple, pd.DataFrame]] = None
+    
+    def options(self, col: str) -> List[Any]:
+        """필터 선택지 (처음 나온 순서)"""
+        return list(self._options[col])
+    
+    def bounds(self, col: str, rate: int = 40) -> Optional[Tuple[float, float]]:
+        """범위 필터용 (최솟값, 최댓값), 값이 없으면 None"""
+        import numpy as np
+        
+        values = self.values(col, rate)
+        values = values[~np.isnan(values)] if values.dtype.kind == "f" else values
+        if not len(values):
+            return None
+        return float(values.min()), float(values.max())
+    
+    def converted(self, rate: int) -> np.ndarray:
+        return self.values("환산가", rate)
+    
+    def values(self, col: str, rate: int = 40) -> np.ndarray:
+        """정렬·범위 필터 대상 컬럼 값 (환산가·평당가·㎡당가는 비율별로 한 번만 계산)"""
+        if col not in self.RATE_COLUMNS:
+            return self._static[col]
+        with self._lock:
+            computed = self._by_rate.get(rate)
+            if computed is not None:
+                self._by_rate.move_to_end(rate)
+                return computed[col]
+            converted = calc_converted_series(self._static["가격"], self._static["월세"], rate).to_numpy()
+            per_pyeong, per_m2 = calc_unit_prices(converted, self._static["공급면적"], self._static["전용면적"])
+            computed = {"환산가": converted, "평당가": per_pyeong, "㎡당가": per_m2}
+            self._by_rate[rate] = computed
+            while len(self._by_rate) > self.max_rates:
+                evicted, _ = self._by_rate.popitem(last=False)
+                # 버린 비율의 정렬 순서도 함께 정리
+                for key in [key for key in self._orders if key[1] == evicted]:
+                    del self._orders[key]
+            return computed[col]
+    
+    def _order(self, sort_col: str, rate: int, ascending: bool) -> np.ndarray:
+        """전체 행의 정렬 순서 (같은 값은 원래 순서 유지, 값이 없으면 마지막)"""
+        import numpy as np
+        
+        key = (sort_col, rate if sort_col in self.RATE_COLUMNS else None, ascending)
+        order = self._orders.get(key)
+        if order is None:
+            values = self.values(sort_col, rate)
+            order = np.argsort(values if ascending else -values, kind="stable")
+            self._orders[key] = order
+        return order
+    
+    def _mask(self, rows: np.ndarray, selections: Tuple[frozenset, ...],
+              ranges: Tuple[Tuple[str, float, float], ...], rate: int) -> np.ndarray:
+        """rows 중 선택·범위 조건을 모두 만족하는 행의 bool 배열"""
+        import numpy as np
+        
+        keep = np.ones(len(rows), dtype=bool)
+        for col, selected in zip(FILTER_COLUMNS, selections):
+            lookup = self._lookup[col]
+            table = np.zeros(len(lookup) + 1, dtype=bool)
+            table[[lookup[v] for v in selected if v in lookup]] = True
+            if table[1:].all():
+                continue
+            keep &= table[self._codes[col][rows]]
+        for col, low, high in ranges:
+            values = self.values(col, rate)[rows]
+            # NaN 은 비교 결과가 False 라 범위 필터가 있으면 제외됨
+            keep &= (values >= low) & (values <= high)
+        return keep
+    
+    @staticmethod
+    def _within(child: Tuple, parent: Tuple) -> bool:
+        """child 범위 조건이 parent 범위 조건보다 좁거나 같은지"""
+        child_ranges = {col: (low, high) for col, low, high in child}
+        for col, low, high in parent:
+            if col not in child_ranges:
+                return False
+            child_low, child_high = child_ranges[col]
+            if child_low < low or child_high > high:
+                return False
+        return True
+    
+    def select(self, filters: Dict[str, List[Any]], sort_col: str = "환산가",
+               ascending: bool = True, rate: int = 40,
+               ranges: Optional[Dict[str, Tuple[float, float]]] = None) -> pd.DataFrame:
+        """필터·정렬된 매물 (환산가·평당가·㎡당가 컬럼 포함, 반환된 DataFrame은 수정하지 말 것)
+
+        ranges: {컬럼: (최소, 최대)}, 전용면적·공급면적·가격·환산가·평당가·㎡당가 사용 가능
+        """
+        selections = tuple(frozenset(filters.get(col, self._options[col])) for col in FILTER_COLUMNS)
+        range_key = tuple(sorted((col, float(low), float(high)) for col, (low, high) in (ranges or {}).items()))
+        sort_key = (sort_col, ascending, rate if sort_col in self.RATE_COLUMNS else None)
+        key = (selections, range_key, sort_key, rate)
+        
+        with self._lock:
+            if self._last is not None and self._last[0] == key:
+                return self._last[1]
+            
+            rows = self._results.get(key)
+            if rows is not None:
+                self._results.move_to_end(key)
+            else:
+                # 같은 정렬·비율로 더 넓은 조건의 결과가 있으면 그 행만 다시 검사
+                parent = None
+                for (parent_selections, parent_ranges, parent_sort, parent_rate), parent_rows in self._results.items():
+                    if (parent_sort == sort_key and parent_rate == rate
+                            and all(s <= p for s, p in zip(selections, parent_selections))
+                            and self._within(range_key, parent_ranges)):
+                        if parent is None or len(parent_rows) < len(parent):
+                            parent = parent_rows
+                if parent is None:
+                    parent = self._order(sort_col, rate, ascending)
+                rows = parent[self._mask(parent, selections, range_key, rate)]
+                self._results[key] = rows
+                while len(self._results) > self.max_results:
+                    self._results.popitem(last=False)
+            
+            frame = self.df.iloc[rows].copy()
+            for col in self.RATE_COLUMNS:
+                frame[col] = self.values(col, rate)[rows]
+            self._last = (key, frame)
+            return frame
+
+
+def unit_price_summary(df: pd.DataFrame) -> pd.DataFrame:
+    """단지·거래유형별 단가 요약 (환산가 기준, 만원)"""
+    summary = df.groupby(["단지명", "거래유형"], observed=True).agg(**{
+        "매물 수": ("가격", "size"),
+        "전용면적 중앙값": ("전용면적", "median"),
+        "평당가 중앙값": ("평당가", "median"),
+        "평당가 최저": ("평당가", "min"),
+        "㎡당가 중앙값": ("㎡당가", "median"),
+    }).reset_index()
+    return summary.sort_values(["거래유형", "평당가 중앙값"], ignore_index=True)
+
+
+# ============================================================
+# 시장 분석 (단지 × 면적대 × 거래유형)
+# ============================================================
+# 전용면적 구간 (㎡, 왼쪽 포함)
+AREA_BANDS = [0, 40, 60, 85, 102, 135, float("inf")]
+AREA_BAND_LABELS = ["40㎡ 미만", "40~60㎡", "60~85㎡", "85~102㎡", "102~135㎡", "135㎡ 이상"]
+UNKNOWN_AREA_BAND = "면적 미상"
+STAT_KEYS = ["단지명", "면적대", "거래유형"]
+
+
+def area_band(exclusive) -> pd.Series:
+    """전용면적 → 면적대 (category, 면적을 모르면 '면적 미상')"""
+    import pandas as pd
+    
+    bands = pd.cut(pd.Series(exclusive), AREA_BANDS, labels=AREA_BAND_LABELS, right=False)
+    return bands.cat.add_categories([UNKNOWN_AREA_BAND]).fillna(UNKNOWN_AREA_BAND)
+
+
+def group_market_stats(df: pd.DataFrame, rate: int) -> pd.DataFrame:
+    """단지 × 면적대 × 거래유형별 매물 수, 환산가 사분위수, 평당가 중앙값 (만원)"""
+    import pandas as pd
+    
+    converted = calc_converted_series(df["가격"], df["월세"], rate).to_numpy()
+    per_pyeong, _ = calc_unit_prices(converted, df["공급면적"], df["전용면적"])
+    # 범주형 그대로 묶어야 문자열을 만들지 않는다
+    frame = pd.DataFrame({
+        "단지명": df["단지명"].reset_index(drop=True),
+        "면적대": area_band(df["전용면적"].to_numpy()),
+        "거래유형": df["거래유형"].reset_index(drop=True),
+        "환산가": converted,
+        "평당가": per_pyeong,
+    })
+    grouped = frame.groupby(STAT_KEYS, observed=True)
+    quartiles = grouped["환산가"].quantile([0.25, 0.5, 0.75]).unstack().reindex(columns=[0.25, 0.5, 0.75])
+    stats = pd.DataFrame({
+        "매물 수": grouped.size(),
+        "환산가 Q1": quartiles[0.25],
+        "환산가 중앙값": quartiles[0.5],
+        "환산가 Q3": quartiles[0.75],
+        "평당가 중앙값": grouped["평당가"].median(),
+    })
+    return stats.reset_index()
+
+
+def jeonse_ratio_table(stats: pd.DataFrame) -> pd.DataFrame:
+    """단지 × 면적대별 전세가율 (전세 중앙값 / 매매 중앙값, %)
+
+    group_market_stats 결과에서 계산하며, 매매·전세 매물이 모두 있는 구간만 남긴다.
+    """
+    import pandas as pd
+    
+    subset = stats[stats["거래유형"].isin(["매매", "전세"])]
+    if subset.empty:
+        return pd.DataFrame(columns=["단지명", "면적대", "매매 중앙값", "전세 중앙값", "전세가율(%)", "매매 수", "전세 수"])
+    wide = subset.pivot_table(
+        index=["단지명", "면적대"], columns="거래유형", values=["환산가 중앙값", "매물 수"], observed=True
+    )
+    # 필터로 한쪽 거래유형만 남아도 두 컬럼이 모두 있도록 맞춤
+    wide = wide.reindex(columns=pd.MultiIndex.from_product([["환산가 중앙값", "매물 수"], ["매매", "전세"]]))
+    wide = wide.dropna(subset=[("환산가 중앙값", "매매"), ("환산가 중앙값", "전세")])
+    table = pd.DataFrame({
+        "매매 중앙값": wide[("환산가 중앙값", "매매")],
+        "전세 중앙값": wide[("환산가 중앙값", "전세")],
+        "매매 수": wide[("매물 수", "매매")].astype(int),
+        "전세 수": wide[("매물 수", "전세")].astype(int),
+    })
+    table.insert(2, "전세가율(%)", (table["전세 중앙값"] / table["매매 중앙값"] * 100).round(1))
+    return table.reset_index().sort_values("전세가율(%)", ascending=False, ignore_index=True)
+
+
+class MarketStats:
+    """시세 통계의 단지 단위 증분 갱신
+
+    단지마다 통계에 쓰이는 값(거래유형, 가격, 월세, 면적)의 행 해시 합을 지문으로 기억해 두고,
+    지문이 바뀐 단지만 다시 집계해 이전 결과의 해당 단지 행과 바꿔 끼운다.
+    같은 DataFrame·환산 비율로 다시 부르면 이전 결과를 그대로 돌려준다.
+    """
+    
+    def __init__(self):
+        self._source: Optional[pd.DataFrame] = None
+        self._rate: Optional[int] = None
+        self._fingerprints: Dict[str, Tuple[int, int]] = {}
+        self.table: Optional[pd.DataFrame] = None
+        self.recomputed: List[str] = []  # 마지막 갱신에서 다시 집계한 단지
+    
+    @staticmethod
+    def _fingerprint(df: pd.DataFrame) -> Dict[str, Tuple[int, int]]:
+        """{단지명: (매물 수, 행 해시 합)}"""
+        import pandas as pd
+        
+        values = pd.DataFrame({
+            "거래유형": df["거래유형"].astype("category").cat.codes.to_numpy(),
+            **{col: df[col].to_numpy() for col in ["가격", "월세", "공급면적", "전용면적"]},
+        })
+        hashes = pd.util.hash_pandas_object(values, index=False)
+        names = df["단지명"].astype("category")
+        sums = hashes.groupby(names.cat.codes.to_numpy()).agg(["size", "sum"])
+        labels = names.cat.categories[sums.index]
+        return dict(zip(labels, zip(sums["size"].tolist(), sums["sum"].tolist())))
+    
+    def update(self, df: pd.DataFrame, rate: int) -> pd.DataFrame:
+        """df 기준 통계 (group_market_stats 와 같은 형식)"""
+        import pandas as pd
+        
+        if df is self._source and rate == self._rate and self.table is not None:
+            self.recomputed = []
+            return self.table
+        if rate != self._rate or self.table is None:
+            self._fingerprints = {}
+        
+        fingerprints = self._fingerprint(df)
+        changed = [name for name, fp in fingerprints.items() if self._fingerprints.get(name) != fp]
+        stale = set(changed) | (self._fingerprints.keys() - fingerprints.keys())
+        
+        if not self._fingerprints or len(changed) == len(fingerprints):
+            self.table = group_market_stats(df, rate)
+        elif stale:
+            kept = self.table[~self.table["단지명"].isin(stale)]
+            fresh = group_market_stats(df[df["단지명"].isin(changed)], rate) if changed else kept.iloc[:0]
+            self.table = pd.concat([kept, fresh], ignore_index=True)
+        
+        self._fingerprints = fingerprints
+        self._source, self._rate = df, rate
+        self.recomputed = changed
+        return self.table
+
+
+# ============================================================
+# 내보내기 (CSV / Parquet / Arrow IPC)
+# ============================================================
+# 내보내기 컬럼과 고정 타입 (Parquet·Arrow 는 청크·조건과 무관하게 같은 스키마)
+EXPORT_TYPES = {
+    "단지명": "string", "거래유형": "string", "가격": "int32", "월세": "int32",
+    "동": "string", "층": "string", "면적": "string", "방향": "string", "설명": "string",
+    "태그": "string", "확인일": "date32", "매물번호": "string", "공급면적": "float32", "전용면적": "float32",
+    "환산가": "int64", "평당가": "float64", "㎡당가": "float64", "중개 수": "int16",
+}
+# 형식 → (확장자, MIME)
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Arrow": ("arrow", "application/vnd.apache.arrow.file"),
+}
+EXPORT_CHUNK_ROWS = 50_000
+
+
+def export_formats() -> List[str]:
+    """사용할 수 있는 내보내기 형식 (Parquet·Arrow 는 pyarrow 가 있을 때만)"""
+    import importlib.util
+    
+    if importlib.util.find_spec("pyarrow") is None:
+        return ["CSV"]
+    return list(EXPORT_FORMATS)
+
+
+def _export_schema(columns: List[str]):
+    import pyarrow as pa
+    
+    return pa.schema([(col, getattr(pa, EXPORT_TYPES[col])()) for col in columns])
+
+
+def write_listings(df: pd.DataFrame, sink, fmt: str = "CSV",
+                   fill: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+                   chunk_rows: int = EXPORT_CHUNK_ROWS) -> int:
+    """매물을 chunk_rows 건씩 나눠 바이너리 파일 객체 sink 에 기록, 기록한 행 수 반환
+
+    fill 은 청크마다 적용할 보강 함수 (예: ListingStore.attach_descriptions)로,
+    전체 결과를 한 번에 복사하거나 문자열로 만들지 않는다.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 형식: {fmt}")
+    columns = [col for col in EXPORT_TYPES if col in df.columns]
+    chunks = (df.iloc[start:start + chunk_rows] for start in range(0, max(len(df), 1), chunk_rows))
+    
+    if fmt == "CSV":
+        sink.write("\ufeff".encode("utf-8"))  # 엑셀용 BOM
+        for i, chunk in enumerate(chunks):
+            chunk = fill(chunk) if fill else chunk
+            sink.write(chunk[columns].to_csv(
+                index=False, header=i == 0, date_format="%Y-%m-%d", lineterminator="\n"
+            ).encode("utf-8"))
+        return len(df)
+    
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    schema = _export_schema(columns)
+    if fmt == "Parquet":
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_file(sink, schema)
+    with writer:
+        for chunk in chunks:
+            chunk = fill(chunk) if fill else chunk
+            writer.write_table(pa.Table.from_pandas(chunk[columns], schema=schema, preserve_index=False))
+    return len(df)
+
+
+def export_listings(df: pd.DataFrame, fmt: str = "CSV",
+                    fill: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+                    chunk_rows: int = EXPORT_CHUNK_ROWS) -> bytes:
+    """write_listings 결과를 bytes 로 (다운로드 버튼에서 눌렀을 때만 호출)"""
+    import io
+    
+    buffer = io.BytesIO()
+    write_listings(df, buffer, fmt, fill=fill, chunk_rows=chunk_rows)
+    return buffer.getvalue()
+
+
+# ============================================================
+# 매물 저장소 (수집기 ↔ 화면 공유)
+# ============================================================
+STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "listings.sqlite3")
+
+
+class ListingStore:
+    """단지별 최신 매물 스냅샷 저장소 (SQLite)
+
+    수집기(collector.py)가 미리 받아 둔 매물을 화면이 바로 읽을 수 있도록
+    단지마다 마지막 조회 결과와 조회 시각을 저장한다.
+    자유 텍스트인 설명은 별도 테이블에 두고, 화면에 표시할 매물만 attach_descriptions 로 붙인다.
+    """
+    
+    def __init__(self, path: str = STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        columns = ", ".join(f'"{col}"' for col in LISTING_COLUMNS)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS descriptions (
+                    complex_id TEXT NOT NULL,
+                    article_no TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    PRIMARY KEY (complex_id, article_no)
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    complex_id TEXT PRIMARY KEY,
+                    complex_name TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    count INTEGER NOT NULL
+                )
+            """)
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS listings (complex_id TEXT NOT NULL, {columns})")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_listings_complex ON listings(complex_id)")
+            # 이전 버전 저장소에 나중에 추가된 컬럼 보충
+            existing = {row[1] for row in self._conn.execute("PRAGMA table_info(listings)")}
+            for col in LISTING_COLUMNS:
+                if col not in existing:
+                    self._conn.execute(f'ALTER TABLE listings ADD COLUMN "{col}"')
+    
+    def save(self, complex_id: str, complex_name: str, df: pd.DataFrame, fetched_at: Optional[float] = None):
+        """단지의 매물 스냅샷 교체"""
+        import pandas as pd
+        
+        fetched_at = fetched_at or time.time()
+        frame = compact_listings(df.reindex(columns=LISTING_COLUMNS))
+        descriptions = [
+            (complex_id, key, text)
+            for key, text in zip(frame["매물번호"].tolist(), frame["설명"].tolist())
+            if not pd.isna(key) and not pd.isna(text) and text
+        ]
+        # 설명은 descriptions 테이블에만 저장 (listings 의 설명 컬럼은 비워 둠)
+        frame = frame.assign(설명=None, 확인일=frame["확인일"].dt.strftime("%Y%m%d"))
+        rows = [
+            (complex_id, *(None if pd.isna(v) else v for v in row))
+            for row in frame.astype(object).itertuples(index=False, name=None)
+        ]
+        placeholders = ", ".join("?" * (len(LISTING_COLUMNS) + 1))
+        columns = ", ".join(["complex_id"] + [f'"{col}"' for col in LISTING_COLUMNS])
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM listings WHERE complex_id = ?", (complex_id,))
+            self._conn.executemany(f"INSERT INTO listings ({columns}) VALUES ({placeholders})", rows)
+            self._conn.execute("DELETE FROM descriptions WHERE complex_id = ?", (complex_id,))
+            self._conn.executemany("INSERT OR REPLACE INTO descriptions VALUES (?, ?, ?)", descriptions)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?)",
+                (complex_id, complex_name, fetched_at, len(rows))
+            )
+    
+    def snapshots(self) -> Dict[str, Tuple[str, float, int]]:
+        """{단지ID: (단지명, 조회 시각, 매물 수)}"""
+        with self._lock:
+            rows = self._conn.execute("SELECT complex_id, complex_name, fetched_at, count FROM snapshots").fetchall()
+        return {cid: (name, fetched_at, count) for cid, name, fetched_at, count in rows}
+    
+    def load(self, complex_ids: List[str], max_age: Optional[float] = None,
+             with_descriptions: bool = False) -> Tuple[pd.DataFrame, Dict[str, float]]:
+        """저장된 매물 조회, (매물, {단지ID: 조회 시각}) 반환
+
+        max_age(초)보다 오래된 스냅샷은 제외한다.
+        설명은 with_descriptions 일 때만 채우고, 아니면 비워 둔다 (attach_descriptions 로 나중에 채움).
+        """
+        import pandas as pd
+        
+        snapshots = self.snapshots()
+        now = time.time()
+        fresh = {
+            cid: snapshots[cid][1] for cid in complex_ids
+            if cid in snapshots and (max_age is None or now - snapshots[cid][1] <= max_age)
+        }
+        if not fresh:
+            return concat_listings([]), {}
+        
+        placeholders = ", ".join("?" * len(fresh))
+        columns = ", ".join(
+            'COALESCE(d.text, l."설명") AS "설명"' if col == "설명" and with_descriptions else f'l."{col}"'
+            for col in LISTING_COLUMNS
+        )
+        join = (
+            "LEFT JOIN descriptions d ON d.complex_id = l.complex_id AND d.article_no = l.\"매물번호\""
+            if with_descriptions else ""
+        )
+        with self._lock:
+            df = pd.read_sql_query(
+                f"SELECT {columns} FROM listings l {join} WHERE l.complex_id IN ({placeholders})",
+                self._conn, params=list(fresh)
+            )
+        return compact_listings(df), fresh
+    
+    def descriptions(self, article_nos: List[str]) -> Dict[str, str]:
+        """{매물번호: 설명}"""
+        keys = list(dict.fromkeys(article_nos))
+        found = {}
+        with self._lock:
+            # SQLite 변수 개수 제한 때문에 나눠서 조회
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                found.update(self._conn.execute(
+                    f"SELECT article_no, text FROM descriptions WHERE article_no IN ({', '.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall())
+        return found
+    
+    def attach_descriptions(self, rows: pd.DataFrame) -> pd.DataFrame:
+        """설명이 비어 있는 매물에 저장된 설명을 채운 DataFrame (모두 채워져 있으면 그대로 반환)"""
+        missing = rows["설명"].isna()
+        if not missing.any():
+            return rows
+        found = self.descriptions(rows.loc[missing, "매물번호"].dropna().tolist())
+        filled = rows["설명"].fillna(rows["매물번호"].map(found)).fillna("")
+        return rows.assign(설명=filled.astype(_text_dtype()))
+
+
+# ============================================================
+# 관심 조건 알림 (감시 규칙 · 알림함)
+# ============================================================
+WATCH_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "watch.sqlite3")
+
+
+class WatchRule(NamedTuple):
+    """감시 규칙 (비워 둔 조건은 검사하지 않음, 가격·월세는 만원, 면적은 전용면적 ㎡)"""
+    name: str
+    complex_name: Optional[str] = None
+    trade: Optional[str] = None
+    area_min: Optional[float] = None
+    area_max: Optional[float] = None
+    price_max: Optional[int] = None
+    rent_max: Optional[int] = None
+    keyword: Optional[str] = None  # 설명에 포함된 문자열 (예: 역세권)
+    tag: Optional[str] = None      # 매물 태그 (예: 급매), 태그 목록에 있어야 일치
+    price_cut: bool = False        # 이미 알린 매물의 가격이 내려가도 다시 알림
+    
+    @property
+    def summary(self) -> str:
+        parts = [self.complex_name or "전체 단지"]
+        if self.trade:
+            parts.append(self.trade)
+        if self.area_min is not None or self.area_max is not None:
+            parts.append(f"{self.area_min or 0:g}~{self.area_max:g}㎡" if self.area_max is not None
+                         else f"{self.area_min:g}㎡ 이상")
+        if self.price_max is not None:
+            parts.append(f"{format_price(self.price_max)} 이하")
+        if self.rent_max is not None:
+            parts.append(f"월 {self.rent_max:,} 이하")
+        if self.keyword:
+            parts.append(f"'{self.keyword}' 포함")
+        if self.tag:
+            parts.append(f"#{self.tag}")
+        if self.price_cut:
+            parts.append("가격 인하 포함")
+        return " · ".join(parts)
+
+
+def match_rules(df: pd.DataFrame, rules: Dict[int, WatchRule]) -> pd.DataFrame:
+    """규칙에 맞는 (규칙ID, 행 위치) 쌍
+
+    단지명별 행 위치를 한 번 정렬해 두고 규칙마다 해당 단지의 행만 배열 연산으로 검사한다.
+    설명 키워드 검사는 키워드마다, 태그 검사는 태그마다 한 번만 계산해 규칙끼리 공유한다
+    (태그는 태그 조합 종류마다 판정해 행으로 펼침).
+    """
+    import numpy as np
+    import pandas as pd
+    
+    if df.empty or not rules:
+        return pd.DataFrame({"rule_id": np.zeros(0, dtype=np.int64), "row": np.zeros(0, dtype=np.int64)})
+    
+    names = df["단지명"].astype("category")
+    name_codes = names.cat.codes.to_numpy()
+    name_lookup = {name: i for i, name in enumerate(names.cat.categories)}
+    by_name = np.argsort(name_codes, kind="stable")
+    starts = np.searchsorted(name_codes[by_name], np.arange(len(name_lookup) + 1))
+    
+    trades = df["거래유형"].astype("category")
+    trade_codes = trades.cat.codes.to_numpy()
+    trade_lookup = {trade: i for i, trade in enumerate(trades.cat.categories)}
+    price = df["가격"].to_numpy(np.int64)
+    rent = df["월세"].to_numpy(np.int64)
+    area = df["전용면적"].to_numpy(np.float64)
+    descriptions = df["설명"].fillna("").astype(str)
+    keyword_hits: Dict[str, np.ndarray] = {}
+    # 태그가 없는 예전 스냅샷은 빈 태그로 취급
+    tags = (df["태그"] if "태그" in df.columns else pd.Series("", index=df.index)).astype("category")
+    tag_codes = tags.cat.codes.to_numpy()
+    tag_hits: Dict[str, np.ndarray] = {}
+    all_rows = np.arange(len(df))
+    
+    rule_parts, row_parts = [], []
+    for rule_id, rule in rules.items():
+        if rule.complex_name:
+            code = name_lookup.get(rule.complex_name)
+            if code is None:
+                continue
+            rows = by_name[starts[code]:starts[code + 1]]
+        else:
+            rows = all_rows
+        mask = np.ones(len(rows), dtype=bool)
+        if rule.trade:
+            mask &= trade_codes[rows] == trade_lookup.get(rule.trade, -2)
+        if rule.area_min is not None:
+            mask &= area[rows] >= rule.area_min
+        if rule.area_max is not None:
+            mask &= area[rows] <= rule.area_max
+        if rule.price_max is not None:
+            mask &= price[rows] <= rule.price_max
+        if rule.rent_max is not None:
+            mask &= rent[rows] <= rule.rent_max
+        if rule.keyword:
+            if rule.keyword not in keyword_hits:
+                keyword_hits[rule.keyword] = descriptions.str.contains(rule.keyword, regex=False).to_numpy()
+            mask &= keyword_hits[rule.keyword][rows]
+        if rule.tag:
+            if rule.tag not in tag_hits:
+                # 마지막 원소는 결측값(코드 -1)용
+                has_tag = np.array([rule.tag in str(kind).split(TAG_SEPARATOR) for kind in tags.cat.categories] + [False])
+                tag_hits[rule.tag] = has_tag[tag_codes]
+            mask &= tag_hits[rule.tag][rows]
+        hits = rows[mask]
+        rule_parts.append(np.full(len(hits), rule_id, dtype=np.int64))
+        row_parts.append(hits)
+    
+    if not rule_parts:
+        return match_rules(df.iloc[:0], rules)
+    return pd.DataFrame({"rule_id": np.concatenate(rule_parts), "row": np.concatenate(row_parts)})
+
+
+class JsonlAlertSink:
+    """알림을 JSON lines 파일 끝에 추가"""
+    
+    def __init__(self, path: str):
+        self.path = path
+    
+    def send(self, alerts: List[dict]) -> bool:
+        if not alerts:
+            return True
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                for alert in alerts:
+                    f.write(json.dumps(alert, ensure_ascii=False) + "\n")
+        except OSError:
+            return False
+        return True
+
+
+class WebhookAlertSink:
+    """알림 목록을 JSON 으로 POST (로컬 수신기·메신저 봇 연결용)"""
+    
+    def __init__(self, url: str, timeout: float = 5.0):
+        import requests
+        
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+    
+    def send(self, alerts: List[dict]) -> bool:
+        import requests
+        
+        if not alerts:
+            return True
+        try:
+            response = self.session.post(self.url, json={"alerts": alerts}, timeout=self.timeout)
+        except requests.exceptions.RequestException:
+            return False
+        return response.ok
+
+
+class WatchList:
+    """감시 규칙과 알림함 (SQLite)
+
+    check 는 새로 받은 매물 전체를 규칙과 한 번에 대조하고, 규칙별로 이미 본 매물(seen)과 비교해
+    처음 나온 매물(과 price_cut 규칙이면 가격이 내려간 매물)만 알림함에 넣고 sink 로 보낸다.
+    """
+    
+    def __init__(self, path: str = WATCH_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS rules (
+                    rule_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    spec TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS seen (
+                    rule_id INTEGER NOT NULL,
+                    article_no TEXT NOT NULL,
+                    price INTEGER NOT NULL,
+                    rent INTEGER NOT NULL,
+                    PRIMARY KEY (rule_id, article_no)
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS alerts (
+                    alert_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    rule_id INTEGER NOT NULL,
+                    rule_name TEXT NOT NULL,
+                    article_no TEXT NOT NULL,
+                    complex_name TEXT,
+                    trade TEXT,
+                    price INTEGER,
+                    rent INTEGER,
+                    area TEXT,
+                    reason TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    read INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_alerts_read ON alerts(read, created_at)")
+    
+    def add_rule(self, rule: WatchRule) -> int:
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO rules (spec, created_at) VALUES (?, ?)",
+                (json.dumps(rule._asdict(), ensure_ascii=False), time.time())
+            )
+        return cursor.lastrowid
+    
+    def remove_rule(self, rule_id: int):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM rules WHERE rule_id = ?", (rule_id,))
+            self._conn.execute("DELETE FROM seen WHERE rule_id = ?", (rule_id,))
+    
+    def rules(self) -> Dict[int, WatchRule]:
+        with self._lock:
+            rows = self._conn.execute("SELECT rule_id, spec FROM rules ORDER BY rule_id").fetchall()
+        return {rule_id: WatchRule(**json.loads(spec)) for rule_id, spec in rows}
+    
+    def _seen(self, rule_ids: List[int]) -> pd.DataFrame:
+        import pandas as pd
+        
+        placeholders = ", ".join("?" * len(rule_ids))
+        with self._lock:
+            return pd.read_sql_query(
+                f"SELECT rule_id, article_no, price AS seen_price, rent AS seen_rent FROM seen "
+                f"WHERE rule_id IN ({placeholders})",
+                self._conn, params=rule_ids
+            )
+    
+    def check(self, df: pd.DataFrame, sinks: tuple = (),
+              fill: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None) -> pd.DataFrame:
+        """매물 전체를 규칙과 대조해 새 알림을 저장·전송하고 반환
+
+        fill 은 키워드 규칙이 있을 때 설명을 채우는 함수 (예: ListingStore.attach_descriptions).
+        """
+        import numpy as np
+        import pandas as pd
+        
+        rules = self.rules()
+        if fill is not None and any(rule.keyword for rule in rules.values()):
+            df = fill(df)
+        hits = match_rules(df, rules)
+        columns = ["alert_id", "rule_id", "rule_name", "article_no", "complex_name", "trade",
+                   "price", "rent", "area", "reason", "created_at"]
+        if hits.empty:
+            return pd.DataFrame(columns=columns)
+        
+        rows = df.iloc[hits["row"].to_numpy()]
+        matched = pd.DataFrame({
+            "rule_id": hits["rule_id"].to_numpy(),
+            "article_no": rows["매물번호"].astype(object).to_numpy(),
+            "complex_name": rows["단지명"].astype(object).to_numpy(),
+            "trade": rows["거래유형"].astype(object).to_numpy(),
+            "price": rows["가격"].to_numpy(np.int64),
+            "rent": rows["월세"].to_numpy(np.int64),
+            "area": rows["면적"].astype(object).to_numpy(),
+        })
+        matched = matched[matched["article_no"].notna()].drop_duplicates(["rule_id", "article_no"])
+        merged = matched.merge(self._seen(sorted(set(matched["rule_id"].tolist()))),
+                               on=["rule_id", "article_no"], how="left")
+        
+        price = merged["price"].to_numpy()
+        rent = merged["rent"].to_numpy()
+        seen_price = merged["seen_price"].fillna(-1).to_numpy()
+        seen_rent = merged["seen_rent"].fillna(-1).to_numpy()
+        is_new = merged["seen_price"].isna().to_numpy()
+        cut_rules = [rule_id for rule_id, rule in rules.items() if rule.price_cut]
+        is_cut = ~is_new & merged["rule_id"].isin(cut_rules).to_numpy() & ((price < seen_price) | (rent < seen_rent))
+        changed = is_new | (price != seen_price) | (rent != seen_rent)
+        
+        fired = merged[is_new | is_cut].copy()
+        fired["rule_name"] = fired["rule_id"].map({rule_id: rule.name for rule_id, rule in rules.items()})
+        previous = format_listing_price_series(fired["seen_price"].fillna(0), fired["seen_rent"].fillna(0))
+        fired["reason"] = np.where(
+            fired["seen_price"].isna(), "신규", "가격 인하 (이전 " + previous.to_numpy().astype(object) + ")"
+        )
+        fired["created_at"] = time.time()
+        
+        seen_rows = merged.loc[changed, ["rule_id", "article_no", "price", "rent"]]
+        alert_rows = fired[columns[1:]]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO seen VALUES (?, ?, ?, ?)",
+                seen_rows.astype(object).itertuples(index=False, name=None)
+            )
+            # 알림은 지우지 않으므로 새 alert_id 는 마지막 번호 다음부터 연속
+            last_id = self._conn.execute("SELECT COALESCE(MAX(alert_id), 0) FROM alerts").fetchone()[0]
+            self._conn.executemany(
+                f"INSERT INTO alerts ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                ((last_id + 1 + i, *row) for i, row in enumerate(alert_rows.astype(object).itertuples(index=False, name=None)))
+            )
+        fired = fired.assign(alert_id=np.arange(last_id + 1, last_id + 1 + len(fired)))[columns]
+        
+        if sinks and len(fired):
+            records = fired.astype(object).itertuples(index=False, name=None)
+            alerts = [dict(zip(columns, row)) for row in records]
+            for sink in sinks:
+                sink.send(alerts)
+        return fired.reset_index(drop=True)
+    
+    def inbox(self, unread_only: bool = True, limit: int = 200) -> pd.DataFrame:
+        """알림함 (최근 순)"""
+        import pandas as pd
+        
+        where = "WHERE read = 0" if unread_only else ""
+        with self._lock:
+            return pd.read_sql_query(
+                f"SELECT * FROM alerts {where} ORDER BY created_at DESC, alert_id DESC LIMIT ?",
+                self._conn, params=[limit]
+            )
+    
+    def unread_count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM alerts WHERE read = 0").fetchone()[0]
+    
+    def mark_read(self, alert_ids: Optional[List[int]] = None):
+        """알림 읽음 처리 (alert_ids 가 없으면 전체)"""
+        with self._lock, self._conn:
+            if alert_ids is None:
+                self._conn.execute("UPDATE alerts SET read = 1 WHERE read = 0")
+            else:
+                self._conn.executemany("UPDATE alerts SET read = 1 WHERE alert_id = ?", [(i,) for i in alert_ids])
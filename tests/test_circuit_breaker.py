@@ -0,0 +1,117 @@
+"""
+서킷 브레이커: 반복된 차단 응답(403·5xx)으로 열리고, 속도 조절 중의 429 로는 열리지 않는지 확인
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from naver_land import AdaptiveRateController, CircuitBreaker, NaverLandAPI, TokenBucketLimiter  # noqa: E402
+
+
+def make_api() -> NaverLandAPI:
+    return NaverLandAPI(limiter=TokenBucketLimiter(rate=1000, burst=100),
+                        breaker=CircuitBreaker(failure_threshold=3, reset_timeout=60))
+
+
+def test_repeated_403_opens_breaker():
+    api = make_api()
+    calls = []
+
+    def get(url, **kwargs):
+        calls.append(url)
+        return SimpleNamespace(status_code=403, headers={}, content=b"")
+
+    api.session.get = get
+    for _ in range(3):
+        assert api._get_json("search", {"keyword": "잠실"}) is None
+    assert api.is_blocked
+
+    # 열린 뒤에는 요청을 보내지 않고 바로 실패
+    assert api._get_json("search", {"keyword": "잠실"}) is None
+    assert len(calls) == 3
+
+
+def test_server_error_counts_and_success_resets():
+    api = make_api()
+    statuses = iter([503, 500, 200])
+
+    def get(url, **kwargs):
+        status = next(statuses)
+        return SimpleNamespace(status_code=status, headers={}, content=b"{}", json=lambda: {})
+
+    api.session.get = get
+    assert api._get_json("search", {"keyword": "a"}) is None
+    assert api._get_json("search", {"keyword": "b"}) is None
+    assert api._get_json("search", {"keyword": "c"}) == {}
+    assert api.breaker.allow() and api.breaker._failures == 0
+
+
+def test_repeated_403_opens_breaker_async():
+    api = make_api()
+    calls = []
+
+    class Transport:
+        inflight = {}
+
+        async def get(self, url, params=None, headers=None, timeout=None):
+            calls.append(url)
+            return 403, {}, b""
+
+    async def run():
+        transport = Transport()
+        return [await api._aget_json(transport, "search", {"keyword": str(i)}) for i in range(4)]
+
+    assert asyncio.run(run()) == [None] * 4
+    assert api.is_blocked
+    assert len(calls) == 3
+
+
+def test_throttled_requests_that_recover_do_not_open_breaker():
+    # 적응형 속도 조절이 속도를 찾는 동안 429 가 연달아 와도 재시도로 받아 내면 실패가 아님
+    api = NaverLandAPI(rate_control=AdaptiveRateController(initial_rate=1000, min_rate=500, max_rate=1000),
+                       breaker=CircuitBreaker(failure_threshold=3, reset_timeout=60))
+    statuses = iter([429, 200] * 5)
+
+    def get(url, **kwargs):
+        status = next(statuses)
+        return SimpleNamespace(status_code=status, headers={"Retry-After": "0"}, content=b"{}", json=lambda: {})
+
+    api.session.get = get
+    for i in range(5):
+        assert api._get_json("search", {"keyword": str(i)}) == {}
+    assert api.breaker.allow() and api.breaker._failures == 0
+
+
+def test_exhausted_429_retries_count_once_per_request():
+    api = make_api()
+    calls = []
+
+    def get(url, **kwargs):
+        calls.append(url)
+        return SimpleNamespace(status_code=429, headers={"Retry-After": "0"}, content=b"")
+
+    api.session.get = get
+    assert api._get_json("search", {"keyword": "a"}) is None
+    assert api.breaker._failures == 1 and len(calls) == 3
+    for keyword in ("b", "c"):
+        assert api._get_json("search", {"keyword": keyword}) is None
+    assert api.is_blocked
+
+
+def test_only_probe_failure_extends_open_timeout():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, max_timeout=300)
+    breaker.record_failure()
+    assert breaker.record_failure()
+
+    # 열리기 전에 보낸 요청이 뒤늦게 실패해도 복구 확인 간격은 그대로
+    for _ in range(3):
+        assert not breaker.record_failure()
+    assert breaker._timeout == 30
+
+    assert not breaker.record_failure(probe=True)
+    assert breaker._timeout == 60
@@ -0,0 +1,39 @@
+"""
+단지 검색: 로컬 색인은 답이 하나로 정해질 때만 쓰고, 모호하면 /api/search 로 넘어가는지 확인
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from naver_land import ComplexDirectory, NaverLandAPI, TokenBucketLimiter  # noqa: E402
+
+
+def make_api():
+    api = NaverLandAPI(limiter=TokenBucketLimiter(rate=1000, burst=100), directory=ComplexDirectory(":memory:"))
+    calls = []
+
+    def get(url, params=None, **kwargs):
+        calls.append(params["keyword"])
+        body = {"suggests": [{"cortarType": "AptComplex", "cortarName": "네트워크단지", "complexNo": "555"}]}
+        return SimpleNamespace(status_code=200, headers={}, content=b"{}", json=lambda: body)
+
+    api.session.get = get
+    return api, calls
+
+
+def test_exact_and_unique_matches_stay_local():
+    api, calls = make_api()
+    assert api.search_complex("잠실엘스") == (True, {"name": "잠실엘스", "id": "19772"}, "")
+    assert api.search_complex("ㅎㄹㅇㅅㅌ")[1]["name"] == "헬리오시티"
+    assert calls == []
+
+
+def test_ambiguous_query_goes_to_network():
+    api, calls = make_api()
+    for keyword in ("자이", "잠실"):
+        assert api.search_complex(keyword) == (True, {"name": "네트워크단지", "id": "555"}, "")
+    assert calls == ["자이", "잠실"]
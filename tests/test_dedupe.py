@@ -0,0 +1,56 @@
+"""
+중복 매물 묶기: 가격이 조금씩 이어지는 매물이 한 묶음으로 끝없이 합쳐지지 않는지 확인
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from naver_land import DEDUP_TOLERANCE, dedupe_listings, format_price, parse_article_batch  # noqa: E402
+
+
+def listings(prices):
+    """같은 동·층·면적·방향의 매매 매물 (가격만 다름, 만원)"""
+    articles = [{
+        "articleNo": str(1000 + i),
+        "tradeTypeName": "매매",
+        "dealOrWarrantPrc": format_price(price),
+        "rentPrc": "0",
+        "buildingName": "101동",
+        "floorInfo": "중/25",
+        "areaName": "84㎡",
+        "direction": "남향",
+        "articleFeatureDesc": f"중개사{i}",
+        "articleConfirmYmd": "20260901",
+    } for i, price in enumerate(prices)]
+    df, malformed = parse_article_batch(articles, "잠실엘스")
+    assert not malformed
+    return df
+
+
+def test_chained_prices_do_not_collapse():
+    # 10억 ~ 11.05억, 1500만원 간격: 이웃끼리는 2% 이내지만 양끝은 10% 넘게 차이
+    prices = [100000 + 1500 * i for i in range(8)]
+    result = dedupe_listings(listings(prices))
+
+    assert len(result) == 4
+    assert result["중개 수"].tolist() == [2, 2, 2, 2]
+    assert result["가격"].tolist() == [100000, 103000, 106000, 109000]
+
+
+def test_cluster_span_stays_within_tolerance():
+    prices = [100000 + 1500 * i for i in range(8)]
+    df = listings(prices)
+    result = dedupe_listings(df)
+    for low, high in zip(result["가격"], list(result["가격"][1:]) + [max(prices) + 1]):
+        members = [p for p in prices if low <= p < high]
+        assert max(members) - low <= DEDUP_TOLERANCE * low
+
+
+def test_close_prices_collapse():
+    result = dedupe_listings(listings([100000, 100500, 101000]))
+    assert len(result) == 1
+    assert result["중개 수"].tolist() == [3]
+    assert result["가격"].tolist() == [100000]
@@ -0,0 +1,42 @@
+"""
+관심 조건: 태그 규칙은 설명이 아니라 매물의 태그 목록으로 일치하는지 확인
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from naver_land import ListingTracker, WatchList, WatchRule  # noqa: E402
+
+
+def article(no, desc="", tags=()):
+    return {"articleNo": no, "tradeTypeName": "매매", "dealOrWarrantPrc": "20억", "rentPrc": "0",
+            "buildingName": "101동", "floorInfo": "중/25", "areaName": "84㎡", "direction": "남향",
+            "articleFeatureDesc": desc, "articleConfirmYmd": "20260901", "tagList": list(tags)}
+
+
+def test_tag_rule_matches_tag_list_not_description():
+    tracker = ListingTracker()
+    watchlist = WatchList(":memory:")
+    watchlist.add_rule(WatchRule("급매", tag="급매"))
+    _, df, _ = tracker._merge("1", "단지", [
+        article("a", desc="올수리", tags=["급매", "대단지"]),
+        article("b", desc="급매 아님 주의", tags=["대단지"]),
+        article("c"),
+    ])
+    assert list(df["태그"].astype(str)) == ["급매,대단지", "대단지", ""]
+    assert watchlist.check(df)["article_no"].tolist() == ["a"]
+
+
+def test_new_tag_on_known_article_fires():
+    tracker = ListingTracker()
+    watchlist = WatchList(":memory:")
+    watchlist.add_rule(WatchRule("급매", tag="급매"))
+    _, df, _ = tracker._merge("1", "단지", [article("a")])
+    assert watchlist.check(df).empty
+
+    # 가격은 그대로 두고 급매 태그만 붙은 매물도 다시 파싱되어 알림
+    _, df, _ = tracker._merge("1", "단지", [article("a", tags=["급매"])])
+    assert watchlist.check(df)["article_no"].tolist() == ["a"]